@@ -109,6 +109,7 @@ def coleta_cotacoes_indices_historico_completo_dag():
         response_data = asyncio.run(
             client.post(
                 endpoint=ENDPOINT,
+                query_params={"detalhar": "false"},
                 json_body={"cotacoes": cotacoes},
             )
         )
@@ -22,6 +22,7 @@ from WorkdayHolidayTimetable import WorkdayHolidayTimetable
     doc_md="""
     ###
     Busca as cotações de todos os índices cadastrados no banco de dados.
+    Coleta apenas os dias úteis posteriores à última cotação gravada de cada índice.
     Roda somente em dias úteis.
     """,
 )
@@ -41,7 +42,7 @@ def coleta_indices_ultimas_cotacoes():
 
     @task
     def fetch_indices_ultimas_cotacoes_diarias():
-        ENDPOINT = "/rotinas/indices/cotacoes/coleta/ultimos"
+        ENDPOINT = "/rotinas/indices/cotacoes/coleta/incremental"
 
         client = ApiVangClient()
 
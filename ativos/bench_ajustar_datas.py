@@ -0,0 +1,190 @@
+"""
+Benchmark do ajuste de datas para dias úteis na importação de ativos.
+
+Compara `AtivosService.ajustar_datas_dias_uteis` (colunas `datetime64[D]` e
+uma única chamada ao calendário) com o caminho anterior de `transacao`, que
+achatava as datas de cada ativo e evento em uma lista, deixava o NumPy converter
+cada `date` e gravava as datas de volta objeto a objeto por um índice. Antes de
+medir, confere que os dois caminhos produzem as mesmas datas.
+
+Uso:
+    python -m modules.ativos.bench_ajustar_datas [--ativos 100] [--eventos 100]
+"""
+
+import argparse
+import time
+from datetime import date, timedelta
+from random import Random
+from types import SimpleNamespace
+
+import numpy as np
+from modules.calculos.calendario import get_calendario_b3
+
+from .service import AtivosService
+
+
+def gerar_importacao(
+    quantidade_ativos: int, eventos_por_ativo: int, semente: int = 0
+) -> tuple[list[SimpleNamespace], list[SimpleNamespace]]:
+    """
+    Gera ativos atualizados e inseridos com a estrutura dos schemas de importação.
+
+    Metade dos ativos é atualizada (eventos em `fluxos.added`/`fluxos.modified`)
+    e metade inserida (eventos em `fluxos`), com datas em qualquer dia da semana.
+
+    Returns:
+        tuple: (ativos atualizados, ativos inseridos)
+    """
+    aleatorio = Random(semente)
+    inicio = date(2020, 1, 1)
+
+    def data() -> date:
+        return inicio + timedelta(days=aleatorio.randrange(15 * 365))
+
+    def eventos(quantidade: int) -> list[SimpleNamespace]:
+        return [SimpleNamespace(data_pagamento=data()) for _ in range(quantidade)]
+
+    def ativo(fluxos) -> SimpleNamespace:
+        return SimpleNamespace(
+            data_emissao=data(),
+            inicio_rentabilidade=data(),
+            data_vencimento=data(),
+            fluxos=fluxos,
+        )
+
+    metade = quantidade_ativos // 2
+    atualizados = [
+        ativo(
+            SimpleNamespace(
+                added=eventos(eventos_por_ativo // 2),
+                modified=eventos(eventos_por_ativo - eventos_por_ativo // 2),
+            )
+        )
+        for _ in range(metade)
+    ]
+    inseridos = [ativo(eventos(eventos_por_ativo)) for _ in range(quantidade_ativos - metade)]
+    return atualizados, inseridos
+
+
+def ajustar_por_objeto(atualizados: list, inseridos: list) -> None:
+    """Caminho anterior de `transacao`: lista achatada e gravação por índice."""
+    datas_fornecidas: list[date] = []
+    for atualizado in atualizados:
+        datas_fornecidas += [
+            atualizado.data_emissao,
+            atualizado.inicio_rentabilidade,
+            atualizado.data_vencimento,
+        ] + [
+            evento.data_pagamento
+            for evento in atualizado.fluxos.added + atualizado.fluxos.modified
+        ]
+    for inserido in inseridos:
+        datas_fornecidas += [
+            inserido.data_emissao,
+            inserido.inicio_rentabilidade,
+            inserido.data_vencimento,
+        ] + [evento.data_pagamento for evento in inserido.fluxos]
+
+    # Conversão anterior do calendário, que deixava o NumPy converter cada `date`
+    datas_corrigidas = (
+        get_calendario_b3()
+        .ajustar_dias_uteis_seguintes(np.asarray(datas_fornecidas, dtype="datetime64[D]"))
+        .astype(object)
+        .tolist()
+    )
+
+    date_i = 0
+    for atualizado in atualizados:
+        atualizado.data_emissao = datas_corrigidas[date_i]
+        atualizado.inicio_rentabilidade = datas_corrigidas[date_i + 1]
+        atualizado.data_vencimento = datas_corrigidas[date_i + 2]
+        date_i += 3
+        for evento in atualizado.fluxos.added + atualizado.fluxos.modified:
+            evento.data_pagamento = datas_corrigidas[date_i]
+            date_i += 1
+    for inserido in inseridos:
+        inserido.data_emissao = datas_corrigidas[date_i]
+        inserido.inicio_rentabilidade = datas_corrigidas[date_i + 1]
+        inserido.data_vencimento = datas_corrigidas[date_i + 2]
+        date_i += 3
+        for evento in inserido.fluxos:
+            evento.data_pagamento = datas_corrigidas[date_i]
+            date_i += 1
+
+
+def ajustar_por_colunas(atualizados: list, inseridos: list) -> None:
+    """Caminho atual de `transacao`, por colunas."""
+    eventos_atualizados = [
+        evento
+        for atualizado in atualizados
+        for evento in atualizado.fluxos.added + atualizado.fluxos.modified
+    ]
+    eventos_inseridos = [evento for inserido in inseridos for evento in inserido.fluxos]
+    ativos = [*atualizados, *inseridos]
+
+    AtivosService.ajustar_datas_dias_uteis(
+        [
+            (ativos, "data_emissao"),
+            (ativos, "inicio_rentabilidade"),
+            (ativos, "data_vencimento"),
+            (eventos_atualizados, "data_pagamento"),
+            (eventos_inseridos, "data_pagamento"),
+        ]
+    )
+
+
+def datas(atualizados: list, inseridos: list) -> list[date]:
+    """Todas as datas da importação, na ordem dos objetos."""
+    resultado: list[date] = []
+    for ativo in [*atualizados, *inseridos]:
+        resultado += [ativo.data_emissao, ativo.inicio_rentabilidade, ativo.data_vencimento]
+        fluxos = (
+            ativo.fluxos
+            if isinstance(ativo.fluxos, list)
+            else ativo.fluxos.added + ativo.fluxos.modified
+        )
+        resultado += [evento.data_pagamento for evento in fluxos]
+    return resultado
+
+
+def medir(ajustar, quantidade_ativos: int, eventos_por_ativo: int, repeticoes: int) -> float:
+    """Menor tempo, em ms, entre as repetições (sem contar a geração dos dados)."""
+    tempos = []
+    for _ in range(repeticoes):
+        importacao = gerar_importacao(quantidade_ativos, eventos_por_ativo)
+        inicio = time.perf_counter()
+        ajustar(*importacao)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return min(tempos)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ativos", type=int, default=100)
+    parser.add_argument("--eventos", type=int, default=100, help="eventos por ativo")
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args()
+
+    # Carrega o calendário fora da medição
+    get_calendario_b3()
+
+    por_objeto = gerar_importacao(args.ativos, args.eventos)
+    por_colunas = gerar_importacao(args.ativos, args.eventos)
+    ajustar_por_objeto(*por_objeto)
+    ajustar_por_colunas(*por_colunas)
+    if datas(*por_objeto) != datas(*por_colunas):
+        raise SystemExit("Os caminhos produziram datas diferentes")
+    if not get_calendario_b3().is_dia_util(datas(*por_colunas)).all():
+        raise SystemExit("Há datas ajustadas que não são dias úteis")
+
+    total_datas = len(datas(*por_colunas))
+    tempo_objeto = medir(ajustar_por_objeto, args.ativos, args.eventos, args.repeticoes)
+    tempo_colunas = medir(ajustar_por_colunas, args.ativos, args.eventos, args.repeticoes)
+
+    print(f"{args.ativos} ativos x {args.eventos} eventos ({total_datas} datas)")
+    print(f"por objeto:  {tempo_objeto:8.2f} ms")
+    print(f"por colunas: {tempo_colunas:8.2f} ms ({tempo_objeto / tempo_colunas:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Fila de notificações dos analistas de crédito sobre alterações de emissores.
+
+As transações de emissores não abrem mais uma sessão por requisição para
+notificar os analistas. Os eventos (analista alocado, desalocado ou emissor
+atualizado) são adicionados a uma fila em memória, e um único worker assíncrono
+os envia após uma janela curta:
+
+- eventos repetidos do mesmo analista e emissor na janela são deduplicados,
+  prevalecendo alocação/desalocação sobre atualização;
+- eventos do mesmo tipo para o mesmo analista viram uma única notificação;
+- os analistas de todo o lote são resolvidos em uma consulta, e as notificações
+  são gravadas em uma única sessão e transação.
+
+Edições em massa na tela de cadastro geram, assim, uma conexão por janela em vez
+de uma por requisição.
+
+Os eventos são enfileirados por background task, depois da resposta, para que
+transações desfeitas não gerem notificações. No encerramento da aplicação, os
+eventos pendentes são enviados sem aguardar a janela (`esvaziar`, registrado no
+shutdown pelo router de ativos).
+
+Exemplo:
+    background_tasks.add_task(fila_notificacoes.adicionar, eventos)
+"""
+
+import asyncio
+import logging
+from typing import Literal, TypedDict
+
+import config.database as db
+from modules.notifications.schema import NotificationSchema
+from modules.notifications.service import NotificationService
+from modules.notifications.repository import NotificationRepository
+
+from .repository import AtivosRepository
+
+logger = logging.getLogger(__name__)
+
+TipoAtualizacao = Literal["alocado", "desalocado", "atualizado"]
+
+
+class EventoEmissor(TypedDict):
+    analista_id: int
+    emissor_id: int
+    emissor_nome: str
+    atualizacao: TipoAtualizacao
+
+
+def _texto_notificacao(atualizacao: TipoAtualizacao, nomes: list[str]) -> str:
+    if len(nomes) == 1:
+        emissor = nomes[0]
+        match atualizacao:
+            case "alocado":
+                return f"Você foi alocado para o emissor {emissor}."
+            case "atualizado":
+                return f"As informações do emissor {emissor} foram alteradas no banco de dados."
+            case "desalocado":
+                return f"Você não está mais alocado para o emissor {emissor}"
+
+    emissores = ", ".join(nomes[:-1]) + " e " + nomes[-1]
+    match atualizacao:
+        case "alocado":
+            return f"Você foi alocado para os emissores {emissores}."
+        case "atualizado":
+            return f"As informações dos emissores {emissores} foram alteradas no banco de dados."
+        case "desalocado":
+            return f"Você não está mais alocado para os emissores {emissores}"
+
+
+class FilaNotificacoesEmissores:
+    """Fila em memória com um worker que agrupa e envia as notificações em lote."""
+
+    def __init__(self, janela: float = 2.0):
+        """
+        Inicializa a fila.
+
+        Args:
+            janela: Segundos de espera entre o primeiro evento e o envio do lote
+        """
+        self.janela = janela
+        self._pendentes: dict[tuple[int, int], EventoEmissor] = {}
+        self._worker: asyncio.Task | None = None
+        self._despertar = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._pendentes)
+
+    async def adicionar(self, eventos: list[EventoEmissor]) -> None:
+        """
+        Adiciona eventos à fila e garante que o worker está em execução.
+
+        Assíncrono para rodar no event loop quando agendado como background task.
+
+        Args:
+            eventos: Eventos de alteração de emissores
+        """
+        for evento in eventos:
+            chave = (evento["analista_id"], evento["emissor_id"])
+            anterior = self._pendentes.get(chave)
+            # Uma atualização não encobre a alocação/desalocação já pendente
+            if (
+                anterior is not None
+                and evento["atualizacao"] == "atualizado"
+                and anterior["atualizacao"] != "atualizado"
+            ):
+                continue
+            self._pendentes[chave] = evento
+
+        if self._pendentes and (self._worker is None or self._worker.done()):
+            self._worker = asyncio.create_task(self._executar())
+
+    async def esvaziar(self) -> None:
+        """Envia imediatamente os eventos pendentes, sem aguardar a janela."""
+        self._despertar.set()
+        try:
+            if self._worker is not None and not self._worker.done():
+                await self._worker
+            await self._enviar_pendentes()
+        finally:
+            self._despertar.clear()
+
+    async def _executar(self) -> None:
+        while self._pendentes:
+            try:
+                await asyncio.wait_for(self._despertar.wait(), self.janela)
+            except TimeoutError:
+                pass
+            await self._enviar_pendentes()
+
+    async def _enviar_pendentes(self) -> None:
+        eventos = list(self._pendentes.values())
+        self._pendentes = {}
+        if not eventos:
+            return
+
+        try:
+            await self._enviar(eventos)
+        except Exception:
+            logger.exception(
+                "Falha ao enviar %d notificações de emissores", len(eventos)
+            )
+
+    @staticmethod
+    async def _enviar(eventos: list[EventoEmissor]) -> None:
+        async with db.get_session(db.engine) as session:
+            analistas = await AtivosRepository(db=session).analistas_from_ids(
+                list({evento["analista_id"] for evento in eventos})
+            )
+            usuarios = {analista.id: analista.user_id for analista in analistas}
+
+            agrupados: dict[tuple[int, TipoAtualizacao], list[EventoEmissor]] = {}
+            for evento in eventos:
+                user_id = usuarios.get(evento["analista_id"])
+                if not user_id:
+                    continue
+                agrupados.setdefault((user_id, evento["atualizacao"]), []).append(
+                    evento
+                )
+
+            messages: list[NotificationSchema] = []
+            for (user_id, atualizacao), grupo in agrupados.items():
+                link = (
+                    "/emissores/" + str(grupo[0]["emissor_id"])
+                    if len(grupo) == 1
+                    else "/emissores"
+                )
+                messages.append(
+                    NotificationSchema(
+                        user_id=user_id,
+                        link=link,
+                        text=_texto_notificacao(
+                            atualizacao, [evento["emissor_nome"] for evento in grupo]
+                        ),
+                    )
+                )
+
+            if not messages:
+                return
+            notification_service = NotificationService(
+                notification_repository=NotificationRepository(db=session)
+            )
+            await notification_service.send(messages)
+            await session.commit()
+
+
+fila_notificacoes = FilaNotificacoesEmissores()
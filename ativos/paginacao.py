@@ -0,0 +1,172 @@
+"""
+Paginação por cursor (keyset) das listagens de ativos e eventos.
+
+Em vez de `OFFSET`, cada página continua a partir dos valores das colunas de
+ordenação da última linha da página anterior, o que mantém o custo das páginas
+profundas igual ao da primeira. Esses valores são devolvidos ao cliente em um
+cursor opaco (JSON em base64), que também guarda uma assinatura da ordenação e
+dos filtros para que não seja reaproveitado em outra consulta.
+
+Os totais das listagens são guardados em cache por combinação de filtros e
+invalidados pelas transações de ativos.
+
+Exemplo:
+    valores = decodificar_cursor(cursor, assinatura)
+    query = query.where(filtro_keyset(ordenacao, valores)).limit(quantidade)
+    proximo_cursor = codificar_cursor(valores_ultima_linha, assinatura)
+"""
+
+import base64
+import binascii
+import hashlib
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from http import HTTPStatus
+from typing import Any
+
+from fastapi.exceptions import HTTPException
+from sqlalchemy import ColumnElement, UnaryExpression, and_, false, or_, true
+from sqlalchemy.sql import operators
+
+from modules.cache import AsyncTTLCache
+
+# Totais por (listagem, assinatura dos filtros); aproximados entre transações
+totais_cache: AsyncTTLCache[int] = AsyncTTLCache(ttl=300, maxsize=256, name="ativos_totais")
+
+
+def assinatura_consulta(*partes: Any) -> str:
+    """
+    Gera uma assinatura curta e estável para os parâmetros de uma consulta.
+
+    Args:
+        *partes: Parâmetros serializáveis em JSON (ordenação, filtros etc.)
+
+    Returns:
+        str: Hash hexadecimal dos parâmetros
+    """
+    serializado = json.dumps(partes, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(serializado.encode()).hexdigest()[:16]
+
+
+def _serializar_valor(valor: Any) -> Any:
+    if isinstance(valor, datetime):
+        return {"dt": valor.isoformat()}
+    if isinstance(valor, date):
+        return {"d": valor.isoformat()}
+    if isinstance(valor, Decimal):
+        return {"n": str(valor)}
+    return valor
+
+
+def _desserializar_valor(valor: Any) -> Any:
+    if isinstance(valor, dict):
+        if "dt" in valor:
+            return datetime.fromisoformat(valor["dt"])
+        if "d" in valor:
+            return date.fromisoformat(valor["d"])
+        if "n" in valor:
+            return Decimal(valor["n"])
+    return valor
+
+
+def codificar_cursor(valores: list[Any], assinatura: str) -> str:
+    """
+    Codifica os valores de ordenação da última linha em um cursor opaco.
+
+    Args:
+        valores: Valores das colunas de ordenação, na ordem da ordenação
+        assinatura: Assinatura da ordenação e dos filtros da consulta
+
+    Returns:
+        str: Cursor em base64 (seguro para URLs)
+    """
+    dados = {"a": assinatura, "v": [_serializar_valor(valor) for valor in valores]}
+    return base64.urlsafe_b64encode(json.dumps(dados).encode()).decode()
+
+
+def decodificar_cursor(cursor: str, assinatura: str) -> list[Any]:
+    """
+    Decodifica um cursor gerado por `codificar_cursor`.
+
+    Args:
+        cursor: Cursor recebido do cliente
+        assinatura: Assinatura da ordenação e dos filtros da consulta atual
+
+    Returns:
+        list[Any]: Valores das colunas de ordenação
+
+    Raises:
+        HTTPException: 400 se o cursor for inválido ou de outra consulta
+    """
+    try:
+        dados = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        valores = [_desserializar_valor(valor) for valor in dados["v"]]
+        assinatura_cursor = dados["a"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(HTTPStatus.BAD_REQUEST, "Cursor inválido")
+
+    if assinatura_cursor != assinatura:
+        raise HTTPException(
+            HTTPStatus.BAD_REQUEST, "Cursor gerado para outra ordenação ou filtro"
+        )
+    return valores
+
+
+def colunas_ordenacao(ordenacao: list[UnaryExpression]) -> list[ColumnElement]:
+    """
+    Retorna as expressões ordenadas, sem a direção, para compor o SELECT.
+
+    Args:
+        ordenacao: Expressões de ordenação (`coluna.asc()` / `coluna.desc()`)
+
+    Returns:
+        list[ColumnElement]: Expressões das colunas
+    """
+    return [expressao.element for expressao in ordenacao]
+
+
+def filtro_keyset(
+    ordenacao: list[UnaryExpression], valores: list[Any]
+) -> ColumnElement[bool]:
+    """
+    Monta o filtro das linhas posteriores a `valores` na ordenação informada.
+
+    Segue a ordenação padrão do PostgreSQL para nulos: por último em colunas
+    ascendentes e primeiro em colunas descendentes.
+
+    Args:
+        ordenacao: Expressões de ordenação, terminando em uma coluna única
+        valores: Valores das colunas de ordenação da última linha já retornada
+
+    Returns:
+        ColumnElement[bool]: Condição (c1 > v1) OR (c1 = v1 AND c2 > v2) OR ...
+
+    Raises:
+        HTTPException: 400 se o número de valores não corresponder à ordenação
+    """
+    if len(valores) != len(ordenacao):
+        raise HTTPException(HTTPStatus.BAD_REQUEST, "Cursor inválido")
+
+    condicoes: list[ColumnElement[bool]] = []
+    iguais: list[ColumnElement[bool]] = []
+
+    for expressao, valor in zip(ordenacao, valores):
+        coluna = expressao.element
+        descendente = expressao.modifier is operators.desc_op
+
+        if valor is None:
+            # Nulos ficam no fim (asc) ou no início (desc) da ordenação
+            posterior = coluna.is_not(None) if descendente else false()
+            igual = coluna.is_(None)
+        elif descendente:
+            posterior = coluna < valor
+            igual = coluna == valor
+        else:
+            posterior = or_(coluna > valor, coluna.is_(None))
+            igual = coluna == valor
+
+        condicoes.append(and_(*iguais, posterior) if iguais else posterior)
+        iguais.append(igual)
+
+    return or_(*condicoes) if condicoes else true()
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from datetime import date, datetime
 import logging
-from typing import NotRequired, TypedDict
+from typing import Any, NotRequired, TypedDict
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
@@ -14,10 +14,14 @@ from sqlalchemy import (
     delete,
     update,
 )
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm.strategy_options import contains_eager
 from sqlalchemy.sql.functions import count
 
 from modules.auth.model import Usuario
+from modules.staging import carregar_staging
+
+from .paginacao import colunas_ordenacao, filtro_keyset
 
 from .schema import (
     GrupoSchema,
@@ -49,6 +53,17 @@ from .model import (
 class AtivosRepository:
     db: AsyncSession
 
+    __TABELA_STAGING_EVENTOS = "ativo_fluxos_staging"
+    __COLUNAS_EVENTOS = {
+        "ativo_codigo": "VARCHAR(11)",
+        "data_pagamento": "DATE",
+        "ativo_fluxo_tipo_id": "SMALLINT",
+        "data_evento": "DATE",
+        "percentual": "DOUBLE PRECISION",
+        "pu_evento": "DOUBLE PRECISION",
+        "pu_calculado": "DOUBLE PRECISION",
+    }
+
     class AssetDict(TypedDict):
         codigo: str
         valor_emissao: float
@@ -108,13 +123,9 @@ class AtivosRepository:
         total = await self.db.execute(select(count()).select_from(AtivoFluxo))
         return total.scalars().one()
 
-    async def lista_ativos(
-        self,
-        deslocamento: int = 0,
-        quantidade: int = 35,
-        ordenacao: list[UnaryExpression] = [Ativo.codigo.asc()],
-        filtro: list[ColumnElement[bool] | BinaryExpression[bool]] = [],
-    ):
+    async def conta_ativos(
+        self, filtro: list[ColumnElement[bool] | BinaryExpression[bool]] = []
+    ) -> int:
         total = await self.db.execute(
             select(count())
             .select_from(Ativo)
@@ -124,8 +135,18 @@ class AtivosRepository:
             .join(Ativo.ativo_ipca, isouter=True)
             .where(*filtro)
         )
+        return total.unique().scalar() or 0
+
+    async def lista_ativos(
+        self,
+        deslocamento: int = 0,
+        quantidade: int = 35,
+        ordenacao: list[UnaryExpression] = [Ativo.codigo.asc()],
+        filtro: list[ColumnElement[bool] | BinaryExpression[bool]] = [],
+        apos: list[Any] | None = None,
+    ):
         query = (
-            select(Ativo)
+            select(Ativo, *colunas_ordenacao(ordenacao))
             .join(Ativo.indice)
             .join(Ativo.tipo)
             .join(Ativo.emissor)
@@ -139,15 +160,27 @@ class AtivosRepository:
             )
             .where(*filtro)
             .order_by(*ordenacao)
-            .offset(deslocamento)
             .limit(quantidade)
         )
-        results = await self.db.execute(query)
+        if apos is not None:
+            query = query.where(filtro_keyset(ordenacao, apos))
+        else:
+            query = query.offset(deslocamento)
+
+        linhas = (await self.db.execute(query)).all()
 
         return (
-            results.scalars().all(),
-            total.unique().scalar() or 0,
+            [linha[0] for linha in linhas],
+            [*linhas[-1][1:]] if len(linhas) == quantidade else None,
+        )
+
+    async def conta_eventos(
+        self, filtro: list[ColumnElement[bool] | BinaryExpression[bool]] = []
+    ) -> int:
+        total = await self.db.execute(
+            select(count()).select_from(AtivoFluxo).join(AtivoFluxo.tipo).where(*filtro)
         )
+        return total.unique().scalar() or 0
 
     async def lista_eventos(
         self,
@@ -155,44 +188,48 @@ class AtivosRepository:
         quantidade: int = 35,
         ordenacao: list[UnaryExpression] = [AtivoFluxo.id.asc()],
         filtro: list[ColumnElement[bool] | BinaryExpression[bool]] = [],
+        apos: list[Any] | None = None,
     ):
-        total = await self.db.execute(
-            select(count()).select_from(AtivoFluxo).join(AtivoFluxo.tipo).where(*filtro)
-        )
         query_eventos = (
-            select(AtivoFluxo)
+            select(AtivoFluxo, *colunas_ordenacao(ordenacao))
             .join(AtivoFluxo.tipo)
             .options(contains_eager(AtivoFluxo.tipo))
             .where(*filtro)
             .order_by(*ordenacao)
-            .offset(deslocamento)
             .limit(quantidade)
         )
-        query_ativos = (
-            select(Ativo)
-            .join(Ativo.indice)
-            .join(Ativo.tipo)
-            .join(Ativo.emissor)
-            .join(Ativo.ativo_ipca, isouter=True)
-            .join(Ativo.fluxos)
-            .join(AtivoFluxo.tipo)
-            .options(
-                contains_eager(Ativo.indice),
-                contains_eager(Ativo.tipo),
-                contains_eager(Ativo.emissor),
-                contains_eager(Ativo.ativo_ipca),
+        if apos is not None:
+            query_eventos = query_eventos.where(filtro_keyset(ordenacao, apos))
+        else:
+            query_eventos = query_eventos.offset(deslocamento)
+
+        linhas = (await self.db.execute(query_eventos)).all()
+        eventos = [linha[0] for linha in linhas]
+
+        codigos_ativos = {evento.ativo_codigo for evento in eventos}
+        ativos = []
+        if len(codigos_ativos) > 0:
+            query_ativos = (
+                select(Ativo)
+                .join(Ativo.indice)
+                .join(Ativo.tipo)
+                .join(Ativo.emissor)
+                .join(Ativo.ativo_ipca, isouter=True)
+                .options(
+                    contains_eager(Ativo.indice),
+                    contains_eager(Ativo.tipo),
+                    contains_eager(Ativo.emissor),
+                    contains_eager(Ativo.ativo_ipca),
+                )
+                .where(Ativo.codigo.in_(codigos_ativos))
+                .order_by(Ativo.codigo.asc())
             )
-            .where(*filtro)
-            .order_by(*ordenacao)
-            .offset(deslocamento)
-            .limit(quantidade)
-        )
-        eventos = await self.db.execute(query_eventos)
-        ativos = await self.db.execute(query_ativos)
+            ativos = (await self.db.execute(query_ativos)).unique().scalars().all()
+
         return (
-            ativos.unique().scalars().all(),
-            eventos.scalars().all(),
-            total.unique().scalar() or 0,
+            ativos,
+            eventos,
+            [*linhas[-1][1:]] if len(linhas) == quantidade else None,
         )
 
     async def lista_codigos(self):
@@ -240,7 +277,6 @@ class AtivosRepository:
             remover_eventos: list[int] = []
 
             novos_ativos_ipca: list[AtivosRepository.InsertAtivoIPCADict] = []
-            remover_ativos_ipca: list[str] = []
 
             for ativo in atualizar:
                 atualizar_ativos.append(
@@ -299,7 +335,6 @@ class AtivosRepository:
                     ipca = ativo.ativo_ipca or IPCAAssetSchema(
                         ipca_2_meses=False, ipca_negativo=False, mesversario=15
                     )
-                    remover_ativos_ipca.append(ativo.codigo)
                     novos_ativos_ipca.append(
                         {
                             "ativo_codigo": ativo.codigo,
@@ -311,12 +346,10 @@ class AtivosRepository:
             if len(atualizar_ativos) > 0:
                 await self.db.execute(update(Ativo), atualizar_ativos)
 
-            await self.deletar_ativos_ipca(remover_ativos_ipca)
-            await self.inserir_ativos_ipca(novos_ativos_ipca)
-
-            await self.deletar_eventos(remover_eventos)
-            await self.atualizar_eventos(atualizar_eventos)
-            await self.inserir_eventos(novos_eventos)
+            await self.upsert_ativos_ipca(novos_ativos_ipca)
+            await self.aplicar_alteracoes_eventos(
+                remover_eventos, atualizar_eventos, novos_eventos
+            )
 
     async def inserir_ativos(self, inserir: list[InsertAssetSchema]):
         async with self.db.begin_nested():
@@ -360,6 +393,73 @@ class AtivosRepository:
                 return
             await self.inserir_eventos(novos_eventos)
 
+    async def upsert_ativos_ipca(self, ativos_ipca: list[InsertAtivoIPCADict]):
+        if len(ativos_ipca) == 0:
+            return
+        async with self.db.begin_nested():
+            stmt = postgresql.insert(AtivoIPCA).values(ativos_ipca)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[AtivoIPCA.ativo_codigo],
+                set_={
+                    "mesversario": stmt.excluded.mesversario,
+                    "ipca_negativo": stmt.excluded.ipca_negativo,
+                    "ipca_2_meses": stmt.excluded.ipca_2_meses,
+                },
+            )
+            await self.db.execute(stmt)
+
+    async def aplicar_alteracoes_eventos(
+        self,
+        deletar: list[int],
+        atualizar: list[UpdateEventDict],
+        inserir: list[EventDict],
+    ):
+        # Alterações de todos os ativos carregadas em uma tabela temporária (COPY) e
+        # aplicadas com um DELETE, um UPDATE e um INSERT, independente da quantidade
+        if len(deletar) + len(atualizar) + len(inserir) == 0:
+            return
+
+        registros = (
+            [("D", evento_id, *([None] * 7)) for evento_id in {*deletar}]
+            + [
+                ("U", evento["id"], *self.__valores_evento(evento))
+                for evento in atualizar
+            ]
+            + [("I", None, *self.__valores_evento(evento)) for evento in inserir]
+        )
+
+        async with self.db.begin_nested():
+            staging = await carregar_staging(
+                self.db,
+                self.__TABELA_STAGING_EVENTOS,
+                {"operacao": "CHAR(1) NOT NULL", "id": "INTEGER", **self.__COLUNAS_EVENTOS},
+                registros,
+            )
+            colunas = list(self.__COLUNAS_EVENTOS)
+
+            await self.db.execute(
+                delete(AtivoFluxo)
+                .where(AtivoFluxo.id == staging.c.id, staging.c.operacao == "D")
+                .execution_options(synchronize_session=False)
+            )
+            await self.db.execute(
+                update(AtivoFluxo)
+                .where(AtivoFluxo.id == staging.c.id, staging.c.operacao == "U")
+                .values({coluna: staging.c[coluna] for coluna in colunas})
+                .execution_options(synchronize_session=False)
+            )
+            await self.db.execute(
+                insert(AtivoFluxo).from_select(
+                    list(colunas),
+                    select(*(staging.c[coluna] for coluna in colunas)).where(
+                        staging.c.operacao == "I"
+                    ),
+                )
+            )
+
+    def __valores_evento(self, evento: EventDict) -> tuple:
+        return tuple(evento.get(coluna) for coluna in self.__COLUNAS_EVENTOS)
+
     async def deletar_ativos_ipca(self, codigos_ativos: list[str]):
         if len(codigos_ativos) == 0:
             return
@@ -614,7 +714,8 @@ class AtivosRepository:
         )
         return results.scalars().all()
 
-    def ativos(self, codigos: list[str]):
-        return self.lista_ativos(
+    async def ativos(self, codigos: list[str]):
+        ativos, _ = await self.lista_ativos(
             0, len(codigos), [Ativo.codigo.asc()], [Ativo.codigo.in_(codigos)]
         )
+        return ativos
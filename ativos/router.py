@@ -4,6 +4,7 @@ from typing import Annotated
 
 
 from fastapi import APIRouter, Depends, Request, Query, HTTPException, BackgroundTasks
+from fastapi.responses import JSONResponse, Response
 
 from config.swagger import token_field
 from modules.util.request import db
@@ -20,7 +21,8 @@ from .schema import (
     SetorTransactionSchema,
     UserSchema,
 )
-from .service import AtivosService
+from .notificacoes import fila_notificacoes
+from .service import AtivosService, Referencia
 
 
 def get_service(request: Request, bg_tasks: BackgroundTasks):
@@ -31,7 +33,23 @@ def get_service(request: Request, bg_tasks: BackgroundTasks):
     )
 
 
-router = APIRouter(prefix="/ativos", tags=["Ativos"], dependencies=[token_field])
+router = APIRouter(
+    prefix="/ativos",
+    tags=["Ativos"],
+    dependencies=[token_field],
+    # Envia as notificações ainda na fila antes de o processo encerrar
+    on_shutdown=[fila_notificacoes.esvaziar],
+)
+
+
+def resposta_referencia(request: Request, referencia: Referencia) -> Response:
+    headers = {"ETag": referencia.etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        etags = {etag.strip().removeprefix("W/") for etag in if_none_match.split(",")}
+        if "*" in etags or referencia.etag in etags:
+            return Response(status_code=HTTPStatus.NOT_MODIFIED, headers=headers)
+    return JSONResponse(referencia.dados, headers=headers)
 
 ordering = '<pre><code>type SortType = "asc" | "desc"</code></pre>'
 filters = """<pre><code>type FilterType = "blank" | "notBlank" | {
@@ -128,6 +146,12 @@ filtro_description_eventos = (
     + campos_eventos
 )
 
+cursor_description = (
+    "<p>Cursor opaco retornado em <code>proximo_cursor</code> pela página anterior, "
+    "com a mesma ordenação e filtros. Quando informado, <code>deslocamento</code> "
+    "é ignorado.</p>"
+)
+
 
 @router.get("/")
 async def ativos(
@@ -137,15 +161,16 @@ async def ativos(
         str, Query(description=ordenacao_description_ativos)
     ] = "",
     filtros_ativos: Annotated[str, Query(description=filtro_description_ativos)] = "",
+    cursor: Annotated[str | None, Query(description=cursor_description)] = None,
     service: AtivosService = Depends(get_service),
 ):
     dados_ordenacao = get_ordering(ordenacao_ativos)
     dados_filtragem = get_filtering(filtros_ativos)
 
-    ativos, total = await service.lista_ativos(
-        deslocamento, quantidade, dados_ordenacao, dados_filtragem
+    ativos, total, proximo_cursor = await service.lista_ativos(
+        deslocamento, quantidade, dados_ordenacao, dados_filtragem, cursor
     )
-    return {"ativos": ativos, "total": total}
+    return {"ativos": ativos, "total": total, "proximo_cursor": proximo_cursor}
 
 
 @router.get("/total")
@@ -166,47 +191,65 @@ async def eventos(
         str, Query(description=ordenacao_description_eventos)
     ] = "",
     filtros_eventos: Annotated[str, Query(description=filtro_description_eventos)] = "",
+    cursor: Annotated[str | None, Query(description=cursor_description)] = None,
     service: AtivosService = Depends(get_service),
 ):
     dados_ordenacao = get_ordering(ordenacao_eventos)
     dados_filtragem = get_filtering(filtros_eventos)
 
-    ativos, eventos, total = await service.lista_eventos(
-        deslocamento, quantidade, dados_ordenacao, dados_filtragem
+    ativos, eventos, total, proximo_cursor = await service.lista_eventos(
+        deslocamento, quantidade, dados_ordenacao, dados_filtragem, cursor
     )
-    return {"ativos": ativos, "eventos": eventos, "total": total}
+    return {
+        "ativos": ativos,
+        "eventos": eventos,
+        "total": total,
+        "proximo_cursor": proximo_cursor,
+    }
 
 
 @router.get("/codigos")
-async def codigos(service: AtivosService = Depends(get_service)):
-    codigos = await service.lista_codigos()
-    return codigos
+async def codigos(request: Request, service: AtivosService = Depends(get_service)):
+    referencia = await service.referencia(("codigos",), service.lista_codigos)
+    return resposta_referencia(request, referencia)
 
 
 @router.get("/nomes_emissores")
-async def nomes_emissores(service: AtivosService = Depends(get_service)):
-    nomes = await service.nomes_emissores()
-    return nomes
+async def nomes_emissores(
+    request: Request, service: AtivosService = Depends(get_service)
+):
+    referencia = await service.referencia(("nomes_emissores",), service.nomes_emissores)
+    return resposta_referencia(request, referencia)
 
 
 @router.get("/tipo_evento")
-async def tipo_eventos(service: AtivosService = Depends(get_service)):
-    return await service.tipo_evento(False)
+async def tipo_eventos(request: Request, service: AtivosService = Depends(get_service)):
+    referencia = await service.referencia(
+        ("tipo_evento", False), lambda: service.tipo_evento(False)
+    )
+    return resposta_referencia(request, referencia)
 
 
 @router.get("/tipo_evento/suportados")
-async def tipo_eventos_suportados(service: AtivosService = Depends(get_service)):
-    return await service.tipo_evento()
+async def tipo_eventos_suportados(
+    request: Request, service: AtivosService = Depends(get_service)
+):
+    referencia = await service.referencia(("tipo_evento", True), service.tipo_evento)
+    return resposta_referencia(request, referencia)
 
 
 @router.get("/tipo_ativos")
-async def tipo_ativos(service: AtivosService = Depends(get_service)):
-    return await service.tipo_ativos()
+async def tipo_ativos(request: Request, service: AtivosService = Depends(get_service)):
+    referencia = await service.referencia(("tipo_ativos",), service.tipo_ativos)
+    return resposta_referencia(request, referencia)
 
 
 @router.get("/indice")
-async def indice_ativos(service: AtivosService = Depends(get_service)):
-    return await service.indice_ativos()
+async def indice_ativos(
+    request: Request, service: AtivosService = Depends(get_service)
+):
+    referencia = await service.referencia(("indice",), service.indice_ativos)
+    return resposta_referencia(request, referencia)
 
 
 @router.put("/transacao")
@@ -259,18 +302,25 @@ async def emissor(
 
 @router.get("/setores")
 async def setores(
+    request: Request,
     with_sys_data: bool | None = None,
     service: AtivosService = Depends(get_service),
 ):
-    setores = await service.setores(bool(with_sys_data))
-    return [
-        SetorSchema(
-            id=setor.id,
-            nome=setor.nome,
-            sistema_icone=setor.icone.icone if with_sys_data and setor.icone else None,
-        ).model_dump(exclude_none=True)
-        for setor in setores
-    ]
+    async def carregar():
+        setores = await service.setores(bool(with_sys_data))
+        return [
+            SetorSchema(
+                id=setor.id,
+                nome=setor.nome,
+                sistema_icone=(
+                    setor.icone.icone if with_sys_data and setor.icone else None
+                ),
+            ).model_dump(exclude_none=True)
+            for setor in setores
+        ]
+
+    referencia = await service.referencia(("setores", bool(with_sys_data)), carregar)
+    return resposta_referencia(request, referencia)
 
 
 @router.put("/setores/transacao")
@@ -284,8 +334,9 @@ async def transacao_setores(
 
 
 @router.get("/grupos")
-async def grupos(service: AtivosService = Depends(get_service)):
-    return await service.grupos()
+async def grupos(request: Request, service: AtivosService = Depends(get_service)):
+    referencia = await service.referencia(("grupos",), service.grupos)
+    return resposta_referencia(request, referencia)
 
 
 @router.put("/grupos/transacao")
@@ -299,17 +350,23 @@ async def transacao_grupos(
 
 
 @router.get("/analistas")
-async def analistas(service: AtivosService = Depends(get_service)):
-    analistas = await service.analistas()
-    return [
-        AnalistaSchema(
-            id=analista.id,
-            user=UserSchema(
-                id=analista.user_id, email=analista.user.email, nome=analista.user.nome
-            ),
-        )
-        for analista in analistas
-    ]
+async def analistas(request: Request, service: AtivosService = Depends(get_service)):
+    async def carregar():
+        analistas = await service.analistas()
+        return [
+            AnalistaSchema(
+                id=analista.id,
+                user=UserSchema(
+                    id=analista.user_id,
+                    email=analista.user.email,
+                    nome=analista.user.nome,
+                ),
+            )
+            for analista in analistas
+        ]
+
+    referencia = await service.referencia(("analistas",), carregar)
+    return resposta_referencia(request, referencia)
 
 
 @router.get("/{codigo}")
@@ -1,12 +1,15 @@
-import config.database as db
+import hashlib
+import json
 
 from dataclasses import dataclass
-from datetime import date
 from decimal import Decimal
 from http import HTTPStatus
-from typing import Any, Callable, Literal, TypedDict
+from operator import attrgetter
+from typing import Any, Awaitable, Callable
 
-from modules.calculos.service import CalculosService
+import numpy as np
+from modules.cache import AsyncTTLCache
+from modules.calculos.calendario import datas_to_datetime64, get_calendario_b3
 
 
 from modules.util.datas import str_ymd_to_date
@@ -16,7 +19,9 @@ from modules.util.queries import (
     mapeamento_ordenacao,
     OrderingType,
 )
+from sqlalchemy import event
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, SessionTransaction
 
 from .model import (
     Ativo,
@@ -42,6 +47,7 @@ from .enums import SideOperacao
 
 from fastapi.exceptions import HTTPException
 from fastapi import BackgroundTasks
+from fastapi.encoders import jsonable_encoder
 
 from .schema import (
     IndiceAtivosSchema,
@@ -50,10 +56,48 @@ from .schema import (
 )
 
 from .repository import AtivosRepository
+from .paginacao import (
+    assinatura_consulta,
+    codificar_cursor,
+    decodificar_cursor,
+    totais_cache,
+)
+
+from .notificacoes import EventoEmissor, fila_notificacoes
+
+
+# Listas de referência do cadastro (tipos, índices, setores etc.), que mudam
+# poucas vezes por semana; invalidadas após o commit das transações que as
+# alteram. O cache é por processo: com mais de um worker, a invalidação só vale
+# para o worker que atendeu a escrita, e os demais podem servir a lista anterior
+# até o fim do TTL
+referencias_cache: AsyncTTLCache["Referencia"] = AsyncTTLCache(
+    ttl=600, maxsize=32, name="ativos_referencias"
+)
+
+
+# Chave em `Session.info` das funções a executar após o commit da sessão
+APOS_COMMIT = "ativos_apos_commit"
+
+
+def _executar_apos_commit(session: Session) -> None:
+    # after_commit também é disparado ao liberar savepoints (begin_nested)
+    if session.in_nested_transaction():
+        return
+    for funcao in session.info.pop(APOS_COMMIT, []):
+        funcao()
+
+
+def _descartar_apos_commit(session: Session, transaction: SessionTransaction) -> None:
+    # Transação principal encerrada sem commit (rollback): nada a executar
+    if transaction.parent is None:
+        session.info.pop(APOS_COMMIT, None)
 
-from modules.notifications.schema import NotificationSchema
-from modules.notifications.service import NotificationService
-from modules.notifications.repository import NotificationRepository
+
+@dataclass(frozen=True)
+class Referencia:
+    etag: str
+    dados: Any
 
 
 @dataclass
@@ -67,6 +111,7 @@ class AtivosService:
         quantidade: int,
         dados_ordenacao: list[tuple[str, OrderingType]],
         filtros: dict[str, tuple[str, list[str]]],
+        cursor: str | None = None,
     ):
         mapeamento_colunas: dict[str, ColType] = {
             "codigo": Ativo.codigo,
@@ -95,9 +140,23 @@ class AtivosService:
         colunas_solicitadas = {coluna for coluna, _ in dados_ordenacao}
         if "codigo" not in colunas_solicitadas:
             ordem_ordenacao.append(Ativo.codigo.asc())
-        return await self.ativos_repository.lista_ativos(
-            deslocamento, quantidade, ordem_ordenacao, filtros_orm
+
+        assinatura = assinatura_consulta("ativos", dados_ordenacao, filtros)
+        ativos, ultima_linha = await self.ativos_repository.lista_ativos(
+            deslocamento,
+            quantidade,
+            ordem_ordenacao,
+            filtros_orm,
+            decodificar_cursor(cursor, assinatura) if cursor else None,
+        )
+        total = await totais_cache.get_or_load(
+            ("ativos", assinatura_consulta(filtros)),
+            lambda: self.ativos_repository.conta_ativos(filtros_orm),
         )
+        proximo_cursor = (
+            codificar_cursor(ultima_linha, assinatura) if ultima_linha is not None else None
+        )
+        return ativos, total, proximo_cursor
 
     async def lista_eventos(
         self,
@@ -105,6 +164,7 @@ class AtivosService:
         quantidade: int,
         dados_ordenacao: list[tuple[str, OrderingType]],
         filtros: dict[str, tuple[str, list[str]]],
+        cursor: str | None = None,
     ):
         mapeamento_colunas: dict[str, ColType] = {
             "ativo_codigo": AtivoFluxo.ativo_codigo,
@@ -126,8 +186,53 @@ class AtivosService:
         if "data_pagamento" not in colunas_solicitadas:
             ordem_ordenacao.append(AtivoFluxo.data_pagamento.desc())
         ordem_ordenacao.append(AtivoFluxo.id.asc())
-        return await self.ativos_repository.lista_eventos(
-            deslocamento, quantidade, ordem_ordenacao, filtros_orm
+
+        assinatura = assinatura_consulta("eventos", dados_ordenacao, filtros)
+        ativos, eventos, ultima_linha = await self.ativos_repository.lista_eventos(
+            deslocamento,
+            quantidade,
+            ordem_ordenacao,
+            filtros_orm,
+            decodificar_cursor(cursor, assinatura) if cursor else None,
+        )
+        total = await totais_cache.get_or_load(
+            ("eventos", assinatura_consulta(filtros)),
+            lambda: self.ativos_repository.conta_eventos(filtros_orm),
+        )
+        proximo_cursor = (
+            codificar_cursor(ultima_linha, assinatura) if ultima_linha is not None else None
+        )
+        return ativos, eventos, total, proximo_cursor
+
+    async def referencia(
+        self, chave: tuple, carregar: Callable[[], Awaitable[Any]]
+    ) -> Referencia:
+        async def carregar_referencia() -> Referencia:
+            dados = jsonable_encoder(await carregar())
+            serializado = json.dumps(dados, sort_keys=True, default=str)
+            etag = '"' + hashlib.sha256(serializado.encode()).hexdigest()[:32] + '"'
+            return Referencia(etag=etag, dados=dados)
+
+        return await referencias_cache.get_or_load(chave, carregar_referencia)
+
+    def apos_commit(self, funcao: Callable[[], None]) -> None:
+        """
+        Agenda `funcao` para depois do commit da sessão da requisição.
+
+        Usado para invalidar caches: invalidados antes do commit, uma leitura
+        concorrente ainda veria (e guardaria) os dados antigos. Se a transação
+        for desfeita, a função não é executada.
+        """
+        session = self.ativos_repository.db.sync_session
+        if not event.contains(session, "after_commit", _executar_apos_commit):
+            event.listen(session, "after_commit", _executar_apos_commit)
+            event.listen(session, "after_transaction_end", _descartar_apos_commit)
+        session.info.setdefault(APOS_COMMIT, []).append(funcao)
+
+    def invalidar_referencias(self, *nomes: str) -> None:
+        """Invalida as listas de referência `nomes` após o commit da requisição."""
+        self.apos_commit(
+            lambda: referencias_cache.invalidate_matching(lambda chave: chave[0] in nomes)
         )
 
     async def lista_codigos(self):
@@ -170,48 +275,32 @@ class AtivosService:
         atualizar_schema: list[UpdateAssetSchema],
         inserir_schema: list[InsertAssetSchema],
     ):
-        datas_fornecidas: list[date] = []
-        for atualizado in atualizar_schema:
-            datas_fornecidas += [
-                atualizado.data_emissao,
-                atualizado.inicio_rentabilidade,
-                atualizado.data_vencimento,
-            ] + [
-                evento.data_pagamento
-                for evento in atualizado.fluxos.added + atualizado.fluxos.modified
+        eventos_atualizados = [
+            evento
+            for atualizado in atualizar_schema
+            for evento in atualizado.fluxos.added + atualizado.fluxos.modified
+        ]
+        eventos_inseridos = [
+            evento for inserido in inserir_schema for evento in inserido.fluxos
+        ]
+        ativos = [*atualizar_schema, *inserir_schema]
+
+        AtivosService.ajustar_datas_dias_uteis(
+            [
+                (ativos, "data_emissao"),
+                (ativos, "inicio_rentabilidade"),
+                (ativos, "data_vencimento"),
+                (eventos_atualizados, "data_pagamento"),
+                (eventos_inseridos, "data_pagamento"),
             ]
-        for inserido in inserir_schema:
-            datas_fornecidas += [
-                inserido.data_emissao,
-                inserido.inicio_rentabilidade,
-                inserido.data_vencimento,
-            ] + [evento.data_pagamento for evento in inserido.fluxos]
-
-        datas_corrigidas = CalculosService.dias_uteis_seguintes(datas_fornecidas)
-
-        date_i = 0
-        for atualizado in atualizar_schema:
-            atualizado.data_emissao = datas_corrigidas[date_i]
-            atualizado.inicio_rentabilidade = datas_corrigidas[date_i + 1]
-            atualizado.data_vencimento = datas_corrigidas[date_i + 2]
-            date_i += 3
-            for evento in atualizado.fluxos.added + atualizado.fluxos.modified:
-                evento.data_pagamento = datas_corrigidas[date_i]
-                date_i += 1
-
-        for inserido in inserir_schema:
-            inserido.data_emissao = datas_corrigidas[date_i]
-            inserido.inicio_rentabilidade = datas_corrigidas[date_i + 1]
-            inserido.data_vencimento = datas_corrigidas[date_i + 2]
-            date_i += 3
-            for evento in inserido.fluxos:
-                evento.data_pagamento = datas_corrigidas[date_i]
-                date_i += 1
+        )
 
         try:
             await self.ativos_repository.transacao(
                 deletar_schema, atualizar_schema, inserir_schema
             )
+            self.apos_commit(totais_cache.invalidate)
+            self.invalidar_referencias("codigos")
         except IntegrityError as err:
             # Entradas duplicadas
             failure = str(err._message()).split("=")
@@ -224,108 +313,65 @@ class AtivosService:
         )
         return emissores, total
 
-    class UsuarioEmissor(TypedDict):
-        analista_id: int
-        user_id: int | None
-        emissor_id: int
-        emissor_nome: str
-        atualizacao: Literal["alocado", "desalocado", "atualizado"]
-
-    @staticmethod
-    async def send_notifications(analistas: list[UsuarioEmissor]):
-        async with db.get_session(db.engine) as session:
-            notification_service = NotificationService(
-                notification_repository=NotificationRepository(db=session)
-            )
-            messages: list[NotificationSchema] = []
-            for dados in analistas:
-                if not dados["user_id"]:
-                    continue
-                texto = ""
-                emissor = dados["emissor_nome"]
-                att = dados["atualizacao"]
-                match att:
-                    case "alocado":
-                        texto = f"Você foi alocado para o emissor {emissor}."
-                    case "atualizado":
-                        texto = f"As informações do emissor {emissor} foram alteradas no banco de dados."
-                    case "desalocado":
-                        texto = f"Você não está mais alocado para o emissor {emissor}"
-                messages.append(
-                    NotificationSchema(
-                        user_id=dados["user_id"],
-                        link="/emissores/" + str(dados["emissor_id"]),
-                        text=texto,
-                    )
-                )
-            await notification_service.send(messages)
-            await session.commit()
-
     @staticmethod
-    async def notificar_alteracoes(
+    def eventos_alteracoes(
         emissores_antigos: list[UpdateEmissorSchema],
         emissores_atualizados: list[UpdateEmissorSchema],
         emissores_criados: list[UpdateEmissorSchema],
-    ):
-        async with db.get_session(db.engine) as session:
-            ativos_repository = AtivosRepository(db=session)
-
-            notificados: dict[int, AtivosService.UsuarioEmissor] = {}
-
-            for inserted in emissores_criados:
-                if not inserted.analista_credito_id:
-                    continue
-                notificados[inserted.analista_credito_id] = {
+    ) -> list[EventoEmissor]:
+        eventos: list[EventoEmissor] = []
+
+        for inserted in emissores_criados:
+            if not inserted.analista_credito_id:
+                continue
+            eventos.append(
+                {
                     "analista_id": inserted.analista_credito_id,
                     "emissor_id": inserted.id,
                     "emissor_nome": inserted.nome,
-                    "user_id": None,
                     "atualizacao": "alocado",
                 }
-            for pos, antigo in enumerate(emissores_antigos):
-                atualizado = emissores_atualizados[pos]
-                if antigo.analista_credito_id != atualizado.analista_credito_id:
-                    if atualizado.analista_credito_id:
-                        notificados[atualizado.analista_credito_id] = {
+            )
+        for pos, antigo in enumerate(emissores_antigos):
+            atualizado = emissores_atualizados[pos]
+            if antigo.analista_credito_id != atualizado.analista_credito_id:
+                if atualizado.analista_credito_id:
+                    eventos.append(
+                        {
                             "analista_id": atualizado.analista_credito_id,
                             "emissor_id": atualizado.id,
                             "emissor_nome": atualizado.nome,
-                            "user_id": None,
                             "atualizacao": "alocado",
                         }
-                    if antigo.analista_credito_id:
-                        notificados[antigo.analista_credito_id] = {
+                    )
+                if antigo.analista_credito_id:
+                    eventos.append(
+                        {
                             "analista_id": antigo.analista_credito_id,
                             "emissor_id": atualizado.id,
                             "emissor_nome": atualizado.nome,
-                            "user_id": None,
                             "atualizacao": "desalocado",
                         }
-                    continue
-                elif antigo.analista_credito_id and (
-                    antigo.cnpj != atualizado.cnpj
-                    or antigo.nome != atualizado.nome
-                    or antigo.grupo_id != atualizado.grupo_id
-                    or antigo.setor_id != atualizado.setor_id
-                    or antigo.tier != atualizado.tier
-                    or antigo.codigo_cvm != atualizado.codigo_cvm
-                ):
-                    notificados[antigo.analista_credito_id] = {
+                    )
+                continue
+            elif antigo.analista_credito_id and (
+                antigo.cnpj != atualizado.cnpj
+                or antigo.nome != atualizado.nome
+                or antigo.grupo_id != atualizado.grupo_id
+                or antigo.setor_id != atualizado.setor_id
+                or antigo.tier != atualizado.tier
+                or antigo.codigo_cvm != atualizado.codigo_cvm
+            ):
+                eventos.append(
+                    {
                         "analista_id": antigo.analista_credito_id,
                         "emissor_id": antigo.id,
                         "emissor_nome": antigo.nome,
-                        "user_id": None,
                         "atualizacao": "atualizado",
                     }
-            analistas_preenchidos = await ativos_repository.analistas_from_ids(
-                [id for id in notificados]
-            )
-            for preenchido in analistas_preenchidos:
-                notificados[preenchido.id]["user_id"] = preenchido.user_id
+                )
 
-            await AtivosService.send_notifications(
-                [notificados[id] for id in notificados]
-            )
+        return eventos
 
     async def transacao_emissores(
         self, update: list[UpdateEmissorSchema], insert: list[InsertEmissorSchema]
@@ -334,14 +380,19 @@ class AtivosService:
             new_ids, old = await self.ativos_repository.transacao_emissores(
                 update, insert
             )
+            self.invalidar_referencias("nomes_emissores")
+            # Enfileiradas só após a resposta, isto é, após o commit da transação;
+            # o envio em lote fica a cargo do worker da fila
             self.background_tasks.add_task(
-                AtivosService.notificar_alteracoes,
-                old,
-                update,
-                [
-                    UpdateEmissorSchema(**ins.model_dump(), id=new_ids[i])
-                    for i, ins in enumerate(insert)
-                ],
+                fila_notificacoes.adicionar,
+                AtivosService.eventos_alteracoes(
+                    old,
+                    update,
+                    [
+                        UpdateEmissorSchema(**ins.model_dump(), id=new_ids[i])
+                        for i, ins in enumerate(insert)
+                    ],
+                ),
             )
         except IntegrityError as err:
             # Entradas duplicadas
@@ -364,6 +415,7 @@ class AtivosService:
             await self.ativos_repository.transacao_setores(
                 atualizar_schema, inserir_schema
             )
+            self.invalidar_referencias("setores")
         except IntegrityError as err:
             # Entradas duplicadas
             failure = str(err._message()).split("=")
@@ -382,6 +434,7 @@ class AtivosService:
             await self.ativos_repository.transacao_grupos(
                 atualizar_schema, inserir_schema
             )
+            self.invalidar_referencias("grupos")
         except IntegrityError as err:
             # Entradas duplicadas
             failure = str(err._message()).split("=")
@@ -391,6 +444,36 @@ class AtivosService:
     async def analistas(self):
         return await self.ativos_repository.analistas()
 
+    @staticmethod
+    def ajustar_datas_dias_uteis(colunas: list[tuple[list[Any], str]]) -> None:
+        """
+        Ajusta para o dia útil seguinte o atributo de data de cada grupo de objetos.
+
+        Cada coluna (objetos, atributo) vira um array `datetime64[D]`; todas são
+        ajustadas em uma única chamada ao calendário e só as datas alteradas são
+        gravadas de volta nos objetos.
+        """
+        tamanhos = [len(objetos) for objetos, _ in colunas]
+        if sum(tamanhos) == 0:
+            return
+
+        datas = np.concatenate(
+            [
+                datas_to_datetime64(map(attrgetter(atributo), objetos))
+                for objetos, atributo in colunas
+            ]
+        )
+        datas_ajustadas = get_calendario_b3().ajustar_dias_uteis_seguintes(datas)
+
+        inicio = 0
+        for (objetos, atributo), tamanho in zip(colunas, tamanhos):
+            fim = inicio + tamanho
+            alteradas = np.flatnonzero(datas_ajustadas[inicio:fim] != datas[inicio:fim])
+            novas_datas = datas_ajustadas[inicio:fim][alteradas].astype(object)
+            for posicao, data in zip(alteradas.tolist(), novas_datas.tolist()):
+                setattr(objetos[posicao], atributo, data)
+            inicio = fim
+
     @staticmethod
     def is_ativo_offshore(isin: str) -> bool:
         return isin.startswith("US")
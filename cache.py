@@ -0,0 +1,196 @@
+"""
+Cache assíncrono em memória com TTL.
+
+Usado pelos repositórios para memorizar consultas de referência (mapeamentos
+nome -> id, listas de cadastro etc.) que mudam raramente. Diferente de
+`functools.lru_cache`, que em funções `async` guarda a corrotina e não o seu
+resultado, este cache:
+
+- guarda o valor resolvido por um tempo limitado (TTL);
+- executa uma única consulta por chave quando várias corrotinas encontram a
+  mesma entrada ausente ao mesmo tempo (single-flight);
+- não mantém referência ao repositório nem à sessão usada na carga;
+- permite invalidar uma chave ou o cache inteiro após escritas.
+
+Exemplo:
+    _referencias_cache = AsyncTTLCache(ttl=300, name="referencias")
+
+    async def buscar_referencias(self) -> dict[str, int]:
+        return await _referencias_cache.get_or_load("referencias", self._carregar_referencias)
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Generic, Hashable, TypeVar
+
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class AsyncTTLCache(Generic[V]):
+    """Cache em memória com TTL, limite de entradas (LRU) e single-flight por chave."""
+
+    def __init__(self, ttl: float, maxsize: int = 128, name: str = "cache"):
+        """
+        Inicializa o cache.
+
+        Args:
+            ttl (float): Validade das entradas em segundos
+            maxsize (int): Número máximo de entradas; as menos usadas são removidas
+            name (str): Nome usado em estatísticas e logs
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.name = name
+        self._entries: OrderedDict[Hashable, tuple[float, V]] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        # Incrementada a cada invalidação para descartar cargas iniciadas antes dela
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> V | Any:
+        """
+        Retorna o valor da chave se presente e válido, sem disparar carga.
+
+        Args:
+            key (Hashable): Chave da entrada
+            default (Any): Valor retornado quando a entrada está ausente ou expirada
+
+        Returns:
+            V | Any: Valor em cache ou `default`
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return default
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: V) -> None:
+        """
+        Grava um valor no cache, removendo as entradas menos usadas se necessário.
+
+        Args:
+            key (Hashable): Chave da entrada
+            value (V): Valor a ser guardado
+        """
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[V]]) -> V:
+        """
+        Retorna o valor da chave, carregando-o com `loader` em caso de ausência.
+
+        Corrotinas que pedem a mesma chave durante uma carga aguardam o resultado
+        dela em vez de executar outra consulta. Erros da carga são repassados a
+        todas as corrotinas que a aguardavam e nada é gravado no cache.
+
+        Args:
+            key (Hashable): Chave da entrada
+            loader (Callable[[], Awaitable[V]]): Função assíncrona que produz o valor
+
+        Returns:
+            V: Valor em cache ou recém-carregado
+        """
+        while True:
+            value = self.get(key, _MISSING)
+            if value is not _MISSING:
+                self.hits += 1
+                return value
+
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                # Carga cancelada junto com a corrotina que a iniciou: tentar novamente
+                if inflight.cancelled():
+                    continue
+                raise
+
+        self.misses += 1
+        generation = self._generation
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Evita o aviso de exceção não recuperada quando ninguém aguardava
+            future.exception()
+            raise
+        else:
+            if generation == self._generation:
+                self.set(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def invalidate(self, key: Hashable | None = None) -> None:
+        """
+        Remove uma entrada do cache, ou todas quando `key` não é informada.
+
+        Cargas em andamento continuam entregando o resultado a quem as aguarda,
+        mas não gravam no cache.
+
+        Args:
+            key (Hashable | None): Chave a invalidar
+        """
+        self._generation += 1
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def invalidate_matching(self, predicate: Callable[[Hashable], bool]) -> int:
+        """
+        Remove as entradas cujas chaves satisfazem `predicate`.
+
+        Args:
+            predicate (Callable[[Hashable], bool]): Filtro aplicado a cada chave
+
+        Returns:
+            int: Número de entradas removidas
+        """
+        self._generation += 1
+        keys = [key for key in self._entries if predicate(key)]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        """Remove todas as entradas do cache."""
+        self.invalidate()
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Retorna estatísticas de uso do cache.
+
+        Returns:
+            dict[str, Any]: Nome, entradas, acertos, faltas e cargas em andamento
+        """
+        return {
+            "nome": self.name,
+            "entradas": len(self._entries),
+            "acertos": self.hits,
+            "faltas": self.misses,
+            "cargas_em_andamento": len(self._inflight),
+        }
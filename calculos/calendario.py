@@ -0,0 +1,209 @@
+"""
+Calendário de dias úteis com aritmética de datas vetorizada.
+
+Os feriados são convertidos uma única vez em um `numpy.busdaycalendar`, e as
+operações aceitam tanto datas isoladas quanto listas/arrays de datas, resolvidas
+em uma única chamada `numpy.busday_*`. Consultas de datas isoladas são memorizadas
+por (data, deslocamento), já que as rotinas de coleta repetem as mesmas datas
+para cada índice e cotação.
+
+Exemplo:
+    calendario = get_calendario_b3()
+    data_ultima_cotacao = calendario.get_data_d_util_menos_x_dias(2, date.today())
+    datas_ajustadas = calendario.ajustar_dias_uteis_seguintes(datas)
+"""
+
+from datetime import date
+from functools import lru_cache
+from typing import Iterable, Sized
+
+import numpy as np
+import numpy.typing as npt
+from modules.util.feriados_financeiros_numpy import feriados as feriados_b3
+
+DatasLike = date | np.datetime64 | Iterable[date] | npt.NDArray[np.datetime64]
+
+_ORDINAL_EPOCH = date(1970, 1, 1).toordinal()
+
+
+def datas_to_datetime64(datas: Iterable[date]) -> npt.NDArray[np.datetime64]:
+    """
+    Converte uma sequência de `date` em um array `datetime64[D]`.
+
+    A conversão passa pelos ordinais das datas, bem mais rápida que deixar o
+    NumPy converter cada objeto `date` (relevante a partir de milhares de datas).
+
+    Args:
+        datas: Datas a converter (iterável de `date`, inclusive geradores)
+
+    Returns:
+        NDArray[datetime64[D]]: Datas na mesma ordem
+    """
+    ordinais = np.fromiter(
+        map(date.toordinal, datas),
+        dtype=np.int64,
+        count=len(datas) if isinstance(datas, Sized) else -1,
+    )
+    return (ordinais - _ORDINAL_EPOCH).astype("datetime64[D]")
+
+
+def _to_datetime64(datas: DatasLike) -> npt.NDArray[np.datetime64]:
+    if isinstance(datas, (list, tuple)) and datas and isinstance(datas[0], date):
+        return datas_to_datetime64(datas)
+    return np.asarray(datas, dtype="datetime64[D]")
+
+
+def _to_date(datas: npt.NDArray[np.datetime64]) -> date | list[date]:
+    return datas.astype(object).tolist()
+
+
+class CalendarioDiasUteis:
+    """Aritmética de dias úteis (segunda a sexta, exceto feriados) sobre datas e arrays."""
+
+    def __init__(self, feriados: Iterable[date] | npt.NDArray[np.datetime64] = ()):
+        """
+        Inicializa o calendário.
+
+        Args:
+            feriados: Datas de feriados, em qualquer ordem
+        """
+        self.feriados: npt.NDArray[np.datetime64] = np.unique(_to_datetime64(list(feriados)))
+        self._busdaycal = np.busdaycalendar(holidays=self.feriados)
+        self._memo: dict[tuple[date, int], date] = {}
+
+    def is_dia_util(self, datas: DatasLike) -> bool | npt.NDArray[np.bool_]:
+        """
+        Indica se cada data é dia útil.
+
+        Args:
+            datas: Data ou datas
+
+        Returns:
+            bool | NDArray[bool]: Resultado com o mesmo formato da entrada
+        """
+        resultado = np.is_busday(_to_datetime64(datas), busdaycal=self._busdaycal)
+        return bool(resultado) if np.ndim(resultado) == 0 else resultado
+
+    def adicionar_dias_uteis(
+        self, datas: DatasLike, dias: int | npt.ArrayLike
+    ) -> npt.NDArray[np.datetime64]:
+        """
+        Desloca as datas em `dias` dias úteis (negativo para datas anteriores).
+
+        Datas que não são dias úteis contam a partir do dia útil mais próximo na
+        direção do deslocamento: D+1 de um sábado é a segunda-feira e D-1 de um
+        sábado é a sexta-feira. Com `dias` igual a zero a data é ajustada para o
+        dia útil anterior, nunca para uma data futura (para o seguinte, use
+        `ajustar_dias_uteis_seguintes`).
+
+        Args:
+            datas: Data ou datas
+            dias: Deslocamento, escalar ou por data
+
+        Returns:
+            NDArray[datetime64[D]]: Datas deslocadas, com o formato da entrada
+        """
+        datas_np = _to_datetime64(datas)
+        dias_np = np.asarray(dias, dtype=np.int64)
+
+        # busday_offset aceita um único modo de ajuste por chamada
+        para_frente = np.busday_offset(
+            datas_np, dias_np, roll="backward", busdaycal=self._busdaycal
+        )
+        para_tras = np.busday_offset(
+            datas_np, dias_np, roll="forward", busdaycal=self._busdaycal
+        )
+        return np.where(dias_np >= 0, para_frente, para_tras)
+
+    def contar_dias_uteis(
+        self, datas_inicio: DatasLike, datas_fim: DatasLike
+    ) -> int | npt.NDArray[np.int64]:
+        """
+        Conta os dias úteis no intervalo [inicio, fim) de cada par de datas.
+
+        Args:
+            datas_inicio: Data ou datas de início (inclusivas)
+            datas_fim: Data ou datas de fim (exclusivas)
+
+        Returns:
+            int | NDArray[int]: Número de dias úteis, negativo se fim < inicio
+        """
+        resultado = np.busday_count(
+            _to_datetime64(datas_inicio), _to_datetime64(datas_fim), busdaycal=self._busdaycal
+        )
+        return int(resultado) if np.ndim(resultado) == 0 else resultado
+
+    def ajustar_dias_uteis_seguintes(self, datas: DatasLike) -> npt.NDArray[np.datetime64]:
+        """
+        Ajusta as datas que não são dias úteis para o dia útil seguinte.
+
+        Args:
+            datas: Data ou datas
+
+        Returns:
+            NDArray[datetime64[D]]: Datas ajustadas, com o formato da entrada
+        """
+        return np.busday_offset(
+            _to_datetime64(datas), 0, roll="forward", busdaycal=self._busdaycal
+        )
+
+    def dias_uteis_seguintes(self, datas: Iterable[date]) -> list[date]:
+        """
+        Versão de `ajustar_dias_uteis_seguintes` para listas de `date`.
+
+        Args:
+            datas: Datas a ajustar
+
+        Returns:
+            list[date]: Datas ajustadas, na mesma ordem
+        """
+        datas = list(datas)
+        if not datas:
+            return []
+        return _to_date(self.ajustar_dias_uteis_seguintes(datas))
+
+    def _deslocar(self, data_input: date, dias: int) -> date:
+        chave = (data_input, dias)
+        resultado = self._memo.get(chave)
+        if resultado is None:
+            resultado = self._memo[chave] = _to_date(self.adicionar_dias_uteis(data_input, dias))
+        return resultado
+
+    def get_data_d_util_mais_x_dias(self, x_dias: int, data_input: date) -> date:
+        """
+        Retorna a data `x_dias` dias úteis após `data_input` (memorizado).
+
+        Args:
+            x_dias: Número de dias úteis
+            data_input: Data de referência
+
+        Returns:
+            date: Data deslocada
+        """
+        return self._deslocar(data_input, x_dias)
+
+    def get_data_d_util_menos_x_dias(self, x_dias: int, data_input: date) -> date:
+        """
+        Retorna a data `x_dias` dias úteis antes de `data_input` (memorizado).
+
+        Args:
+            x_dias: Número de dias úteis
+            data_input: Data de referência
+
+        Returns:
+            date: Data deslocada
+        """
+        return self._deslocar(data_input, -x_dias)
+
+
+@lru_cache(maxsize=1)
+def get_calendario_b3() -> CalendarioDiasUteis:
+    """
+    Retorna o calendário de dias úteis da B3, compartilhado pelo processo.
+
+    Construído na primeira chamada a partir de `feriados_financeiros_numpy`.
+
+    Returns:
+        CalendarioDiasUteis: Calendário com os feriados financeiros
+    """
+    return CalendarioDiasUteis(feriados_b3)
@@ -0,0 +1,71 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+from modules.calculos.calendario import CalendarioDiasUteis
+
+SABADO = date(2026, 10, 17)
+SEXTA = date(2026, 10, 16)
+SEGUNDA = date(2026, 10, 19)
+# Finados, em uma segunda-feira
+FERIADO = date(2026, 11, 2)
+
+
+@pytest.fixture
+def calendario():
+    return CalendarioDiasUteis([FERIADO])
+
+
+class TestDiaUtilMenosXDias:
+    """Testes do deslocamento para datas anteriores"""
+
+    def test_zero_em_fim_de_semana(self, calendario):
+        """Testa que D-0 de um sábado é a sexta-feira anterior, nunca a segunda"""
+        assert calendario.get_data_d_util_menos_x_dias(0, SABADO) == SEXTA
+
+    def test_zero_em_feriado(self, calendario):
+        """Testa que D-0 de um feriado é o dia útil anterior"""
+        assert calendario.get_data_d_util_menos_x_dias(0, FERIADO) == date(2026, 10, 30)
+
+    def test_zero_em_dia_util(self, calendario):
+        """Testa que D-0 de um dia útil é a própria data"""
+        assert calendario.get_data_d_util_menos_x_dias(0, SEGUNDA) == SEGUNDA
+
+    def test_um_dia_em_fim_de_semana(self, calendario):
+        """Testa que D-1 de um sábado é a sexta-feira"""
+        assert calendario.get_data_d_util_menos_x_dias(1, SABADO) == SEXTA
+
+    def test_um_dia_apos_feriado(self, calendario):
+        """Testa que o feriado não conta como dia útil"""
+        assert calendario.get_data_d_util_menos_x_dias(1, date(2026, 11, 3)) == date(2026, 10, 30)
+
+
+class TestAdicionarDiasUteis:
+    """Testes do deslocamento vetorizado"""
+
+    def test_deslocamentos_por_data(self, calendario):
+        """Testa deslocamentos negativos, zero e positivos a partir de um sábado"""
+        resultado = calendario.adicionar_dias_uteis(SABADO, [-1, 0, 1])
+        esperado = np.array([SEXTA, SEXTA, SEGUNDA], dtype="datetime64[D]")
+
+        np.testing.assert_array_equal(resultado, esperado)
+
+    def test_zero_nunca_avanca(self, calendario):
+        """Testa que deslocamento zero nunca resulta em data posterior"""
+        datas = [SABADO, date(2026, 10, 18), FERIADO, SEGUNDA]
+        resultado = calendario.adicionar_dias_uteis(datas, 0)
+
+        assert (resultado <= np.asarray(datas, dtype="datetime64[D]")).all()
+
+
+class TestAjustarDiasUteisSeguintes:
+    """Testes do ajuste para o dia útil seguinte"""
+
+    def test_fim_de_semana_e_feriado(self, calendario):
+        """Testa que fins de semana e feriados avançam para o dia útil seguinte"""
+        assert calendario.dias_uteis_seguintes([SABADO, FERIADO, SEXTA]) == [
+            SEGUNDA,
+            date(2026, 11, 3),
+            SEXTA,
+        ]
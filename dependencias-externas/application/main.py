@@ -1,4 +1,6 @@
 import logging
+import os
+from contextlib import asynccontextmanager
 from logging import Filter, LogRecord, getLogger
 
 from fastapi import FastAPI
@@ -7,6 +9,7 @@ from fastapi.responses import FileResponse
 logging.basicConfig(level=logging.INFO, format="%(levelname)s:\t%(message)s")
 
 from modules.leitor_documentos.handlers import register_exception_handlers
+from modules.leitor_documentos.pool import extraction_pool
 from modules.leitor_documentos.router import router as leitor_documentos_router
 from modules.navegador.impl.playwright import NavegadorPlaywright
 from modules.navegador.service import NavegadorService
@@ -18,7 +21,17 @@ description = f"""
 - [Home](/docs)
 """
 
-app = FastAPI(description=description, title="Home")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Inicia os workers de extração já com os modelos do Docling carregados
+    if os.getenv("LEITOR_DOCS_WARM_UP", "true").lower() == "true":
+        extraction_pool.start()
+    yield
+    extraction_pool.shutdown()
+
+
+app = FastAPI(description=description, title="Home", lifespan=lifespan)
 
 # Registrar exception handlers do módulo leitor_documentos
 register_exception_handlers(app)
@@ -29,7 +42,7 @@ app.include_router(leitor_documentos_router)
 
 @app.get("/healthcheck")
 def main():
-    return {"healthy": True}
+    return {"healthy": True, "extracao": extraction_pool.stats()}
 
 
 @app.get("/navegador/teste")
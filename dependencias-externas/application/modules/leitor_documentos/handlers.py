@@ -11,6 +11,8 @@ from logger import leitor_logger as logger
 
 from .exceptions import (
     DocumentExtractionException,
+    ExtractionQueueFullException,
+    ExtractionTimeoutException,
     ExtractorNotFoundException,
     FileNotFoundException,
     FileSizeException,
@@ -92,6 +94,37 @@ async def file_not_found_exception_handler(
     )
 
 
+async def extraction_queue_full_exception_handler(
+    request: Request, exc: ExtractionQueueFullException
+) -> JSONResponse:
+    """Handler para pool de extração saturado."""
+    logger.warning("Pool de extração saturado na rota {}: {}", request.url.path, str(exc))
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": "30"},
+        content={
+            "success": False,
+            "error": exc.message,
+            "error_code": exc.error_code,
+        },
+    )
+
+
+async def extraction_timeout_exception_handler(
+    request: Request, exc: ExtractionTimeoutException
+) -> JSONResponse:
+    """Handler para extrações que excederam o tempo limite."""
+    logger.error("Timeout de extração na rota {}: {}", request.url.path, str(exc))
+    return JSONResponse(
+        status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+        content={
+            "success": False,
+            "error": exc.message,
+            "error_code": exc.error_code,
+        },
+    )
+
+
 async def document_extraction_exception_handler(
     request: Request, exc: DocumentExtractionException
 ) -> JSONResponse:
@@ -129,6 +162,8 @@ EXCEPTION_HANDLERS: dict[type[Exception], callable] = {
     UnsupportedFormatException: unsupported_format_exception_handler,
     ExtractorNotFoundException: extractor_not_found_exception_handler,
     FileNotFoundException: file_not_found_exception_handler,
+    ExtractionQueueFullException: extraction_queue_full_exception_handler,
+    ExtractionTimeoutException: extraction_timeout_exception_handler,
     DocumentExtractionException: document_extraction_exception_handler,
     NotImplementedError: not_implemented_exception_handler,
 }
@@ -29,6 +29,7 @@ class ConversionMetadata(BaseModel):
     extractor_used: str = Field(..., description="Nome do extractor utilizado")
     created_at: datetime = Field(default_factory=datetime.now, description="Data/hora da extração")
     filename: str | None = Field(None, description="Nome do arquivo")
+    cache_hit: bool = Field(False, description="Se o resultado veio do cache de extração")
 
 
 class ExtractionServiceResponse(BaseModel):
@@ -69,8 +70,28 @@ class CleanupResponse(BaseModel):
     removed_count: int = Field(..., description="Número de arquivos removidos")
 
 
+class TipoExtracaoEnum(str, Enum):
+    markdown = "markdown"
+    dados_brutos = "dados-brutos"
+    imagens = "imagens"
+
+
 class FerramentaExtracaoEnum(str, Enum):
     docling = "docling"
     docx2txt = "docx2txt"
     llmwhisperer = "llmwhisperer"
     pypdf = "pypdf"
+
+
+class ExtracaoPorCaminhoRequest(BaseModel):
+    """Requisição de extração de um arquivo do diretório compartilhado"""
+
+    caminho: str = Field(
+        ..., min_length=1, description="Caminho do arquivo relativo ao diretório compartilhado"
+    )
+    tipo_extracao: TipoExtracaoEnum = Field(
+        TipoExtracaoEnum.markdown, description="Tipo de extração"
+    )
+    ferramenta_extracao: FerramentaExtracaoEnum | None = Field(
+        None, description="Ferramenta específica (opcional)"
+    )
@@ -1,8 +1,11 @@
+import asyncio
+import hashlib
 import sys
 import time
 import uuid
 from datetime import datetime
 from pathlib import Path
+from typing import NamedTuple
 
 # Adicionar o diretório raiz ao path para imports
 sys.path.append(str(Path(__file__).parent.parent.parent))
@@ -11,12 +14,17 @@ from fastapi import UploadFile
 from logger import leitor_logger as logger
 
 from .base import DocumentExtractor
-from .exceptions import DocumentExtractionException, ExtractorNotFoundException
+from .cache import ExtractionCache, compute_file_hash, extraction_cache
+from .exceptions import DocumentExtractionException, ExtractorNotFoundException, FileSizeException
 
 # Import extractors to ensure they are registered
 from .impl import *
 from .schema import ConversionMetadata, ExtractionResult, ExtractionServiceResponse
 from .utils import format_duration, format_file_size, get_file_extension
+from .validators import get_max_file_size
+
+# Tamanho dos blocos lidos do upload e gravados em disco
+UPLOAD_CHUNK_SIZE = 1024 * 1024
 
 
 class LeitorDocumentosService:
@@ -27,37 +35,49 @@ class LeitorDocumentosService:
     de arquivo (PDF, DOCX) usando extractors específicos.
     """
 
+    def __init__(self, cache: ExtractionCache | None = None):
+        """
+        Inicializa o serviço.
+
+        Args:
+            cache (ExtractionCache | None): Cache de extração (padrão: cache compartilhado)
+        """
+        self.cache = cache or extraction_cache
+
     def extract_to_markdown(
-        self, file_path: Path, tool: str | None = None
+        self, file_path: Path, tool: str | None = None, file_hash: str | None = None
     ) -> ExtractionServiceResponse:
         """Extrai conteúdo de um arquivo e converte para formato markdown."""
         return self._extract_content(
             file_path=file_path,
             tool=tool,
+            file_hash=file_hash,
             extraction_method="extract_to_markdown",
             content_format="markdown",
             operation_name="extração para markdown",
         )
 
     def extract_raw_data(
-        self, file_path: Path, tool: str | None = None
+        self, file_path: Path, tool: str | None = None, file_hash: str | None = None
     ) -> ExtractionServiceResponse:
         """Extrai dados brutos (texto) de um arquivo."""
         return self._extract_content(
             file_path=file_path,
             tool=tool,
+            file_hash=file_hash,
             extraction_method="extract_raw_data",
             content_format="raw",
             operation_name="extração de dados brutos",
         )
 
     def extract_image_data(
-        self, file_path: Path, tool: str | None = None
+        self, file_path: Path, tool: str | None = None, file_hash: str | None = None
     ) -> ExtractionServiceResponse:
         """Extrai texto de imagens contidas em um documento."""
         return self._extract_content(
             file_path=file_path,
             tool=tool,
+            file_hash=file_hash,
             extraction_method="extract_image_data",
             content_format="images",
             operation_name="extração de dados de imagens",
@@ -70,6 +90,7 @@ class LeitorDocumentosService:
         extraction_method: str,
         content_format: str,
         operation_name: str,
+        file_hash: str | None = None,
     ) -> ExtractionServiceResponse:
         """
         Método central para todas as operações de extração.
@@ -80,6 +101,7 @@ class LeitorDocumentosService:
             extraction_method: Nome do método a ser chamado no extractor
             content_format: Formato do conteúdo extraído
             operation_name: Nome da operação para logs
+            file_hash: SHA-256 do arquivo, se já conhecido (evita reler o arquivo)
         """
         logger.info("Iniciando {}: {}", operation_name, file_path.name)
         start_time = time.time()
@@ -89,35 +111,101 @@ class LeitorDocumentosService:
         extractor = self._get_extractor(file_extension, tool)
         logger.info("Usando extractor: {} para arquivo: {}", extractor.name, file_path)
 
-        # Executar extração usando o método especificado
-        extraction_func = getattr(extractor, extraction_method)
-        content = extraction_func(file_path)
+        # Consultar cache pelo conteúdo do arquivo
+        cache_key = self._get_cache_key(file_path, extractor, content_format, file_hash)
+        cached = self.cache.get(cache_key) if cache_key else None
+
+        if cached:
+            content_str = cached["content"]
+        else:
+            # Executar extração usando o método especificado
+            extraction_func = getattr(extractor, extraction_method)
+            content_str = str(extraction_func(file_path))
+
+            if cache_key:
+                self.cache.set(
+                    cache_key,
+                    {
+                        "content": content_str,
+                        "format": content_format,
+                        "extractor_used": extractor.name,
+                    },
+                )
 
         # Calcular métricas
         extraction_time = time.time() - start_time
+
+        response = self.build_response(
+            file_path=file_path,
+            content=content_str,
+            content_format=content_format,
+            extractor_name=extractor.name,
+            extraction_time=extraction_time,
+            cache_hit=bool(cached),
+        )
+
+        logger.info(
+            "{} concluída{}. Tempo: {}, Arquivo: {}, Tamanho: {} chars",
+            operation_name.capitalize(),
+            " (cache)" if cached else "",
+            response.metadata.extraction_time,
+            response.metadata.file_size,
+            len(content_str),
+        )
+
+        return response
+
+    def extract_pages_to_markdown(
+        self, file_path: Path, start_page: int, end_page: int
+    ) -> list[tuple[int, str]]:
+        """
+        Converte um intervalo de páginas de um PDF para markdown usando Docling.
+
+        Args:
+            file_path: Caminho do arquivo PDF
+            start_page: Primeira página do intervalo (a partir de 1)
+            end_page: Última página do intervalo (inclusiva)
+
+        Returns:
+            list[tuple[int, str]]: Número da página e markdown de cada página
+        """
+        extractor = self._get_extractor("pdf", "docling")
+        return extractor.extract_pages_to_markdown(file_path, start_page, end_page)
+
+    def build_response(
+        self,
+        file_path: Path,
+        content: str,
+        content_format: str,
+        extractor_name: str,
+        extraction_time: float,
+        cache_hit: bool = False,
+    ) -> ExtractionServiceResponse:
+        """
+        Monta a resposta de extração com os metadados da conversão.
+
+        Args:
+            file_path: Caminho do arquivo
+            content: Conteúdo extraído
+            content_format: Formato do conteúdo extraído
+            extractor_name: Nome do extractor utilizado
+            extraction_time: Tempo de extração em segundos
+            cache_hit: Se o conteúdo veio do cache de extração
+        """
         file_stats = file_path.stat()
-        content_str = str(content)
 
-        # Criar objetos de resposta
         extraction_result = ExtractionResult(
-            content=content_str,
+            content=content,
             format=content_format,
-            extractor_used=extractor.name,
+            extractor_used=extractor_name,
         )
 
         metadata = ConversionMetadata(
             file_size=format_file_size(file_stats.st_size),
             extraction_time=format_duration(extraction_time),
-            character_count=len(content_str),
-            extractor_used=extractor.name,
-        )
-
-        logger.info(
-            "{} concluída. Tempo: {}, Arquivo: {}, Tamanho: {} chars",
-            operation_name.capitalize(),
-            format_duration(extraction_time),
-            format_file_size(file_stats.st_size),
-            len(content_str),
+            character_count=len(content),
+            extractor_used=extractor_name,
+            cache_hit=cache_hit,
         )
 
         return ExtractionServiceResponse(
@@ -125,6 +213,37 @@ class LeitorDocumentosService:
             metadata=metadata,
         )
 
+    def _get_cache_key(
+        self,
+        file_path: Path,
+        extractor: DocumentExtractor,
+        content_format: str,
+        file_hash: str | None = None,
+    ) -> str | None:
+        """
+        Monta a chave de cache da extração.
+
+        Args:
+            file_path: Caminho do arquivo
+            extractor: Extractor que será utilizado
+            content_format: Formato do conteúdo extraído
+            file_hash: SHA-256 do arquivo (calculado a partir do arquivo se ausente)
+
+        Returns:
+            str | None: Chave de cache ou None se o cache não puder ser usado
+        """
+        if not self.cache.enabled:
+            return None
+
+        try:
+            file_hash = file_hash or compute_file_hash(file_path)
+            return self.cache.build_key(
+                file_hash, extractor.name, content_format, extractor.version
+            )
+        except Exception as e:
+            logger.warning("Cache de extração ignorado para {}: {}", file_path.name, str(e))
+            return None
+
     def _get_extractor(
         self,
         file_extension: str,
@@ -169,8 +288,8 @@ class LeitorDocumentosService:
 
         # Buscar extractors que suportam a extensão
         for extractor_class in DocumentExtractor.__subclasses__():
-            if file_extension in extractor_class().supported_extensions:
-                extractor = extractor_class()
+            extractor = DocumentExtractor.get_instance(extractor_class)
+            if file_extension in extractor.supported_extensions:
                 extractors_info.append(
                     {"name": extractor.name, "extensions": extractor.supported_extensions}
                 )
@@ -178,6 +297,14 @@ class LeitorDocumentosService:
         return {file_extension: extractors_info}
 
 
+class SavedUpload(NamedTuple):
+    """Arquivo de upload salvo em disco."""
+
+    path: Path
+    sha256: str
+    size: int
+
+
 class FileService:
     """
     Gerenciamento de arquivos temporários e uploads.
@@ -191,19 +318,33 @@ class FileService:
         self.temp_dir = Path("files/temp")
         self.temp_dir.mkdir(parents=True, exist_ok=True)
 
-    async def save_upload_file(self, file: UploadFile) -> Path:
+    async def save_upload_file(
+        self, file: UploadFile, max_size: int | None = None
+    ) -> SavedUpload:
         """
-        Salva arquivo temporariamente e retorna o caminho.
+        Salva arquivo temporariamente, em blocos, e retorna o caminho e o SHA-256.
+
+        O upload é lido e gravado em blocos de UPLOAD_CHUNK_SIZE, sem carregar o
+        arquivo inteiro em memória e com a escrita em disco fora do event loop.
+        O hash e o tamanho são calculados durante a gravação, que é interrompida
+        assim que o tamanho máximo é excedido.
 
         Args:
             file (UploadFile): Arquivo enviado via upload
+            max_size (int | None): Tamanho máximo em bytes
+                (padrão: LEITOR_DOCS_MAX_FILE_SIZE)
 
         Returns:
-            str: Caminho completo do arquivo salvo
+            SavedUpload: Caminho, SHA-256 e tamanho do arquivo salvo
 
         Raises:
+            FileSizeException: Se o arquivo exceder o tamanho máximo
             DocumentExtractionException: Se houver erro ao salvar o arquivo
         """
+        if max_size is None:
+            max_size = get_max_file_size()
+
+        file_path = None
         try:
             # Validar se o arquivo tem nome
             if not file.filename:
@@ -215,20 +356,39 @@ class FileService:
             unique_filename = f"{timestamp}_{uuid.uuid4()}{file_extension}"
             file_path = self.temp_dir / unique_filename
 
-            # Salvar arquivo no sistema
-            content = await file.read()
-            with open(file_path, "wb") as f:
-                f.write(content)
+            # Salvar arquivo no sistema em blocos
+            digest = hashlib.sha256()
+            size = 0
+            f = await asyncio.to_thread(open, file_path, "wb")
+            try:
+                while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > max_size:
+                        raise FileSizeException(
+                            f"Arquivo '{file.filename}' muito grande. "
+                            f"Tamanho máximo: {format_file_size(max_size)}"
+                        )
+                    digest.update(chunk)
+                    await asyncio.to_thread(f.write, chunk)
+            finally:
+                await asyncio.to_thread(f.close)
 
             logger.info(
                 "Arquivo salvo temporariamente: {} (Tamanho: {})",
                 file_path,
-                format_file_size(len(content)),
+                format_file_size(size),
             )
-            return file_path
+            return SavedUpload(path=file_path, sha256=digest.hexdigest(), size=size)
+
+        except FileSizeException as e:
+            logger.warning("Upload interrompido: {}", e.message)
+            self.cleanup_temp_file(file_path)
+            raise
 
         except Exception as e:
             logger.error("Erro ao salvar arquivo: {}", str(e))
+            if file_path is not None:
+                self.cleanup_temp_file(file_path)
             raise DocumentExtractionException(f"Erro ao salvar arquivo: {str(e)}")
 
     def cleanup_temp_file(self, file_path: Path) -> bool:
@@ -1,8 +1,9 @@
 import os
+from pathlib import Path
 
 from fastapi import UploadFile
 
-from .exceptions import FileSizeException, FileValidationException
+from .exceptions import FileNotFoundException, FileSizeException, FileValidationException
 from .utils import format_file_size, get_file_extension
 
 
@@ -32,6 +33,16 @@ def validate_document_file(
         )
 
 
+def get_max_file_size() -> int:
+    """
+    Retorna o tamanho máximo de arquivo permitido.
+
+    Returns:
+        int: Tamanho em bytes (LEITOR_DOCS_MAX_FILE_SIZE, padrão: 50MB)
+    """
+    return int(os.getenv("LEITOR_DOCS_MAX_FILE_SIZE", str(50 * 1024 * 1024)))
+
+
 def validate_file_size(file: UploadFile, max_size: int | None = None) -> None:
     """
     Valida o tamanho do arquivo enviado via upload.
@@ -40,6 +51,9 @@ def validate_file_size(file: UploadFile, max_size: int | None = None) -> None:
     Se max_size não for fornecido, usa o valor da variável de ambiente
     LEITOR_DOCS_MAX_FILE_SIZE (padrão: 50MB).
 
+    Só é efetiva quando o tamanho do upload é conhecido (`file.size`); o limite
+    também é aplicado durante a gravação em `FileService.save_upload_file`.
+
     Args:
         file (UploadFile): Arquivo enviado via upload
         max_size (int | None): Tamanho máximo em bytes (opcional)
@@ -48,9 +62,78 @@ def validate_file_size(file: UploadFile, max_size: int | None = None) -> None:
         FileSizeException: Se o arquivo exceder o tamanho máximo
     """
     if max_size is None:
-        max_size = int(os.getenv("LEITOR_DOCS_MAX_FILE_SIZE", str(50 * 1024 * 1024)))
+        max_size = get_max_file_size()
     if file.size and file.size > max_size:
         raise FileSizeException(
             f"Arquivo '{file.filename}' muito grande ({format_file_size(file.size)}). "
             f"Tamanho máximo: {format_file_size(max_size)}"
         )
+
+
+def get_shared_dir() -> Path | None:
+    """
+    Retorna o diretório compartilhado de onde arquivos podem ser lidos por caminho.
+
+    Returns:
+        Path | None: Diretório (LEITOR_DOCS_SHARED_DIR) ou None se a extração
+            por caminho estiver desabilitada
+    """
+    shared_dir = os.getenv("LEITOR_DOCS_SHARED_DIR")
+    return Path(shared_dir).resolve() if shared_dir else None
+
+
+def resolve_shared_file(
+    caminho: str,
+    supported_extensions: list[str] = ["pdf", "docx"],
+    max_size: int | None = None,
+) -> Path:
+    """
+    Resolve e valida um arquivo do diretório compartilhado.
+
+    O caminho é relativo ao diretório compartilhado e não pode apontar para
+    fora dele (ex: '../', caminhos absolutos ou links simbólicos).
+
+    Args:
+        caminho (str): Caminho do arquivo relativo ao diretório compartilhado
+        supported_extensions (list[str]): Lista de extensões permitidas
+        max_size (int | None): Tamanho máximo em bytes (padrão: LEITOR_DOCS_MAX_FILE_SIZE)
+
+    Returns:
+        Path: Caminho absoluto do arquivo
+
+    Raises:
+        FileValidationException: Se a extração por caminho estiver desabilitada,
+            o caminho sair do diretório compartilhado ou a extensão não for permitida
+        FileNotFoundException: Se o arquivo não existir
+        FileSizeException: Se o arquivo exceder o tamanho máximo
+    """
+    shared_dir = get_shared_dir()
+    if shared_dir is None:
+        raise FileValidationException(
+            "Extração por caminho desabilitada. Configure LEITOR_DOCS_SHARED_DIR."
+        )
+
+    file_path = (shared_dir / caminho).resolve()
+    if not file_path.is_relative_to(shared_dir):
+        raise FileValidationException(f"Caminho '{caminho}' fora do diretório compartilhado.")
+
+    if not file_path.is_file():
+        raise FileNotFoundException(f"Arquivo '{caminho}' não encontrado.")
+
+    file_extension = get_file_extension(file_path.name)
+    if file_extension not in supported_extensions:
+        raise FileValidationException(
+            f"Extensão '{file_extension}' não permitida para '{caminho}'. "
+            f"Permitidas: {supported_extensions}"
+        )
+
+    if max_size is None:
+        max_size = get_max_file_size()
+    file_size = file_path.stat().st_size
+    if file_size > max_size:
+        raise FileSizeException(
+            f"Arquivo '{caminho}' muito grande ({format_file_size(file_size)}). "
+            f"Tamanho máximo: {format_file_size(max_size)}"
+        )
+
+    return file_path
@@ -7,6 +7,12 @@ from fastapi.testclient import TestClient
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from main import app
+from modules.leitor_documentos.router import get_extraction_pool
+from modules.leitor_documentos.schema import (
+    ConversionMetadata,
+    ExtractionResult,
+    ExtractionServiceResponse,
+)
 
 # Cliente de teste do FastAPI
 client = TestClient(app)
@@ -32,6 +38,85 @@ class TestAPIValidation:
         response = client.post("/leitor-documentos/extrair-dados-imagens")
         assert response.status_code == 422
 
+    def test_extrair_markdown_stream_sem_arquivo(self):
+        """Testa endpoint de extração markdown em streaming sem enviar arquivo"""
+        response = client.post("/leitor-documentos/extrair-markdown-stream")
+        assert response.status_code == 422
+
+    def test_extrair_markdown_stream_docx(self):
+        """Testa que o streaming por páginas aceita apenas PDF"""
+        files = {"file": ("documento.docx", b"conteudo", "application/octet-stream")}
+        response = client.post("/leitor-documentos/extrair-markdown-stream", files=files)
+
+        assert response.status_code == 400
+        assert response.json()["error_code"] == "FILE_VALIDATION_ERROR"
+
+    def test_extrair_markdown_paginas_ferramenta_invalida(self):
+        """Testa que a divisão por páginas exige a ferramenta docling"""
+        files = {"file": ("documento.pdf", b"%PDF-1.4", "application/pdf")}
+        response = client.post(
+            "/leitor-documentos/extrair-markdown",
+            files=files,
+            params={"paginas_por_bloco": 5, "ferramenta_extracao": "pypdf"},
+        )
+
+        assert response.status_code == 400
+        assert response.json()["error_code"] == "FILE_VALIDATION_ERROR"
+
+    def test_extrair_por_caminho_desabilitado(self, monkeypatch):
+        """Testa que a extração por caminho exige o diretório compartilhado"""
+        monkeypatch.delenv("LEITOR_DOCS_SHARED_DIR", raising=False)
+        response = client.post(
+            "/leitor-documentos/extrair-por-caminho", json={"caminho": "documento.pdf"}
+        )
+
+        assert response.status_code == 400
+        assert response.json()["error_code"] == "FILE_VALIDATION_ERROR"
+
+    def test_extrair_por_caminho_fora_do_diretorio(self, monkeypatch, tmp_path):
+        """Testa que caminhos fora do diretório compartilhado são recusados"""
+        monkeypatch.setenv("LEITOR_DOCS_SHARED_DIR", str(tmp_path))
+        response = client.post(
+            "/leitor-documentos/extrair-por-caminho", json={"caminho": "../documento.pdf"}
+        )
+
+        assert response.status_code == 400
+        assert response.json()["error_code"] == "FILE_VALIDATION_ERROR"
+
+    def test_extrair_por_caminho_ignora_hash_do_cliente(self, monkeypatch, tmp_path):
+        """Testa que o SHA-256 da chave do cache não vem do cliente"""
+        chamadas = []
+
+        class PoolFalso:
+            async def run(self, func, **kwargs):
+                chamadas.append(kwargs)
+                return ExtractionServiceResponse(
+                    extraction_result=ExtractionResult(
+                        content="conteudo", format="markdown", extractor_used="falso"
+                    ),
+                    metadata=ConversionMetadata(
+                        file_size="1 B",
+                        extraction_time="0s",
+                        character_count=8,
+                        extractor_used="falso",
+                    ),
+                )
+
+        (tmp_path / "documento.pdf").write_bytes(b"%PDF-1.4")
+        monkeypatch.setenv("LEITOR_DOCS_SHARED_DIR", str(tmp_path))
+        app.dependency_overrides[get_extraction_pool] = PoolFalso
+        try:
+            response = client.post(
+                "/leitor-documentos/extrair-por-caminho",
+                json={"caminho": "documento.pdf", "sha256": "0" * 64},
+            )
+        finally:
+            app.dependency_overrides.pop(get_extraction_pool)
+
+        assert response.status_code == 200
+        assert len(chamadas) == 1
+        assert chamadas[0].get("file_hash") is None
+
     def test_extrair_arquivo_extensao_invalida(self):
         """Testa upload de arquivo com extensão não suportada"""
         files = {"file": ("documento.txt", b"conteudo texto", "text/plain")}
@@ -0,0 +1,148 @@
+import os
+import sys
+import time
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+# Adicionar o diretório raiz ao path para imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from modules.leitor_documentos.cache import ExtractionCache, compute_file_hash
+from modules.leitor_documentos.service import LeitorDocumentosService
+
+
+class TestExtractionCache:
+    """Testes unitários isolados do cache de extração"""
+
+    def test_compute_file_hash(self, tmp_path):
+        """Testa que o hash depende apenas do conteúdo do arquivo"""
+        file_a = tmp_path / "a.pdf"
+        file_b = tmp_path / "b.pdf"
+        file_a.write_bytes(b"conteudo")
+        file_b.write_bytes(b"conteudo")
+
+        assert compute_file_hash(file_a) == compute_file_hash(file_b)
+
+        file_b.write_bytes(b"outro conteudo")
+        assert compute_file_hash(file_a) != compute_file_hash(file_b)
+
+    def test_build_key_varia_com_configuracao(self):
+        """Testa que extractor, formato e versão compõem a chave"""
+        base = ExtractionCache.build_key("hash", "docling_pdf", "markdown", "1")
+
+        assert base == ExtractionCache.build_key("hash", "docling_pdf", "markdown", "1")
+        assert base != ExtractionCache.build_key("hash", "pypdf", "markdown", "1")
+        assert base != ExtractionCache.build_key("hash", "docling_pdf", "raw", "1")
+        assert base != ExtractionCache.build_key("hash", "docling_pdf", "markdown", "2")
+
+    def test_set_e_get(self, tmp_path):
+        """Testa gravação e leitura de uma entrada"""
+        cache = ExtractionCache(cache_dir=tmp_path, enabled=True)
+
+        cache.set("chave", {"content": "# Título"})
+
+        assert cache.get("chave") == {"content": "# Título"}
+        assert cache.get("inexistente") is None
+
+    def test_get_entrada_expirada(self, tmp_path):
+        """Testa que entradas expiradas são descartadas"""
+        cache = ExtractionCache(cache_dir=tmp_path, ttl_hours=1, enabled=True)
+        cache.set("chave", {"content": "texto"})
+
+        antigo = time.time() - 2 * 3600
+        os.utime(tmp_path / "chave.json", (antigo, antigo))
+
+        assert cache.get("chave") is None
+        assert not (tmp_path / "chave.json").exists()
+
+    def test_evict_remove_menos_usadas(self, tmp_path):
+        """Testa remoção das entradas menos usadas ao exceder o tamanho máximo"""
+        cache = ExtractionCache(cache_dir=tmp_path, max_size=10**6, enabled=True)
+        cache.set("antiga", {"content": "a" * 100})
+        cache.set("recente", {"content": "b" * 100})
+
+        agora = time.time()
+        os.utime(tmp_path / "antiga.json", (agora - 100, agora))
+        os.utime(tmp_path / "recente.json", (agora, agora))
+
+        cache.max_size = 150
+        removed = cache.evict()
+
+        assert removed == 1
+        assert not (tmp_path / "antiga.json").exists()
+        assert (tmp_path / "recente.json").exists()
+
+    def test_cache_desabilitado(self, tmp_path):
+        """Testa que o cache desabilitado não grava nem lê entradas"""
+        cache = ExtractionCache(cache_dir=tmp_path, enabled=False)
+        cache.set("chave", {"content": "texto"})
+
+        assert cache.get("chave") is None
+        assert list(tmp_path.glob("*.json")) == []
+
+    def test_clear(self, tmp_path):
+        """Testa remoção de todas as entradas"""
+        cache = ExtractionCache(cache_dir=tmp_path, enabled=True)
+        cache.set("a", {"content": "a"})
+        cache.set("b", {"content": "b"})
+
+        assert cache.clear() == 2
+        assert list(tmp_path.glob("*.json")) == []
+
+
+class TestServiceComCache:
+    """Testes unitários do uso do cache pelo serviço"""
+
+    @patch.object(LeitorDocumentosService, "_get_extractor")
+    def test_segunda_extracao_usa_cache(self, mock_get_extractor, tmp_path):
+        """Testa que a segunda extração do mesmo conteúdo não chama o extractor"""
+        file_path = tmp_path / "exemplo.pdf"
+        file_path.write_bytes(b"%PDF-1.4 conteudo")
+
+        mock_extractor = Mock()
+        mock_extractor.name = "docling_pdf"
+        mock_extractor.version = "1"
+        mock_extractor.extract_to_markdown.return_value = "# Título"
+        mock_get_extractor.return_value = mock_extractor
+
+        service = LeitorDocumentosService(
+            cache=ExtractionCache(cache_dir=tmp_path / "cache", enabled=True)
+        )
+
+        first = service.extract_to_markdown(file_path)
+        second = service.extract_to_markdown(file_path)
+
+        assert first.metadata.cache_hit is False
+        assert second.metadata.cache_hit is True
+        assert second.extraction_result.content == "# Título"
+        mock_extractor.extract_to_markdown.assert_called_once()
+
+        # Formato diferente não reaproveita a entrada
+        mock_extractor.extract_raw_data.return_value = "Título"
+        raw = service.extract_raw_data(file_path)
+
+        assert raw.metadata.cache_hit is False
+        mock_extractor.extract_raw_data.assert_called_once()
+
+    @patch("modules.leitor_documentos.service.compute_file_hash")
+    @patch.object(LeitorDocumentosService, "_get_extractor")
+    def test_hash_do_upload_evita_releitura(self, mock_get_extractor, mock_hash, tmp_path):
+        """Testa que o hash calculado no upload é usado na chave de cache"""
+        file_path = tmp_path / "exemplo.pdf"
+        file_path.write_bytes(b"%PDF-1.4 conteudo")
+
+        mock_extractor = Mock()
+        mock_extractor.name = "docling_pdf"
+        mock_extractor.version = "1"
+        mock_extractor.extract_to_markdown.return_value = "# Título"
+        mock_get_extractor.return_value = mock_extractor
+
+        service = LeitorDocumentosService(
+            cache=ExtractionCache(cache_dir=tmp_path / "cache", enabled=True)
+        )
+
+        service.extract_to_markdown(file_path, file_hash="hash-do-upload")
+        result = service.extract_to_markdown(file_path, file_hash="hash-do-upload")
+
+        assert result.metadata.cache_hit is True
+        mock_hash.assert_not_called()
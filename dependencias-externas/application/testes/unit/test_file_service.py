@@ -1,3 +1,4 @@
+import hashlib
 import sys
 from pathlib import Path
 from unittest.mock import AsyncMock, Mock, mock_open, patch
@@ -7,7 +8,8 @@ import pytest
 # Adicionar o diretório raiz ao path para imports
 sys.path.append(str(Path(__file__).parent.parent))
 
-from modules.leitor_documentos.exceptions import DocumentExtractionException
+from modules.leitor_documentos.exceptions import DocumentExtractionException, FileSizeException
+from modules.leitor_documentos.router import extrair_markdown_stream
 from modules.leitor_documentos.service import FileService
 
 
@@ -32,10 +34,10 @@ class TestFileService:
         mock_datetime.now.return_value.strftime.return_value = "20240101_120000"
         mock_uuid.return_value = "abc123"
 
-        # Mock do UploadFile com read assíncrono
+        # Mock do UploadFile com read assíncrono em blocos
         mock_upload_file = Mock()
         mock_upload_file.filename = "documento.pdf"
-        mock_upload_file.read = AsyncMock(return_value=b"conteudo do arquivo")
+        mock_upload_file.read = AsyncMock(side_effect=[b"conteudo do arquivo", b""])
 
         # Mock do Path para o arquivo retornado
         mock_file_path = Mock()
@@ -48,9 +50,44 @@ class TestFileService:
             result = await self.file_service.save_upload_file(mock_upload_file)
 
             # Verificações
-            assert result.name == "20240101_120000_abc123.pdf"
+            assert result.path.name == "20240101_120000_abc123.pdf"
+            assert result.size == len(b"conteudo do arquivo")
+            assert result.sha256 == hashlib.sha256(b"conteudo do arquivo").hexdigest()
             mock_file.assert_called_once()
-            mock_upload_file.read.assert_called_once()
+            mock_file().write.assert_called_once_with(b"conteudo do arquivo")
+            assert mock_upload_file.read.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_save_upload_file_grava_em_blocos(self, tmp_path):
+        """Testa gravação em blocos com hash igual ao do arquivo inteiro"""
+        blocos = [b"a" * 10, b"b" * 10, b"c" * 5]
+
+        mock_upload_file = Mock()
+        mock_upload_file.filename = "documento.pdf"
+        mock_upload_file.read = AsyncMock(side_effect=[*blocos, b""])
+
+        self.file_service.temp_dir = tmp_path
+        result = await self.file_service.save_upload_file(mock_upload_file)
+
+        assert result.path.read_bytes() == b"".join(blocos)
+        assert result.size == 25
+        assert result.sha256 == hashlib.sha256(b"".join(blocos)).hexdigest()
+
+    @pytest.mark.asyncio
+    async def test_save_upload_file_excede_tamanho(self, tmp_path):
+        """Testa interrupção do upload ao exceder o tamanho máximo"""
+        mock_upload_file = Mock()
+        mock_upload_file.filename = "documento.pdf"
+        mock_upload_file.read = AsyncMock(side_effect=[b"a" * 10, b"b" * 10, b"c" * 10, b""])
+
+        self.file_service.temp_dir = tmp_path
+
+        with pytest.raises(FileSizeException):
+            await self.file_service.save_upload_file(mock_upload_file, max_size=15)
+
+        # Leitura interrompida no bloco que excedeu o limite e arquivo parcial removido
+        assert mock_upload_file.read.call_count == 2
+        assert list(tmp_path.iterdir()) == []
 
     @pytest.mark.asyncio
     async def test_save_upload_file_no_filename(self):
@@ -124,7 +161,7 @@ class TestFileServiceErrorHandling:
 
         mock_upload_file = Mock()
         mock_upload_file.filename = "documento.pdf"
-        mock_upload_file.read = AsyncMock(return_value=b"conteudo")
+        mock_upload_file.read = AsyncMock(side_effect=[b"conteudo", b""])
 
         # Mock do Path para o arquivo retornado
         mock_file_path = Mock()
@@ -150,3 +187,28 @@ class TestFileServiceErrorHandling:
 
         # Deve retornar False quando há erro, mas não lançar exceção
         assert result is False
+
+    @pytest.mark.asyncio
+    async def test_stream_remove_upload_sem_iterar_resposta(self, tmp_path):
+        """Testa que o upload do streaming é removido mesmo sem a resposta ser lida"""
+        mock_upload_file = Mock()
+        mock_upload_file.filename = "documento.pdf"
+        mock_upload_file.size = 8
+        mock_upload_file.read = AsyncMock(side_effect=[b"%PDF-1.4", b""])
+
+        mock_pool = Mock()
+        mock_pool.plan_page_ranges = AsyncMock(return_value=[(1, 1)])
+
+        self.file_service.temp_dir = tmp_path
+        response = await extrair_markdown_stream(
+            file=mock_upload_file,
+            paginas_por_bloco=1,
+            pool=mock_pool,
+            file_service=self.file_service,
+        )
+        assert len(list(tmp_path.iterdir())) == 1
+
+        # Cliente desconectado antes do início do corpo: só a background task executa
+        await response.background()
+
+        assert list(tmp_path.iterdir()) == []
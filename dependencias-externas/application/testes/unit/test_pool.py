@@ -0,0 +1,145 @@
+import os
+import sys
+import time
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+# Adicionar o diretório raiz ao path para imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from modules.leitor_documentos.exceptions import (
+    DocumentExtractionException,
+    ExtractionQueueFullException,
+    ExtractionTimeoutException,
+)
+from modules.leitor_documentos.pool import ExtractionPool
+
+
+class TestExtractionPool:
+    """Testes unitários do pool de processos de extração"""
+
+    def test_stats_pool_ocioso(self):
+        """Testa estatísticas de um pool sem extrações"""
+        pool = ExtractionPool(max_workers=2, max_queue=4, timeout=10)
+
+        assert pool.stats() == {
+            "workers": 2,
+            "em_execucao": 0,
+            "em_fila": 0,
+            "capacidade_fila": 4,
+            "utilizacao": 0.0,
+        }
+
+    def test_stats_com_fila(self):
+        """Testa separação entre extrações em execução e em fila"""
+        pool = ExtractionPool(max_workers=2, max_queue=4, timeout=10)
+        pool._pending = 3
+
+        stats = pool.stats()
+
+        assert stats["em_execucao"] == 2
+        assert stats["em_fila"] == 1
+        assert stats["utilizacao"] == 1.0
+
+    @pytest.mark.asyncio
+    async def test_run_pool_saturado(self):
+        """Testa recusa de extrações quando workers e fila estão ocupados"""
+        pool = ExtractionPool(max_workers=1, max_queue=1, timeout=10)
+        pool._pending = 2
+
+        with pytest.raises(ExtractionQueueFullException):
+            await pool.run("extract_to_markdown", Path("exemplo.pdf"))
+
+        assert pool._executor is None
+
+    @pytest.mark.asyncio
+    async def test_run_timeout_mantem_pool(self):
+        """Testa que o timeout interrompe a extração sem recriar o pool"""
+        pool = ExtractionPool(max_workers=1, max_queue=1, timeout=0.01)
+
+        try:
+            with pytest.raises(ExtractionTimeoutException):
+                await pool.run("extract_to_markdown", Path("exemplo.pdf"))
+
+            assert pool._executor is not None
+            assert pool._pending == 0
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_timeout_interrompe_tarefa_no_worker(self):
+        """Testa que a tarefa é interrompida no próprio worker, que continua ativo"""
+        pool = ExtractionPool(max_workers=1, max_queue=1, timeout=60)
+
+        try:
+            pid = await pool._submit(os.getpid, Path("exemplo.pdf"))
+
+            pool.timeout = 1
+            inicio = time.monotonic()
+            with pytest.raises(ExtractionTimeoutException):
+                await pool._submit(time.sleep, Path("exemplo.pdf"), 30)
+            assert time.monotonic() - inicio < 10
+
+            pool.timeout = 60
+            assert await pool._submit(os.getpid, Path("exemplo.pdf")) == pid
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_timeout_finaliza_worker_sem_resposta(self):
+        """Testa que apenas o worker que não responde ao prazo é finalizado"""
+        pool = ExtractionPool(max_workers=1, max_queue=1, timeout=60)
+        pool.kill_grace = 0.5
+
+        try:
+            pid = await pool._submit(os.getpid, Path("exemplo.pdf"))
+
+            # sum sobre range roda em código nativo, sem atender ao SIGALRM
+            pool.timeout = 1
+            with pytest.raises(ExtractionTimeoutException):
+                await pool._submit(sum, Path("exemplo.pdf"), range(10**12))
+
+            assert pool._executor is None
+            assert pool._pending == 0
+
+            pool.timeout = 60
+            assert await pool._submit(os.getpid, Path("exemplo.pdf")) != pid
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_tarefa_afetada_por_timeout_de_outra_e_reenviada(self):
+        """Testa o reenvio de tarefas interrompidas pela finalização de outro worker"""
+        pool = ExtractionPool(max_workers=2, max_queue=1, timeout=10)
+        executores = [Mock(), Mock()]
+
+        async def execute(executor, func, file_path, *args):
+            if executor is executores[0]:
+                # Pool descartado por timeout de outra extração
+                pool._aborted.add(executor)
+                raise BrokenProcessPool()
+            return "markdown"
+
+        with patch.object(pool, "_get_executor", side_effect=executores), patch.object(
+            pool, "_execute", side_effect=execute
+        ) as mock_execute:
+            assert await pool._submit(os.getpid, Path("exemplo.pdf")) == "markdown"
+
+        assert mock_execute.await_count == 2
+        assert pool._pending == 0
+
+    @pytest.mark.asyncio
+    async def test_worker_finalizado_sem_timeout_nao_e_reenviado(self):
+        """Testa que a queda de um worker fora de um timeout não é reenviada"""
+        pool = ExtractionPool(max_workers=2, max_queue=1, timeout=10)
+
+        with patch.object(pool, "_get_executor", return_value=Mock()), patch.object(
+            pool, "_execute", side_effect=BrokenProcessPool()
+        ) as mock_execute:
+            with pytest.raises(DocumentExtractionException):
+                await pool._submit(os.getpid, Path("exemplo.pdf"))
+
+        assert mock_execute.await_count == 1
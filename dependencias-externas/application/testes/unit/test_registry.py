@@ -36,3 +36,14 @@ class TestDocumentExtractorRegistry:
         docx_docx2txt = DOCXDocx2TxtExtractor()
         assert docx_docx2txt.name == "docx2txt"
         assert "docx" in docx_docx2txt.supported_extensions
+
+    def test_get_extractor_retorna_instancia_unica(self):
+        """Testa que o registry reutiliza a mesma instância do extractor no processo"""
+        from modules.leitor_documentos.base import DocumentExtractor
+
+        first = DocumentExtractor.get_extractor("pdf", "pypdf")
+        second = DocumentExtractor.get_extractor("pdf", "pypdf")
+
+        assert isinstance(first, PDFPypdfExtractor)
+        assert first is second
+        assert DocumentExtractor.get_instance(PDFPypdfExtractor) is first
@@ -8,7 +8,9 @@ from modules.leitor_documentos.utils import (
     format_duration,
     format_file_size,
     get_file_extension,
+    get_pdf_page_count,
     sanitize_filename,
+    split_page_ranges,
 )
 
 
@@ -104,3 +106,16 @@ class TestUtilsEdgeCases:
         assert (
             sanitize_filename("arquivo@#$%^&*()nome.pdf") == "arquivo@#$%^&*()nome.pdf"
         )
+
+    def test_split_page_ranges(self):
+        """Testa divisão de páginas em intervalos consecutivos"""
+        assert split_page_ranges(23, 10) == [(1, 10), (11, 20), (21, 23)]
+        assert split_page_ranges(3, 1) == [(1, 1), (2, 2), (3, 3)]
+        assert split_page_ranges(5, 10) == [(1, 5)]
+        assert split_page_ranges(0, 10) == []
+
+    def test_get_pdf_page_count(self):
+        """Testa contagem de páginas do PDF de exemplo"""
+        sample_pdf = Path(__file__).parent.parent / "sample_files" / "exemplo.pdf"
+
+        assert get_pdf_page_count(sample_pdf) >= 1
@@ -10,10 +10,12 @@ sys.path.append(str(Path(__file__).parent.parent))
 from fastapi import UploadFile
 
 from modules.leitor_documentos.exceptions import (
+    FileNotFoundException,
     FileSizeException,
     FileValidationException,
 )
 from modules.leitor_documentos.validators import (
+    resolve_shared_file,
     validate_document_file,
     validate_file_size,
 )
@@ -120,3 +122,53 @@ class TestValidators:
 
             with pytest.raises(FileSizeException):
                 validate_file_size(mock_upload_file)
+
+
+class TestResolveSharedFile:
+    """Testes unitários da resolução de arquivos do diretório compartilhado"""
+
+    def test_resolve_arquivo_valido(self, tmp_path):
+        """Testa resolução de arquivo dentro do diretório compartilhado"""
+        (tmp_path / "fidcs").mkdir()
+        (tmp_path / "fidcs" / "relatorio.pdf").write_bytes(b"%PDF-1.4")
+
+        with patch.dict("os.environ", {"LEITOR_DOCS_SHARED_DIR": str(tmp_path)}):
+            file_path = resolve_shared_file("fidcs/relatorio.pdf")
+
+        assert file_path == (tmp_path / "fidcs" / "relatorio.pdf").resolve()
+
+    def test_resolve_desabilitado(self, monkeypatch):
+        """Testa erro quando o diretório compartilhado não está configurado"""
+        monkeypatch.delenv("LEITOR_DOCS_SHARED_DIR", raising=False)
+
+        with pytest.raises(FileValidationException) as exc_info:
+            resolve_shared_file("relatorio.pdf")
+
+        assert "desabilitada" in str(exc_info.value)
+
+    @pytest.mark.parametrize("caminho", ["../fora.pdf", "/etc/passwd.pdf"])
+    def test_resolve_fora_do_diretorio(self, tmp_path, caminho):
+        """Testa que caminhos fora do diretório compartilhado são recusados"""
+        shared_dir = tmp_path / "compartilhado"
+        shared_dir.mkdir()
+        (tmp_path / "fora.pdf").write_bytes(b"%PDF-1.4")
+
+        with patch.dict("os.environ", {"LEITOR_DOCS_SHARED_DIR": str(shared_dir)}):
+            with pytest.raises(FileValidationException) as exc_info:
+                resolve_shared_file(caminho)
+
+        assert "fora do diretório compartilhado" in str(exc_info.value)
+
+    def test_resolve_arquivo_inexistente(self, tmp_path):
+        """Testa erro quando o arquivo não existe"""
+        with patch.dict("os.environ", {"LEITOR_DOCS_SHARED_DIR": str(tmp_path)}):
+            with pytest.raises(FileNotFoundException):
+                resolve_shared_file("inexistente.pdf")
+
+    def test_resolve_arquivo_muito_grande(self, tmp_path):
+        """Testa erro quando o arquivo excede o tamanho máximo"""
+        (tmp_path / "grande.pdf").write_bytes(b"0" * 2048)
+
+        with patch.dict("os.environ", {"LEITOR_DOCS_SHARED_DIR": str(tmp_path)}):
+            with pytest.raises(FileSizeException):
+                resolve_shared_file("grande.pdf", max_size=1024)
@@ -0,0 +1,233 @@
+"""
+Resolução em memória de nomes de indicadores FIDC.
+
+Os processadores resolvem centenas de nomes de indicadores por relatório. Em vez
+de consultar o banco para cada nome, a tabela de indicadores é carregada uma vez
+por processamento e os nomes são resolvidos em memória:
+
+1. Busca exata, sem diferenciar maiúsculas (equivalente ao ILIKE sem curingas).
+2. Busca normalizada, ignorando acentos, maiúsculas e espaços repetidos.
+3. Busca por trecho, com os candidatos filtrados por um índice de trigramas: o
+   nome procurado está contido no nome do indicador, ou o nome do indicador
+   aparece como palavras inteiras no nome procurado (apenas indicadores com
+   pelo menos `TAMANHO_MINIMO_TRECHO` caracteres, para que siglas como "PL" não
+   casem com "plano" ou "aplicação").
+4. Busca por similaridade de trigramas (coeficiente de Jaccard), para pequenas
+   variações de grafia.
+
+Quando mais de um indicador casa na busca por trecho, ou empata na maior
+similaridade, o nome é considerado ambíguo e não é resolvido: é preferível não
+gravar o valor a gravá-lo no indicador errado.
+
+As resoluções são memorizadas, de forma que o mesmo nome repetido em vários
+arquivos do mesmo lote é resolvido uma única vez.
+
+Exemplo:
+    resolvedor = ResolvedorIndicadores(await repository.lista_indicadores())
+    indicador_id = resolvedor.resolver("Índice de Subordinação")
+"""
+
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Iterable
+
+ESPACOS_REGEX = re.compile(r"\s+")
+PALAVRA_REGEX = re.compile(r"\w+")
+
+TAMANHO_NGRAMA = 3
+
+# Tamanho mínimo do indicador (normalizado) para casar dentro do nome procurado
+TAMANHO_MINIMO_TRECHO = 4
+
+
+def normalizar_nome(nome: str) -> str:
+    """
+    Normaliza um nome para comparação: sem acentos, minúsculo e com espaços simples.
+
+    Args:
+        nome: Nome a ser normalizado
+
+    Returns:
+        str: Nome normalizado
+    """
+    sem_acentos = "".join(
+        caractere
+        for caractere in unicodedata.normalize("NFKD", nome)
+        if not unicodedata.combining(caractere)
+    )
+    return ESPACOS_REGEX.sub(" ", sem_acentos.casefold()).strip()
+
+
+def palavras(texto: str) -> str:
+    """
+    Reduz um texto às suas palavras, separadas por um espaço.
+
+    Args:
+        texto: Texto, normalizado ou em minúsculas
+
+    Returns:
+        str: Palavras do texto, sem pontuação
+    """
+    return " ".join(PALAVRA_REGEX.findall(texto))
+
+
+def gerar_ngramas(texto: str) -> set[str]:
+    """
+    Gera os trigramas de um texto normalizado.
+
+    Args:
+        texto: Texto normalizado
+
+    Returns:
+        set[str]: Trigramas distintos (vazio para textos com menos de 3 caracteres)
+    """
+    return {
+        texto[i : i + TAMANHO_NGRAMA] for i in range(len(texto) - TAMANHO_NGRAMA + 1)
+    }
+
+
+class ResolvedorIndicadores:
+    """Resolve nomes de indicadores FIDC para IDs usando índices em memória."""
+
+    def __init__(
+        self,
+        indicadores: Iterable[tuple[int, str]],
+        similaridade_minima: float = 0.7,
+    ):
+        """
+        Constrói os índices a partir dos indicadores cadastrados.
+
+        Args:
+            indicadores: Pares (indicador_fidc_id, indicador_fidc_nm)
+            similaridade_minima: Similaridade de trigramas mínima (0-1) para a
+                busca por similaridade
+        """
+        self.similaridade_minima = similaridade_minima
+
+        self._nomes: dict[int, str] = {}
+        self._normalizados: dict[int, str] = {}
+        self._palavras: dict[int, str] = {}
+        self._por_nome: dict[str, int] = {}
+        self._por_nome_normalizado: dict[str, int] = {}
+        self._ngramas: dict[int, set[str]] = {}
+        self._indice_ngramas: dict[str, set[int]] = defaultdict(set)
+        self._memo: dict[str, int | None] = {}
+
+        # Ordenados por ID para que, em nomes repetidos, prevaleça o primeiro
+        for indicador_id, nome in sorted(indicadores):
+            normalizado = normalizar_nome(nome)
+            self._nomes[indicador_id] = nome
+            self._normalizados[indicador_id] = normalizado
+            self._palavras[indicador_id] = palavras(normalizado)
+            self._por_nome.setdefault(nome.lower(), indicador_id)
+            self._por_nome_normalizado.setdefault(normalizado, indicador_id)
+
+            ngramas = gerar_ngramas(normalizado)
+            self._ngramas[indicador_id] = ngramas
+            for ngrama in ngramas:
+                self._indice_ngramas[ngrama].add(indicador_id)
+
+    def __len__(self) -> int:
+        return len(self._nomes)
+
+    def get_nome(self, indicador_id: int) -> str | None:
+        """Retorna o nome cadastrado de um indicador."""
+        return self._nomes.get(indicador_id)
+
+    def resolver(self, nome: str) -> int | None:
+        """
+        Resolve o nome de um indicador para o seu ID.
+
+        Args:
+            nome: Nome do indicador, como extraído do relatório
+
+        Returns:
+            int | None: ID do indicador ou None se não encontrado
+        """
+        if not nome or nome.strip() == "":
+            return None
+
+        if nome not in self._memo:
+            self._memo[nome] = self._resolver(nome)
+        return self._memo[nome]
+
+    def _resolver(self, nome: str) -> int | None:
+        indicador_id = self._por_nome.get(nome.lower())
+        if indicador_id is not None:
+            return indicador_id
+
+        normalizado = normalizar_nome(nome)
+        indicador_id = self._por_nome_normalizado.get(normalizado)
+        if indicador_id is not None:
+            return indicador_id
+
+        # Buscas por trecho muito curto seriam amplas demais
+        if len(normalizado) < 2:
+            return None
+
+        ngramas = gerar_ngramas(normalizado)
+        ngramas_em_comum = Counter(
+            indicador_id
+            for ngrama in ngramas
+            for indicador_id in self._indice_ngramas.get(ngrama, ())
+        )
+
+        encontrados = self._buscar_por_trecho(normalizado, ngramas, ngramas_em_comum)
+        if encontrados:
+            # Mais de um indicador casando é ambíguo: melhor não resolver
+            return encontrados[0] if len(encontrados) == 1 else None
+
+        return self._buscar_por_similaridade(ngramas, ngramas_em_comum)
+
+    def _buscar_por_trecho(
+        self, normalizado: str, ngramas: set[str], ngramas_em_comum: Counter
+    ) -> list[int]:
+        """
+        Busca os indicadores que contêm o nome procurado, ou cujas palavras
+        aparecem inteiras no nome procurado.
+
+        Um texto só pode conter o outro se tiver todos os trigramas dele, então o
+        índice de trigramas reduz os candidatos antes da verificação do trecho.
+        """
+        if ngramas:
+            candidatos = [
+                indicador_id
+                for indicador_id, em_comum in ngramas_em_comum.items()
+                if em_comum in (len(ngramas), len(self._ngramas[indicador_id]))
+            ]
+        else:
+            # Nome procurado sem trigramas: pode estar contido em qualquer indicador
+            candidatos = list(self._nomes)
+
+        palavras_nome = f" {palavras(normalizado)} "
+        return sorted(
+            indicador_id
+            for indicador_id in candidatos
+            if normalizado in self._normalizados[indicador_id]
+            or (
+                len(self._normalizados[indicador_id]) >= TAMANHO_MINIMO_TRECHO
+                and f" {self._palavras[indicador_id]} " in palavras_nome
+            )
+        )
+
+    def _buscar_por_similaridade(
+        self, ngramas: set[str], ngramas_em_comum: Counter
+    ) -> int | None:
+        """Busca o indicador mais similar, se acima do mínimo e sem empate."""
+        similaridades = {
+            indicador_id: em_comum
+            / (len(ngramas) + len(self._ngramas[indicador_id]) - em_comum)
+            for indicador_id, em_comum in ngramas_em_comum.items()
+        }
+        aceitos = sorted(
+            (
+                (similaridade, indicador_id)
+                for indicador_id, similaridade in similaridades.items()
+                if similaridade >= self.similaridade_minima
+            ),
+            reverse=True,
+        )
+        if not aceitos or (len(aceitos) > 1 and aceitos[0][0] == aceitos[1][0]):
+            return None
+        return aceitos[0][1]
@@ -218,11 +218,11 @@ class BaseFIDCProcessor(ABC):
         Returns:
             int | None: ID do indicador encontrado ou None
         """
-        indicador = await self.repository.get_or_find_indicador(nome)
+        indicador_id = await self.repository.get_indicador_id(nome)
 
-        if indicador:
-            print(f"✅ Indicador encontrado: '{nome}' (ID: {indicador.indicador_fidc_id})")
-            return indicador.indicador_fidc_id
+        if indicador_id is not None:
+            print(f"✅ Indicador encontrado: '{nome}' (ID: {indicador_id})")
+            return indicador_id
         else:
             print(f"❌ Indicador não encontrado: '{nome}'")
             return None
@@ -8,25 +8,49 @@ from datetime import datetime
 
 from modules.ativos.model import Ativo
 from modules.pydanticai.entity import ClientIa, ClientModel, ModelSchema, Prompt
-from sqlalchemy import and_, func, or_, select
+from sqlalchemy import and_, func, literal, or_, select
 from sqlalchemy.dialects.postgresql import aggregate_order_by, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .entity import FIDCDadosCadastrais, IndicadorFIDC, IndicadorFIDCValor
+from .indicadores import (
+    TAMANHO_MINIMO_TRECHO,
+    ResolvedorIndicadores,
+    palavras,
+)
 from .schema import DadosCadastraisResponseSchema, PromptInfoSchema
 
 
 class FidcsRepository:
-    """Repository para operações do módulo FIDCS."""
+    """
+    Repository para operações do módulo FIDCS.
 
-    def __init__(self, session: AsyncSession):
+    Os valores de indicadores e dados cadastrais são acumulados em memória e
+    gravados em upserts de múltiplas linhas por tabela, ao atingir o tamanho do
+    lote ou no commit.
+    """
+
+    TAMANHO_LOTE_UPSERT = 1000
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        resolvedor_indicadores: ResolvedorIndicadores | None = None,
+    ):
         """
         Inicializa repository com sessão do banco.
 
         Args:
             session: Sessão assíncrona do SQLAlchemy
+            resolvedor_indicadores: Resolvedor em memória compartilhado pelo lote
+                (opcional; sem ele os indicadores são buscados no banco)
         """
         self.session = session
+        self.resolvedor_indicadores = resolvedor_indicadores
+
+        # Linhas pendentes de upsert, indexadas pela chave de conflito de cada tabela
+        self._valores_pendentes: dict[tuple, dict] = {}
+        self._dados_cadastrais_pendentes: dict[tuple, dict] = {}
 
     async def get_prompts_by_fidc_info(self, fidc_nome: str) -> list[PromptInfoSchema]:
         """
@@ -119,6 +143,46 @@ class FidcsRepository:
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
 
+    async def lista_indicadores(self) -> list[tuple[int, str]]:
+        """
+        Lista ID e nome de todos os indicadores.
+
+        Returns:
+            list[tuple[int, str]]: Pares (indicador_fidc_id, indicador_fidc_nm)
+        """
+        query = select(IndicadorFIDC.indicador_fidc_id, IndicadorFIDC.indicador_fidc_nm)
+
+        result = await self.session.execute(query)
+        return [tuple(row) for row in result.all()]
+
+    async def carregar_resolvedor_indicadores(self) -> ResolvedorIndicadores:
+        """
+        Carrega todos os indicadores em um resolvedor em memória.
+
+        Returns:
+            ResolvedorIndicadores: Resolvedor, também usado por este repository
+        """
+        self.resolvedor_indicadores = ResolvedorIndicadores(await self.lista_indicadores())
+        return self.resolvedor_indicadores
+
+    async def get_indicador_id(self, nome: str) -> int | None:
+        """
+        Resolve o nome de um indicador para o seu ID.
+
+        Usa o resolvedor em memória quando disponível; caso contrário busca no banco.
+
+        Args:
+            nome: Nome do indicador
+
+        Returns:
+            int | None: ID do indicador ou None se não encontrado
+        """
+        if self.resolvedor_indicadores is not None:
+            return self.resolvedor_indicadores.resolver(nome)
+
+        indicador = await self.get_or_find_indicador(nome)
+        return indicador.indicador_fidc_id if indicador else None
+
     async def get_or_find_indicador(
         self, nome: str, categoria: str = "FIDC"
     ) -> IndicadorFIDC | None:
@@ -145,21 +209,32 @@ class FidcsRepository:
         if indicador:
             return indicador
 
-        # Busca por ILIKE (bilateral) - apenas se nome não for muito curto
+        # Busca por trecho - apenas se nome não for muito curto
         if len(nome.strip()) >= 2:  # Evita buscas muito amplas
+            # O indicador só casa dentro do nome como palavras inteiras e se não
+            # for uma sigla curta, como na busca em memória
+            palavras_nome = f" {palavras(nome.lower())} "
             query = (
                 select(IndicadorFIDC)
                 .where(
                     or_(
                         IndicadorFIDC.indicador_fidc_nm.ilike(f"%{nome}%"),
-                        func.lower(nome).like(f"%{func.lower(IndicadorFIDC.indicador_fidc_nm)}%"),
+                        and_(
+                            func.length(IndicadorFIDC.indicador_fidc_nm)
+                            >= TAMANHO_MINIMO_TRECHO,
+                            literal(palavras_nome).contains(
+                                " " + func.lower(IndicadorFIDC.indicador_fidc_nm) + " "
+                            ),
+                        ),
                     )
                 )
-                .order_by(func.length(IndicadorFIDC.indicador_fidc_nm))
+                .limit(2)
             )
 
             result = await self.session.execute(query)
-            indicador = result.scalar_one_or_none()
+            encontrados = result.scalars().all()
+            # Mais de um indicador casando é ambíguo: melhor não resolver
+            indicador = encontrados[0] if len(encontrados) == 1 else None
 
         return indicador
 
@@ -177,6 +252,8 @@ class FidcsRepository:
         """
         Insere ou atualiza valor de indicador.
 
+        A linha fica pendente até o próximo flush (lote cheio ou commit).
+
         Args:
             ativo_codigo: Código do ativo
             indicador_id: ID do indicador
@@ -207,20 +284,13 @@ class FidcsRepository:
             "data_captura": datetime.now(),
         }
 
-        # Insert com ON CONFLICT usando PostgreSQL dialect
-        stmt = insert(IndicadorFIDCValor).values(dados)
-        stmt = stmt.on_conflict_do_update(
-            index_elements=["ativo_codigo", "indicador_fidc_id", "mes", "ano"],
-            set_={
-                "valor": stmt.excluded.valor,
-                "limite": stmt.excluded.limite,
-                "limite_superior": stmt.excluded.limite_superior,
-                "extra_data": stmt.excluded.extra_data,
-                "data_captura": stmt.excluded.data_captura,
-            },
-        )
+        # Na mesma chave de conflito prevalece o último valor, como em upserts sucessivos
+        chave = (ativo_codigo, indicador_id, str(mes), str(ano))
+        self._valores_pendentes.pop(chave, None)
+        self._valores_pendentes[chave] = dados
 
-        await self.session.execute(stmt)
+        if len(self._valores_pendentes) >= self.TAMANHO_LOTE_UPSERT:
+            await self._flush_indicadores_valores()
 
     async def insert_dados_cadastrais(
         self, ativo_codigo: str, indicador_id: int, valor: str
@@ -228,6 +298,8 @@ class FidcsRepository:
         """
         Insere ou atualiza dados cadastrais.
 
+        A linha fica pendente até o próximo flush (lote cheio ou commit).
+
         Args:
             ativo_codigo: Código do ativo
             indicador_id: ID do indicador
@@ -236,14 +308,63 @@ class FidcsRepository:
 
         dados = {"ativo_codigo": ativo_codigo, "indicador_fidc_id": indicador_id, "valor": valor}
 
-        # Insert com ON CONFLICT
-        stmt = insert(FIDCDadosCadastrais).values(dados)
-        stmt = stmt.on_conflict_do_update(
-            index_elements=["ativo_codigo", "indicador_fidc_id"],
-            set_={"valor": stmt.excluded.valor},
-        )
+        chave = (ativo_codigo, indicador_id)
+        self._dados_cadastrais_pendentes.pop(chave, None)
+        self._dados_cadastrais_pendentes[chave] = dados
+
+        if len(self._dados_cadastrais_pendentes) >= self.TAMANHO_LOTE_UPSERT:
+            await self._flush_dados_cadastrais()
+
+    async def flush(self) -> int:
+        """
+        Grava no banco os valores e dados cadastrais pendentes.
+
+        Returns:
+            int: Número de linhas gravadas
+        """
+        return await self._flush_indicadores_valores() + await self._flush_dados_cadastrais()
+
+    async def _flush_indicadores_valores(self) -> int:
+        """Grava os valores de indicadores pendentes em um upsert por lote."""
+        linhas = list(self._valores_pendentes.values())
+        self._valores_pendentes.clear()
+
+        for inicio in range(0, len(linhas), self.TAMANHO_LOTE_UPSERT):
+            stmt = insert(IndicadorFIDCValor).values(
+                linhas[inicio : inicio + self.TAMANHO_LOTE_UPSERT]
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["ativo_codigo", "indicador_fidc_id", "mes", "ano"],
+                set_={
+                    "valor": stmt.excluded.valor,
+                    "limite": stmt.excluded.limite,
+                    "limite_superior": stmt.excluded.limite_superior,
+                    "extra_data": stmt.excluded.extra_data,
+                    "data_captura": stmt.excluded.data_captura,
+                },
+            )
+
+            await self.session.execute(stmt)
+
+        return len(linhas)
+
+    async def _flush_dados_cadastrais(self) -> int:
+        """Grava os dados cadastrais pendentes em um upsert por lote."""
+        linhas = list(self._dados_cadastrais_pendentes.values())
+        self._dados_cadastrais_pendentes.clear()
+
+        for inicio in range(0, len(linhas), self.TAMANHO_LOTE_UPSERT):
+            stmt = insert(FIDCDadosCadastrais).values(
+                linhas[inicio : inicio + self.TAMANHO_LOTE_UPSERT]
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["ativo_codigo", "indicador_fidc_id"],
+                set_={"valor": stmt.excluded.valor},
+            )
+
+            await self.session.execute(stmt)
 
-        await self.session.execute(stmt)
+        return len(linhas)
 
     async def get_dados_consolidados(self) -> list[dict]:
         """
@@ -338,9 +459,12 @@ class FidcsRepository:
         return dados
 
     async def commit(self) -> None:
-        """Efetua commit das transações pendentes."""
+        """Grava as linhas pendentes e efetua commit das transações pendentes."""
+        await self.flush()
         await self.session.commit()
 
     async def rollback(self) -> None:
-        """Efetua rollback das transações pendentes."""
+        """Descarta as linhas pendentes e efetua rollback das transações pendentes."""
+        self._valores_pendentes.clear()
+        self._dados_cadastrais_pendentes.clear()
         await self.session.rollback()
@@ -101,7 +101,10 @@ async def processar_arquivos(
                 "system_prompt": "Seja preciso...",
                 "user_prompt": "Extraia os dados..."
             }
-        ]
+        ],
+        "concorrente": true,
+        "limite_concorrencia": 4,
+        "limite_por_provedor": 2
     }
     ```
 
@@ -121,6 +124,18 @@ async def processar_arquivos(
     - **Sucesso**: Commit automático
     - **Falha**: Rollback automático
 
+    ## Modo Concorrente
+    - `concorrente`: processa os arquivos em paralelo (padrão: sequencial)
+    - `limite_concorrencia`: máximo de arquivos simultâneos no total
+    - `limite_por_provedor`: máximo de arquivos simultâneos por provedor do modelo principal
+    - Cada arquivo em processamento usa sua própria sessão de banco
+    - Os `detalhes` mantêm a ordem dos `itens` enviados
+
+    ## Relatórios Extensos
+    - `tokens_por_bloco`: divide relatórios maiores que o orçamento em blocos extraídos
+      concorrentemente, cujos resultados parciais são mesclados no schema do FIDC
+    - Permite usar modelos de contexto menor (e mais baratos) da lista de fallback
+
     ## Observações
     - Os dados do prompt são obtidos do endpoint `/arquivos-prompts`
     - Não é necessário consultar o banco novamente para obter dados do prompt
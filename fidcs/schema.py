@@ -37,6 +37,23 @@ class ProcessarRequestSchema(BaseModel):
     itens: list[ArquivoPromptInfoSchema] = Field(
         ..., description="Lista de itens a serem processados"
     )
+    concorrente: bool = Field(
+        False, description="Se os arquivos devem ser processados concorrentemente"
+    )
+    limite_concorrencia: int = Field(
+        4, ge=1, description="Máximo de arquivos em processamento simultâneo (global)"
+    )
+    limite_por_provedor: int | None = Field(
+        2, ge=1, description="Máximo de arquivos simultâneos por provedor de IA"
+    )
+    tokens_por_bloco: int | None = Field(
+        None,
+        ge=500,
+        description=(
+            "Orçamento de tokens por bloco do documento. Relatórios maiores são extraídos "
+            "em blocos concorrentes e mesclados"
+        ),
+    )
 
 
 class ProcessamentoDetalheSchema(BaseModel):
@@ -4,16 +4,17 @@ Service principal do módulo FIDCS.
 Contém lógica de negócio, factory de processadores e orquestração do processamento de arquivos FIDC.
 """
 
+import asyncio
 from datetime import datetime
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+import config.database as db
 from modules.integrations.enums import FerramentaExtracaoEnum, TipoExtracaoEnum
 from modules.pydanticai.service import PydanticAIService
 
 if TYPE_CHECKING:
     from modules.fidcs.processors.base import BaseFIDCProcessor
-    from modules.fidcs.repository import FidcsRepository
 
 from .processors.bemol import BemolProcessor
 from .processors.brz_consignados_v import BrzProcessor
@@ -23,6 +24,8 @@ from .processors.somacred import SomacredProcessor
 from .processors.valora_alion_ii import AlionProcessor
 from .processors.valora_noto import NotoProcessor
 from .processors.verde_card import VerdeCardProcessor
+from .indicadores import ResolvedorIndicadores
+from .repository import FidcsRepository
 from .schema import (
     ArquivoPromptInfoSchema,
     DadosCadastraisResponseSchema,
@@ -236,38 +239,43 @@ class FidcsService:
         """
         Processa lista de arquivos selecionados.
 
+        No modo concorrente cada arquivo usa sua própria sessão de banco, de forma
+        que o rollback de um arquivo não afeta os demais. Em ambos os modos os
+        detalhes são retornados na mesma ordem dos itens do request.
+
         Args:
             request: Request com lista de arquivos e prompts
 
         Returns:
             ProcessarResponseSchema: Resultado do processamento
         """
+        # Indicadores carregados uma vez e compartilhados por todos os arquivos do lote
+        resolvedor_indicadores = await self.repository.carregar_resolvedor_indicadores()
+
+        if request.concorrente and len(request.itens) > 1:
+            resultados = await self._processar_concorrente(request, resolvedor_indicadores)
+        else:
+            resultados = [
+                await self._processar_item(item, self.repository, request.tokens_por_bloco)
+                for item in request.itens
+            ]
+
         sucessos = 0
         falhas = 0
         detalhes = []
         erros_gerais = []
 
-        for item in request.itens:
-            try:
-                # Processa um arquivo individual
-                detalhe = await self._processar_arquivo_individual(item)
-
-                detalhes.append(detalhe)
+        for detalhe, erro_geral in resultados:
+            detalhes.append(detalhe)
 
-                if detalhe.sucesso:
-                    sucessos += 1
-                else:
-                    falhas += 1
+            if erro_geral:
+                erros_gerais.append(erro_geral)
 
-            except Exception as e:
-                # Erro geral no processamento
-                erros_gerais.append(f"Erro ao processar {item.arquivo}: {str(e)}")
+            if detalhe.sucesso:
+                sucessos += 1
+            else:
                 falhas += 1
 
-                detalhes.append(
-                    ProcessamentoDetalheSchema(arquivo=item.arquivo, sucesso=False, erro=str(e))
-                )
-
         return ProcessarResponseSchema(
             total_processados=len(request.itens),
             sucessos=sucessos,
@@ -276,18 +284,106 @@ class FidcsService:
             detalhes=detalhes,
         )
 
+    async def _processar_concorrente(
+        self,
+        request: ProcessarRequestSchema,
+        resolvedor_indicadores: ResolvedorIndicadores | None = None,
+    ) -> list[tuple[ProcessamentoDetalheSchema, str | None]]:
+        """
+        Processa os itens concorrentemente respeitando os limites de concorrência.
+
+        O limite por provedor é adquirido antes do global para que arquivos
+        aguardando um provedor saturado não ocupem vagas de outros provedores.
+
+        Args:
+            request: Request com itens e limites de concorrência
+            resolvedor_indicadores: Resolvedor de indicadores compartilhado pelo lote
+
+        Returns:
+            list[tuple]: (detalhe, erro geral) de cada item, na ordem do request
+        """
+        semaforo_global = asyncio.Semaphore(request.limite_concorrencia)
+        limite_provedor = request.limite_por_provedor or request.limite_concorrencia
+        semaforos_provedor: dict[str, asyncio.Semaphore] = {}
+
+        async def processar(item: ArquivoPromptInfoSchema):
+            provedor = self._get_provedor(item)
+            semaforo_provedor = semaforos_provedor.setdefault(
+                provedor, asyncio.Semaphore(limite_provedor)
+            )
+
+            async with semaforo_provedor, semaforo_global:
+                async with db.get_session(db.engine) as session:
+                    return await self._processar_item(
+                        item,
+                        FidcsRepository(session, resolvedor_indicadores),
+                        request.tokens_por_bloco,
+                    )
+
+        return await asyncio.gather(*(processar(item) for item in request.itens))
+
+    async def _processar_item(
+        self,
+        item: ArquivoPromptInfoSchema,
+        repository: FidcsRepository,
+        tokens_por_bloco: int | None = None,
+    ) -> tuple[ProcessamentoDetalheSchema, str | None]:
+        """
+        Processa um item convertendo exceções inesperadas em detalhe de falha.
+
+        Args:
+            item: Item com informações do arquivo e prompt
+            repository: Repository (sessão) usado pelo item
+            tokens_por_bloco: Orçamento de tokens por bloco do documento (None desativa)
+
+        Returns:
+            tuple: (detalhe do processamento, erro geral ou None)
+        """
+        try:
+            detalhe = await self._processar_arquivo_individual(item, repository, tokens_por_bloco)
+            return detalhe, None
+        except Exception as e:
+            # Erro geral no processamento
+            return (
+                ProcessamentoDetalheSchema(arquivo=item.arquivo, sucesso=False, erro=str(e)),
+                f"Erro ao processar {item.arquivo}: {str(e)}",
+            )
+
+    @staticmethod
+    def _get_provedor(item: ArquivoPromptInfoSchema) -> str:
+        """
+        Retorna o provedor do modelo principal do item (ex: "groq").
+
+        Args:
+            item: Item com a lista de modelos do prompt
+
+        Returns:
+            str: Provedor do primeiro modelo ou "default" se não definido
+        """
+        if not item.model_name:
+            return "default"
+
+        return item.model_name[0].split(":", 1)[0].lower()
+
     async def _processar_arquivo_individual(
-        self, item: ArquivoPromptInfoSchema
+        self,
+        item: ArquivoPromptInfoSchema,
+        repository: FidcsRepository | None = None,
+        tokens_por_bloco: int | None = None,
     ) -> ProcessamentoDetalheSchema:
         """
         Processa um arquivo individual.
 
         Args:
             item: Item com informações do arquivo e prompt
+            repository: Repository da transação do item (padrão: repository do service)
+            tokens_por_bloco: Orçamento de tokens por bloco do documento (None desativa)
 
         Returns:
             ProcessamentoDetalheSchema: Resultado do processamento individual
         """
+        repository = repository or self.repository
+
         try:
             # Valida se o prompt foi encontrado
             if not item.prompt_encontrado or not item.schema_name:
@@ -298,35 +394,17 @@ class FidcsService:
                 )
 
             # Prepara parâmetros para a API
-            caminho_arquivo = f"files/fidcs/{item.arquivo}"
+            caminho_arquivo = Path("files/fidcs") / item.arquivo
 
             # Determina tipo de extração baseado no is_image
             tipo_extracao = (
                 TipoExtracaoEnum.IMAGENS if item.is_image else TipoExtracaoEnum.MARKDOWN
             )
 
-            # Cria arquivo mock para upload (FastAPI UploadFile)
-            import io
-
-            from fastapi import UploadFile
-            from starlette.datastructures import Headers
-
-            with open(caminho_arquivo, "rb") as f:
-                file_content = f.read()
-
-            # Cria headers com content-type
-            headers = Headers({"content-type": "application/pdf"})
-
-            file_obj = UploadFile(
-                filename=item.arquivo,
-                file=io.BytesIO(file_content),
-                headers=headers,
-            )
-
             # Chama API do PydanticAI
             api_response = await self.pydantic_ai_service.executar_consulta_com_arquivo(
                 user_prompt=item.user_prompt,
-                arquivo=file_obj,
+                arquivo=caminho_arquivo,
                 ferramenta_extracao=FerramentaExtracaoEnum.DOCLING,
                 tipo_extracao=tipo_extracao,
                 model=item.model_name,
@@ -335,6 +413,7 @@ class FidcsService:
                 max_tokens=item.max_tokens or 2440,
                 temperature=item.temperatura or 0.1,
                 schema_name=item.schema_name,
+                tokens_por_bloco=tokens_por_bloco,
             )
 
             # Converte response para dict
@@ -349,7 +428,7 @@ class FidcsService:
             }
 
             # Busca código do ativo
-            ativo_codigo = await self.repository.get_ativo_codigo_by_schema(
+            ativo_codigo = await repository.get_ativo_codigo_by_schema(
                 api_response.schema_utilizado
             )
 
@@ -362,7 +441,7 @@ class FidcsService:
 
             # Cria processador específico
             processor = self.factory.create_processor(
-                api_response.schema_utilizado, self.repository
+                api_response.schema_utilizado, repository
             )
 
             # Processa dados
@@ -371,7 +450,7 @@ class FidcsService:
             )
 
             # Commit das transações
-            await self.repository.commit()
+            await repository.commit()
 
             return ProcessamentoDetalheSchema(
                 arquivo=item.arquivo,
@@ -385,7 +464,7 @@ class FidcsService:
 
         except Exception as e:
             # Rollback em caso de erro
-            await self.repository.rollback()
+            await repository.rollback()
 
             return ProcessamentoDetalheSchema(arquivo=item.arquivo, sucesso=False, erro=str(e))
 
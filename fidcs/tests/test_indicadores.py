@@ -0,0 +1,88 @@
+import pytest
+
+from modules.fidcs.indicadores import ResolvedorIndicadores, normalizar_nome, palavras
+
+INDICADORES = [
+    (1, "PL"),
+    (2, "Patrimônio Líquido"),
+    (3, "Inadimplência acima de 90 dias"),
+    (4, "Índice de Subordinação"),
+    (5, "Índice de Subordinação Sênior"),
+    (6, "Prazo Médio da Carteira"),
+    (7, "Valor da Cota Sênior"),
+    (8, "Valor da Cota Subordinada"),
+]
+
+
+@pytest.fixture
+def resolvedor():
+    return ResolvedorIndicadores(INDICADORES)
+
+
+class TestNormalizacao:
+    """Testes das funções de normalização de nomes"""
+
+    def test_normalizar_nome(self):
+        """Testa remoção de acentos, maiúsculas e espaços repetidos"""
+        assert normalizar_nome("  Índice  de   Subordinação ") == "indice de subordinacao"
+
+    def test_palavras(self):
+        """Testa que a pontuação é descartada"""
+        assert palavras("patrimonio liquido (r$ mil):") == "patrimonio liquido r mil"
+
+
+class TestResolvedorIndicadores:
+    """Testes da resolução em memória de nomes de indicadores"""
+
+    def test_busca_exata(self, resolvedor):
+        """Testa busca exata sem diferenciar maiúsculas"""
+        assert resolvedor.resolver("patrimônio líquido") == 2
+        assert resolvedor.resolver("pl") == 1
+
+    def test_busca_normalizada(self, resolvedor):
+        """Testa busca ignorando acentos e espaços"""
+        assert resolvedor.resolver("Indice de  Subordinacao Senior") == 5
+        assert resolvedor.resolver("INADIMPLENCIA ACIMA DE 90 DIAS") == 3
+
+    def test_nome_contido_no_indicador(self, resolvedor):
+        """Testa nome parcial contido em um único indicador"""
+        assert resolvedor.resolver("Prazo Médio") == 6
+
+    def test_indicador_contido_no_nome(self, resolvedor):
+        """Testa indicador que aparece como palavras inteiras no nome"""
+        assert resolvedor.resolver("Patrimônio Líquido (R$ mil)") == 2
+        assert resolvedor.resolver("Prazo Médio da Carteira - dias") == 6
+
+    def test_sigla_curta_nao_casa_dentro_do_nome(self, resolvedor):
+        """Testa que "PL" não é encontrado dentro de outras palavras"""
+        assert resolvedor.resolver("Inadimplencia 30 dias") is None
+        assert resolvedor.resolver("Taxa de aplicação") is None
+        assert resolvedor.resolver("plano") is None
+
+    def test_sigla_curta_nao_casa_como_palavra(self, resolvedor):
+        """Testa que siglas curtas não casam mesmo como palavra inteira"""
+        assert resolvedor.resolver("PL médio do mês") is None
+
+    def test_nome_ambiguo(self, resolvedor):
+        """Testa que nomes com mais de um indicador candidato não são resolvidos"""
+        # Contido em "Índice de Subordinação" e "Índice de Subordinação Sênior"
+        assert resolvedor.resolver("Subordinação") is None
+        # Contido em "Valor da Cota Sênior" e "Valor da Cota Subordinada"
+        assert resolvedor.resolver("Valor da Cota") is None
+
+    def test_busca_por_similaridade(self, resolvedor):
+        """Testa pequenas variações de grafia"""
+        assert resolvedor.resolver("Inadimplencia acima de 90 dia") == 3
+
+    def test_nome_inexistente(self, resolvedor):
+        """Testa nomes sem indicador correspondente"""
+        assert resolvedor.resolver("Rentabilidade acumulada no ano") is None
+        assert resolvedor.resolver("") is None
+        assert resolvedor.resolver("   ") is None
+
+    def test_resolucoes_memorizadas(self, resolvedor):
+        """Testa que a mesma consulta é resolvida uma única vez"""
+        resolvedor.resolver("Patrimônio Líquido (R$ mil)")
+        resolvedor._normalizados.clear()
+
+        assert resolvedor.resolver("Patrimônio Líquido (R$ mil)") == 2
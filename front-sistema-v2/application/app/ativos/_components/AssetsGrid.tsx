@@ -462,6 +462,8 @@ export default function AssetsGrid({
 
   const eventDataRef = useRef([] as Evento[]);
   const searchRef = useRef("");
+  // Cursor de continuação de cada bloco, indexado por busca e linha inicial
+  const cursorsRef = useRef<Record<string, string>>({});
 
   const httpClient = useHTTP({ withCredentials: true });
 
@@ -495,20 +497,29 @@ export default function AssetsGrid({
       const serializedSort = JSON.stringify(sortModel);
       const serializedFilters = JSON.stringify(filters);
 
+      const search = serializedSort + serializedFilters;
+      const cursor = cursorsRef.current[`${search}|${startRow}`];
+
       const q = new URLSearchParams("");
       q.append("deslocamento", String(startRow));
       q.append("quantidade", String(endRow - startRow));
       q.append("ordenacao_ativos", serializedSort);
       q.append("filtros_ativos", serializedFilters);
+      if (cursor) q.append("cursor", cursor);
       const response = await httpClient.fetch(`v1/ativos?${q.toString()}`, {
         hideToast: { success: true },
       });
       if (!response) return params.fail();
 
-      const { ativos, total } = (await response.json()) as {
+      const { ativos, total, proximo_cursor } = (await response.json()) as {
         ativos: Ativo[];
         total: number;
+        proximo_cursor: string | null;
       };
+      if (startRow === 0) cursorsRef.current = {};
+      if (proximo_cursor) {
+        cursorsRef.current[`${search}|${endRow}`] = proximo_cursor;
+      }
 
       params.success({
         rowData: ativos.map((a) => ({
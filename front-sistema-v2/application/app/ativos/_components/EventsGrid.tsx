@@ -202,6 +202,8 @@ export default function EventsGrid({
   const assetDataExistsRef = useRef(new Set<string>());
   const assetDataRef = useRef([] as Ativo[]);
   const searchRef = useRef("");
+  // Cursor de continuação de cada bloco, indexado por busca e linha inicial
+  const cursorsRef = useRef<Record<string, string>>({});
   const httpClient = useHTTP({ withCredentials: true });
 
   const dataSource: IServerSideDatasource = {
@@ -239,6 +241,8 @@ export default function EventsGrid({
       q.append("quantidade", String(endRow - startRow));
       q.append("ordenacao_eventos", serializedSort);
       q.append("filtros_eventos", JSON.stringify(filters));
+      const cursor = cursorsRef.current[`${newSearchRef}|${startRow}`];
+      if (cursor) q.append("cursor", cursor);
 
       const response = await httpClient.fetch(
         `v1/ativos/eventos?${q.toString()}`,
@@ -246,11 +250,17 @@ export default function EventsGrid({
       );
       if (!response.ok) return params.fail();
 
-      const { ativos, eventos, total } = (await response.json()) as {
-        ativos: Ativo[];
-        eventos: Evento[];
-        total: number;
-      };
+      const { ativos, eventos, total, proximo_cursor } =
+        (await response.json()) as {
+          ativos: Ativo[];
+          eventos: Evento[];
+          total: number;
+          proximo_cursor: string | null;
+        };
+      if (startRow === 0) cursorsRef.current = {};
+      if (proximo_cursor) {
+        cursorsRef.current[`${newSearchRef}|${endRow}`] = proximo_cursor;
+      }
       params.success({
         rowData: eventos.map((e) => ({ ...e, tipo_evento: e.tipo.nome })),
         rowCount: total,
@@ -1,5 +1,7 @@
-from collections import UserList
+from collections import UserList, defaultdict
 from decimal import Decimal
+from typing import Any, Callable, Hashable
+import numpy as np
 from sqlalchemy import INTEGER, BIGINT, BOOLEAN, TEXT, DATE, NUMERIC, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -9,7 +11,80 @@ from modules.medidas.model import Medida
 from modules.moedas.model import Moeda
 from modules.fontes_dados.model import FonteDados
 from modules.integrations.enums import FontesDadosEnum
-from modules.calculos.service import CalculosService
+from modules.calculos.calendario import CalendarioDiasUteis, get_calendario_b3
+
+
+class _ColecaoIndexada(UserList):
+    """
+    Lista com índices hash materializados sob demanda.
+
+    Cada índice é construído na primeira consulta e reaproveitado pelas seguintes;
+    qualquer mutação da lista descarta todos os índices. Em chaves repetidas, o
+    índice guarda o primeiro item da lista, preservando o resultado da busca linear.
+    """
+
+    def __init__(self, initlist=None):
+        super().__init__(initlist)
+        self._indices: dict[str, dict[Hashable, Any]] = {}
+
+    def _get_indice(
+        self, nome: str, construir: Callable[[], dict[Hashable, Any]]
+    ) -> dict[Hashable, Any]:
+        indice = self._indices.get(nome)
+        if indice is None:
+            indice = self._indices[nome] = construir()
+        return indice
+
+    def _invalidar_indices(self) -> None:
+        self._indices.clear()
+
+    def __setitem__(self, i, item):
+        super().__setitem__(i, item)
+        self._invalidar_indices()
+
+    def __delitem__(self, i):
+        super().__delitem__(i)
+        self._invalidar_indices()
+
+    def __iadd__(self, other):
+        self._invalidar_indices()
+        return super().__iadd__(other)
+
+    def __imul__(self, n):
+        self._invalidar_indices()
+        return super().__imul__(n)
+
+    def append(self, item):
+        super().append(item)
+        self._invalidar_indices()
+
+    def insert(self, i, item):
+        super().insert(i, item)
+        self._invalidar_indices()
+
+    def pop(self, i=-1):
+        self._invalidar_indices()
+        return super().pop(i)
+
+    def remove(self, item):
+        super().remove(item)
+        self._invalidar_indices()
+
+    def clear(self):
+        super().clear()
+        self._invalidar_indices()
+
+    def reverse(self):
+        super().reverse()
+        self._invalidar_indices()
+
+    def sort(self, /, *args, **kwds):
+        super().sort(*args, **kwds)
+        self._invalidar_indices()
+
+    def extend(self, other):
+        super().extend(other)
+        self._invalidar_indices()
 
 
 class Indice(Model, SchemaIcatu):
@@ -61,78 +136,82 @@ class Indice(Model, SchemaIcatu):
         )
 
     def get_data_ultima_cotacao(self, feriados=None) -> date:
-        if not feriados:
-            return CalculosService.get_data_d_util_menos_x_dias(
-                x_dias=self.atraso_coleta_dias,
-                data_input=date.today(),
-            )
-
-        return CalculosService.get_data_d_util_menos_x_dias(
+        calendario: CalendarioDiasUteis = (
+            CalendarioDiasUteis(feriados) if feriados else get_calendario_b3()
+        )
+        return calendario.get_data_d_util_menos_x_dias(
             x_dias=self.atraso_coleta_dias,
             data_input=date.today(),
-            feriados=feriados,
         )
 
 
-class IndiceCollection(UserList["Indice"]):
+class IndiceCollection(_ColecaoIndexada, UserList["Indice"]):
     def get_nomes(self) -> list[str]:
         return [indice.nome for indice in self.data]
 
+    def __get_indice_por_fonte_dado_identificador(self) -> dict[tuple[str, str], Indice]:
+        indice_por_identificador: dict[tuple[str, str], Indice] = {}
+        for indice in self.data:
+            for identificador in indice.identificadores:
+                indice_por_identificador.setdefault(
+                    (identificador.get_nome_completo_fonte_dados(), identificador.codigo),
+                    indice,
+                )
+        return indice_por_identificador
+
+    def __get_indices_agrupados(
+        self, get_chave: Callable[[Indice], Hashable]
+    ) -> dict[Hashable, list[Indice]]:
+        indices_agrupados: dict[Hashable, list[Indice]] = defaultdict(list)
+        for indice in self.data:
+            indices_agrupados[get_chave(indice)].append(indice)
+        return dict(indices_agrupados)
+
     def get_indice_by_fonte_dado_identificador(
         self,
         nome_completo_fonte_dado: str,
         codigo_identificador: str,
     ) -> Indice | None:
-        for indice in self.data:
-            for identificador in indice.get_identificadores_collection():
-                if (
-                    identificador.get_nome_completo_fonte_dados()
-                    == nome_completo_fonte_dado
-                    and identificador.codigo == codigo_identificador
-                ):
-                    return indice
-
-        return None
+        indice_por_identificador = self._get_indice(
+            "fonte_dado_identificador", self.__get_indice_por_fonte_dado_identificador
+        )
+        return indice_por_identificador.get((nome_completo_fonte_dado, codigo_identificador))
 
     def get_indices_by_fonte_dado_principal(
         self, nome_completo_fonte_dado: str
     ) -> "IndiceCollection":
-        return IndiceCollection(
-            list(
-                filter(
-                    lambda indice: indice.get_nome_fonte_dados()
-                    == nome_completo_fonte_dado,
-                    self.data,
-                )
-            )
+        indices_por_fonte_dado = self._get_indice(
+            "fonte_dado_principal",
+            lambda: self.__get_indices_agrupados(Indice.get_nome_fonte_dados),
         )
+        return IndiceCollection(indices_por_fonte_dado.get(nome_completo_fonte_dado, []))
 
     def get_indices_by_codigo_moeda(self, codigo_moeda: str) -> "IndiceCollection":
-        return IndiceCollection(
-            list(
-                filter(
-                    lambda indice: indice.get_codigo_moeda() == codigo_moeda, self.data
-                )
-            )
+        indices_por_moeda = self._get_indice(
+            "codigo_moeda", lambda: self.__get_indices_agrupados(Indice.get_codigo_moeda)
         )
+        return IndiceCollection(indices_por_moeda.get(codigo_moeda, []))
 
     def get_nomes_fonte_dados(self) -> list[str]:
         return list(*set([indice.get_nome_fonte_dados() for indice in self.data]))
 
     def get_indice_by_nome(self, nome: str) -> Indice | None:
-        for indice in self.data:
-            if indice.nome == nome:
-                return indice
-
-        return None
+        indice_por_nome = self._get_indice(
+            "nome", lambda: {indice.nome: indice for indice in reversed(self.data)}
+        )
+        return indice_por_nome.get(nome)
 
     def get_menor_e_maior_data_ultima_cotacao(self, feriados=None) -> tuple[date, date]:
-        datas_ultima_cotacao: list[date] = [
-            indice.get_data_ultima_cotacao(feriados=feriados) for indice in self.data
-        ]
+        calendario: CalendarioDiasUteis = (
+            CalendarioDiasUteis(feriados) if feriados else get_calendario_b3()
+        )
+        atrasos_coleta_dias: list[int] = [indice.atraso_coleta_dias for indice in self.data]
+        datas_ultima_cotacao = calendario.adicionar_dias_uteis(
+            date.today(), -np.asarray(atrasos_coleta_dias)
+        )
 
-        data_mais_recente_ultima_cotacao: date = max(datas_ultima_cotacao)
-        data_menos_recente_ultima_cotacao: date = min(datas_ultima_cotacao)
+        data_mais_recente_ultima_cotacao: date = datas_ultima_cotacao.max().item()
+        data_menos_recente_ultima_cotacao: date = datas_ultima_cotacao.min().item()
 
         return (data_menos_recente_ultima_cotacao, data_mais_recente_ultima_cotacao)
 
@@ -163,15 +242,17 @@ class IndiceIdentificador(Model, SchemaIcatu):
         return self.fonte_dado.get_nome_fornecedor()
 
 
-class IndiceIdentificadorCollection(UserList["IndiceIdentificador"]):
+class IndiceIdentificadorCollection(_ColecaoIndexada, UserList["IndiceIdentificador"]):
     def get_indice_identificador_by_fonte_dado(
         self, fonte_dado: FontesDadosEnum
     ) -> "IndiceIdentificador | None":
-        for item in self.data:
-            if fonte_dado.value == item.get_nome_completo_fonte_dados():
-                return item
-
-        return None
+        identificador_por_fonte_dado = self._get_indice(
+            "fonte_dado",
+            lambda: {
+                item.get_nome_completo_fonte_dados(): item for item in reversed(self.data)
+            },
+        )
+        return identificador_por_fonte_dado.get(fonte_dado.value)
 
 
 class IndiceCotacao(Model, SchemaIcatu):
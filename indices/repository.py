@@ -1,13 +1,14 @@
 from abc import ABC, abstractmethod
 from datetime import date
 from typing import Sequence
-from sqlalchemy import select, insert
+from sqlalchemy import func, select, insert, tuple_
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import selectinload, noload
 
 from .model import Indice, IndiceCotacao, IndiceIdentificador
 from .schema import IndiceCotacaoSchema
 from modules.repository import BaseRepository
+from modules.staging import carregar_staging
 from modules.moedas.model import Moeda
 
 
@@ -48,16 +49,45 @@ class IndicesRepository(ABC):
     ) -> IndiceCotacao | None:
         raise NotImplementedError
 
+    @abstractmethod
+    async def lista_cotacoes_by_indices_datas(
+        self,
+        indices_datas: list[tuple[int, date]],
+        codigo_moeda: str | None = None,
+    ) -> Sequence[IndiceCotacao]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def lista_datas_ultimas_cotacoes(self) -> dict[tuple[int, str], date]:
+        raise NotImplementedError
+
     @abstractmethod
     async def insere_cotacoes_indices(
         self, indices_cotacoes: list[IndiceCotacaoSchema]
     ) -> Sequence[IndiceCotacao]:
         raise NotImplementedError
 
+    @abstractmethod
+    async def insere_cotacoes_indices_bulk(
+        self,
+        indices_cotacoes: list[IndiceCotacaoSchema],
+        retornar_chaves: bool = False,
+    ) -> tuple[int, list[tuple[int, int, date]]]:
+        raise NotImplementedError
+
 
 class IndicesRepositoryImpl(IndicesRepository):
     __base_repository: BaseRepository[Indice]
 
+    __TABELA_STAGING_COTACOES: str = "indices_cotacoes_staging"
+    __COLUNAS_STAGING_COTACOES: dict[str, str] = {
+        "indice_id": "INTEGER NOT NULL",
+        "fonte_dado_id": "INTEGER NOT NULL",
+        "moeda_id": "INTEGER NOT NULL",
+        "data_referente": "DATE NOT NULL",
+        "cotacao": "NUMERIC NOT NULL",
+    }
+
     def __init__(self, base_repository: BaseRepository[Indice]):
         self.__base_repository = base_repository
 
@@ -126,6 +156,48 @@ class IndicesRepositoryImpl(IndicesRepository):
         result = await self.__base_repository.get_db_session().execute(query)
         return result.unique().scalar_one_or_none()
 
+    async def lista_cotacoes_by_indices_datas(
+        self,
+        indices_datas: list[tuple[int, date]],
+        codigo_moeda: str | None = None,
+    ) -> Sequence[IndiceCotacao]:
+        if len(indices_datas) == 0:
+            return []
+
+        if codigo_moeda is None:
+            codigo_moeda = "BRL"
+
+        query = (
+            select(IndiceCotacao)
+            .join(Moeda)
+            .where(
+                tuple_(IndiceCotacao.indice_id, IndiceCotacao.data_referente).in_(
+                    indices_datas
+                )
+            )
+            .where(Moeda.codigo == codigo_moeda)
+        )
+
+        results = await self.__base_repository.get_db_session().execute(query)
+        return results.unique().scalars().all()
+
+    async def lista_datas_ultimas_cotacoes(self) -> dict[tuple[int, str], date]:
+        query = (
+            select(
+                IndiceCotacao.indice_id,
+                Moeda.codigo,
+                func.max(IndiceCotacao.data_referente),
+            )
+            .join(Moeda, IndiceCotacao.moeda_id == Moeda.id)
+            .group_by(IndiceCotacao.indice_id, Moeda.codigo)
+        )
+
+        results = await self.__base_repository.get_db_session().execute(query)
+        return {
+            (indice_id, codigo_moeda): data_ultima_cotacao
+            for indice_id, codigo_moeda, data_ultima_cotacao in results.all()
+        }
+
     async def insere_cotacoes_indices(
         self,
         indices_cotacoes: list[IndiceCotacaoSchema],
@@ -197,6 +269,69 @@ class IndicesRepositoryImpl(IndicesRepository):
 
         return cotacoes_inseridas
 
+    async def insere_cotacoes_indices_bulk(
+        self,
+        indices_cotacoes: list[IndiceCotacaoSchema],
+        retornar_chaves: bool = False,
+    ) -> tuple[int, list[tuple[int, int, date]]]:
+        if len(indices_cotacoes) == 0:
+            return 0, []
+
+        session = self.__base_repository.get_db_session()
+
+        staging = await carregar_staging(
+            session,
+            self.__TABELA_STAGING_COTACOES,
+            self.__COLUNAS_STAGING_COTACOES,
+            [
+                (
+                    cotacao.indice_id,
+                    cotacao.fonte_dado_id,
+                    cotacao.moeda_id,
+                    cotacao.data_referente,
+                    cotacao.cotacao,
+                )
+                for cotacao in indices_cotacoes
+            ],
+            # Ordem de carga, para o desempate entre cotações repetidas
+            colunas_geradas={"ordem": "BIGSERIAL"},
+        )
+
+        chave = (staging.c.indice_id, staging.c.moeda_id, staging.c.data_referente)
+
+        # Cotações repetidas na carga: prevalece a última, como no insert linha a linha
+        cotacoes_staging = (
+            select(*(staging.c[coluna] for coluna in self.__COLUNAS_STAGING_COTACOES))
+            .distinct(*chave)
+            .order_by(*chave, staging.c.ordem.desc())
+        )
+
+        upsert_query = insert(IndiceCotacao).from_select(
+            list(self.__COLUNAS_STAGING_COTACOES), cotacoes_staging
+        )
+        upsert_query = upsert_query.on_conflict_do_update(
+            index_elements=["indice_id", "moeda_id", "data_referente"],
+            set_={
+                "fonte_dado_id": upsert_query.excluded.fonte_dado_id,
+                "cotacao": upsert_query.excluded.cotacao,
+            },
+        )
+
+        if retornar_chaves:
+            results = await session.execute(
+                upsert_query.returning(
+                    IndiceCotacao.indice_id,
+                    IndiceCotacao.moeda_id,
+                    IndiceCotacao.data_referente,
+                )
+            )
+            chaves: list[tuple[int, int, date]] = [tuple(row) for row in results.all()]
+            return len(chaves), chaves
+
+        upsert_cte = upsert_query.returning(IndiceCotacao.id).cte("upsert")
+        results = await session.execute(select(func.count()).select_from(upsert_cte))
+        return results.scalar_one(), []
+
     def __get_lotes(self, dados: list, tamanho_lote: int):
         for i in range(0, len(dados), tamanho_lote):
             yield dados[i : i + tamanho_lote]
@@ -45,9 +45,15 @@ async def get_indices_sem_cotacoes(service: IndiceService = Depends(get_service)
 @router.post("/cotacoes")
 async def inserir_cotacoes_indices(
     body: PostCotacoesBodySchema,
+    detalhar: bool = True,
+    retornar_chaves: bool = False,
     service: IndiceService = Depends(get_service),
 ):
-    return await service.insere_cotacoes(cotacoes_indices=body.cotacoes)
+    return await service.insere_cotacoes(
+        cotacoes_indices=body.cotacoes,
+        detalhar=detalhar,
+        retornar_chaves=retornar_chaves,
+    )
 
 
 @router.post("/cotacoes/sinteticos/base")
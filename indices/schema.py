@@ -97,10 +97,18 @@ class PostCotacoesBodySchema(Schema):
     cotacoes: list[ColetaIndiceCotacaoSchema]
 
 
+class ChaveIndiceCotacaoSchema(Schema):
+    indice_id: int
+    moeda_id: int
+    data_referente: date
+
+
 class PostCotacoesResponseSchema(Schema):
     cotacoes_nao_inseridas: list[ColetaIndiceCotacaoSchema]
     avisos: list[PostCotacoesAvisoSchema]
-    cotacoes_inseridas: list[IndiceCotacaoSchema]
+    quantidade_cotacoes_inseridas: int
+    cotacoes_inseridas: list[IndiceCotacaoSchema] | None = None
+    chaves_cotacoes_inseridas: list[ChaveIndiceCotacaoSchema] | None = None
 
 
 class PostCotacoesSinteticosBaseAvisoSchema(Schema):
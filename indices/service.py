@@ -3,6 +3,7 @@ from decimal import Decimal
 
 from .model import IndiceCotacao
 from .schema import (
+    ChaveIndiceCotacaoSchema,
     IndiceSchema,
     IndiceCotacaoSchema,
     PostCotacoesAvisoSchema,
@@ -28,6 +29,8 @@ class IndiceService(ABC):
     async def insere_cotacoes(
         self,
         cotacoes_indices: list[ColetaIndiceCotacaoSchema],
+        detalhar: bool = True,
+        retornar_chaves: bool = False,
     ) -> PostCotacoesResponseSchema:
         raise NotImplementedError
 
@@ -65,7 +68,10 @@ class IndiceServiceImpl(IndiceService):
         return indices_sem_cotacoes_schema
 
     async def insere_cotacoes(
-        self, cotacoes_indices: list[ColetaIndiceCotacaoSchema]
+        self,
+        cotacoes_indices: list[ColetaIndiceCotacaoSchema],
+        detalhar: bool = True,
+        retornar_chaves: bool = False,
     ) -> PostCotacoesResponseSchema:
         cotacoes_indices_tratados: list[IndiceCotacaoSchema] = []
         cotacoes_nao_inseridas: list[ColetaIndiceCotacaoSchema] = []
@@ -129,6 +135,36 @@ class IndiceServiceImpl(IndiceService):
 
             cotacoes_indices_tratados.append(cotacao_tratada)
 
+        cotacoes_nao_inseridas = sorted(
+            cotacoes_nao_inseridas,
+            key=lambda cotacao: (cotacao.data_referente, cotacao.nome_indice),
+        )
+
+        if not detalhar:
+            quantidade_inseridas, chaves_inseridas = (
+                await self.__indices_repository.insere_cotacoes_indices_bulk(
+                    cotacoes_indices_tratados, retornar_chaves=retornar_chaves
+                )
+            )
+
+            return PostCotacoesResponseSchema(
+                quantidade_cotacoes_inseridas=quantidade_inseridas,
+                chaves_cotacoes_inseridas=(
+                    [
+                        ChaveIndiceCotacaoSchema(
+                            indice_id=indice_id,
+                            moeda_id=moeda_id,
+                            data_referente=data_referente,
+                        )
+                        for indice_id, moeda_id, data_referente in chaves_inseridas
+                    ]
+                    if retornar_chaves
+                    else None
+                ),
+                cotacoes_nao_inseridas=cotacoes_nao_inseridas,
+                avisos=avisos,
+            )
+
         cotacoes_indices_inseridas: list[IndiceCotacao] = list(
             await self.__indices_repository.insere_cotacoes_indices(
                 cotacoes_indices_tratados
@@ -141,14 +177,12 @@ class IndiceServiceImpl(IndiceService):
         ]
 
         return PostCotacoesResponseSchema(
+            quantidade_cotacoes_inseridas=len(cotacoes_indices_inseridas_schema),
             cotacoes_inseridas=sorted(
                 cotacoes_indices_inseridas_schema,
                 key=lambda cotacao: (cotacao.data_referente, cotacao.indice),
             ),
-            cotacoes_nao_inseridas=sorted(
-                cotacoes_nao_inseridas,
-                key=lambda cotacao: (cotacao.data_referente, cotacao.nome_indice),
-            ),
+            cotacoes_nao_inseridas=cotacoes_nao_inseridas,
             avisos=avisos,
         )
 
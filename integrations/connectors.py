@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from datetime import date
+from pathlib import Path
 
 from fastapi import UploadFile
 from modules.indices.model import IndiceCollection
@@ -47,3 +48,27 @@ class DocumentConnector(ABC):
             Exception: Para outros erros de processamento
         """
         raise NotImplementedError
+
+    @abstractmethod
+    async def extract_document_content_from_path(
+        self,
+        caminho: Path,
+        ferramenta_extracao: FerramentaExtracaoEnum,
+        tipo_extracao: TipoExtracaoEnum,
+    ) -> str:
+        """
+        Extrai conteúdo de um arquivo local, sem carregá-lo inteiro em memória.
+
+        Args:
+            caminho: Caminho do arquivo local
+            ferramenta_extracao: Ferramenta a ser usada para extração
+            tipo_extracao: Tipo de extração desejado
+
+        Returns:
+            str: Conteúdo extraído do documento
+
+        Raises:
+            ValueError: Se combinação de ferramenta e tipo não for suportada
+            Exception: Para outros erros de processamento
+        """
+        raise NotImplementedError
@@ -1,5 +1,7 @@
+import asyncio
+from importlib.util import find_spec
 from os import getenv
-from httpx import AsyncClient, Response
+from httpx import AsyncClient, Limits, Response
 
 from modules.integrations.api.client import (
     IntegrationApiClient,
@@ -9,6 +11,21 @@ from modules.exceptions import EnvVariableMissingException
 
 
 class ComDinheiroApiClient(IntegrationApiClient):
+    """
+    Client da API ComDinheiro.
+
+    O `AsyncClient` é compartilhado por todas as instâncias do processo (por event
+    loop) e permanece aberto entre usos, mantendo as conexões vivas (keep-alive e
+    HTTP/2, se o pacote `h2` estiver instalado). Sair do bloco `async with` não
+    fecha o client; use `close()` para encerrá-lo. No encerramento da aplicação,
+    `close_shared()` (registrado no shutdown pelo router da rotina de coleta)
+    fecha as conexões.
+    """
+
+    # Client compartilhado e o event loop em que foi criado
+    _shared_client: AsyncClient | None = None
+    _shared_client_loop: asyncio.AbstractEventLoop | None = None
+
     __client: AsyncClient | None
     __base_url: str
     __username: str
@@ -78,13 +95,47 @@ class ComDinheiroApiClient(IntegrationApiClient):
         if self.__client and not self.__client.is_closed:
             await self.__client.aclose()
 
+        if ComDinheiroApiClient._shared_client is self.__client:
+            ComDinheiroApiClient._shared_client = None
+            ComDinheiroApiClient._shared_client_loop = None
+
         return None
 
-    async def __aenter__(self) -> IntegrationApiClient:
-        if self.__client is None or self.__client.is_closed:
-            self.__client = AsyncClient(
-                base_url=self.__base_url, timeout=self._timeout_in_seconds
+    @staticmethod
+    async def close_shared() -> None:
+        """Fecha o client compartilhado, se houver, sem precisar de uma instância."""
+        client = ComDinheiroApiClient._shared_client
+        ComDinheiroApiClient._shared_client = None
+        ComDinheiroApiClient._shared_client_loop = None
+
+        if client is not None and not client.is_closed:
+            await client.aclose()
+
+    def __get_shared_client(self) -> AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = ComDinheiroApiClient._shared_client
+        if (
+            client is None
+            or client.is_closed
+            or ComDinheiroApiClient._shared_client_loop is not loop
+        ):
+            max_connections = int(getenv("COMDINHEIRO_API_MAX_CONNECTIONS", "8"))
+            client = AsyncClient(
+                base_url=self.__base_url,
+                timeout=self._timeout_in_seconds,
+                limits=Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections,
+                ),
+                http2=find_spec("h2") is not None,
             )
+            ComDinheiroApiClient._shared_client = client
+            ComDinheiroApiClient._shared_client_loop = loop
+
+        return client
+
+    async def __aenter__(self) -> IntegrationApiClient:
+        self.__client = self.__get_shared_client()
 
         return self
 
@@ -94,6 +145,5 @@ class ComDinheiroApiClient(IntegrationApiClient):
         exc_val,
         exc_tb,
     ) -> bool:
-        await self.close()
-
+        # O client compartilhado permanece aberto para as próximas requisições
         return False
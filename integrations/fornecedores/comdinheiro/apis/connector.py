@@ -1,10 +1,17 @@
+import asyncio
 import logging
 import urllib.parse
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from decimal import Decimal
-from httpx import Response
+from itertools import accumulate
+from os import getenv
+from time import monotonic
+from httpx import HTTPStatusError, Response, TransportError
 from typing import Any, Literal
 
+import numpy as np
+import numpy.typing as npt
+
 from modules.integrations.enums import FontesDadosEnum
 from modules.integrations.connectors import IntegrationsIndicesConnector
 from modules.integrations.api.client import IntegrationApiClient
@@ -16,18 +23,46 @@ from modules.rotinas.indices.coleta.schema import (
 )
 from modules.moedas.model import Moeda
 from modules.indices.repository import IndicesRepository
-from modules.indices.model import IndiceCotacao
-from modules.calculos.service import CalculosService
-from modules.util.feriados_financeiros_numpy import feriados
+from modules.calculos.calendario import CalendarioDiasUteis, get_calendario_b3
 
 
 class ComDinheiroApiConnector(IntegrationsIndicesConnector):
     __client: IntegrationApiClient
-
-    def __init__(self):
+    __compor_sinteticos_decimal: bool
+
+    def __init__(self, compor_sinteticos_decimal: bool | None = None):
+        """
+        Períodos longos são divididos em janelas (COMDINHEIRO_JANELA_DIAS, padrão: 365)
+        e listas de índices em lotes (COMDINHEIRO_LOTE_INDICES, padrão: 20), buscados
+        em paralelo (COMDINHEIRO_CONCORRENCIA, padrão: 4) com limite de taxa
+        (COMDINHEIRO_REQUISICOES_POR_SEGUNDO, padrão: 4; 0 desativa) e novas tentativas
+        por janela (COMDINHEIRO_TENTATIVAS, padrão: 3).
+
+        Args:
+            compor_sinteticos_decimal: Compõe os retornos dos índices sintéticos em
+                Decimal (exato) em vez de float64 vetorizado
+                (COMDINHEIRO_SINTETICOS_DECIMAL, padrão: false)
+        """
         self.__client = IntegrationApiClientFactory.create(
             fonte_dados=FontesDadosEnum.COMDINHEIRO_API
         )
+        if compor_sinteticos_decimal is None:
+            compor_sinteticos_decimal = (
+                getenv("COMDINHEIRO_SINTETICOS_DECIMAL", "false").lower() == "true"
+            )
+        self.__compor_sinteticos_decimal = compor_sinteticos_decimal
+
+        self.__janela_dias = int(getenv("COMDINHEIRO_JANELA_DIAS", "365"))
+        self.__lote_indices = int(getenv("COMDINHEIRO_LOTE_INDICES", "20"))
+        self.__tentativas = int(getenv("COMDINHEIRO_TENTATIVAS", "3"))
+
+        requisicoes_por_segundo = float(getenv("COMDINHEIRO_REQUISICOES_POR_SEGUNDO", "4"))
+        self.__semaforo = asyncio.Semaphore(int(getenv("COMDINHEIRO_CONCORRENCIA", "4")))
+        self.__lock_intervalo = asyncio.Lock()
+        self.__intervalo_requisicoes = (
+            1 / requisicoes_por_segundo if requisicoes_por_segundo > 0 else 0.0
+        )
+        self.__proxima_requisicao = 0.0
 
     async def fetch_indices_cotacoes_pontos(
         self,
@@ -47,9 +82,12 @@ class ComDinheiroApiConnector(IntegrationsIndicesConnector):
             list(filter(lambda indice: indice.is_sintetico, indices))
         )
 
+        # Apenas a leitura dos sintéticos consulta o banco, então as duas coletas
+        # podem ser feitas em paralelo sem compartilhar a sessão
+        coletas = []
         if indices_sinteticos:
-            indices_cotacoes.extend(
-                await self.__fetch_indices_cotacoes(
+            coletas.append(
+                self.__fetch_indices_cotacoes(
                     indices=indices_sinteticos,
                     indices_repository=indices_repository,
                     moeda=moeda,
@@ -61,8 +99,8 @@ class ComDinheiroApiConnector(IntegrationsIndicesConnector):
             )
 
         if indices_nao_sinteticos:
-            indices_cotacoes.extend(
-                await self.__fetch_indices_cotacoes(
+            coletas.append(
+                self.__fetch_indices_cotacoes(
                     indices=indices_nao_sinteticos,
                     indices_repository=indices_repository,
                     moeda=moeda,
@@ -73,6 +111,9 @@ class ComDinheiroApiConnector(IntegrationsIndicesConnector):
                 )
             )
 
+        for _indices_cotacoes in await asyncio.gather(*coletas):
+            indices_cotacoes.extend(_indices_cotacoes)
+
         return indices_cotacoes
 
     async def __fetch_indices_cotacoes(
@@ -85,38 +126,152 @@ class ComDinheiroApiConnector(IntegrationsIndicesConnector):
         data_fim: date,
         fonte_dado: FontesDadosEnum,
     ) -> ColetaIndiceCotacaoSchemaCollection:
-        headers = {"Content-Type": "application/x-www-form-urlencoded"}
-
         codigos_indices: list[str] = self.__get_enconded_codigos_tratados(
             self.__get_codigos_from_indices(indices)
         )
+        lotes_codigos: list[list[str]] = self.__get_lotes_codigos(codigos_indices)
+        janelas: list[tuple[date, date]] = self.__get_janelas(data_inicio, data_fim)
+
+        async with self.__client as client:
+            tabelas_janelas: list[list[dict]] = await asyncio.gather(
+                *[
+                    self.__fetch_janela(
+                        client=client,
+                        codigos_indices=lote_codigos,
+                        moeda=moeda.codigo,
+                        tipo_cotacao=tipo_cotacao,
+                        data_inicio=janela_inicio,
+                        data_fim=janela_fim,
+                    )
+                    for lote_codigos in lotes_codigos
+                    for janela_inicio, janela_fim in janelas
+                ]
+            )
+
+        is_sintetico: bool = tipo_cotacao == "retorno"
+        cotacoes: ColetaIndiceCotacaoSchemaCollection = (
+            ColetaIndiceCotacaoSchemaCollection([])
+        )
+        for i in range(len(lotes_codigos)):
+            # Une as janelas do lote em uma única tabela, na ordem das datas. Janelas
+            # sem cotações (ex.: anteriores ao início do índice) voltam vazias.
+            tabelas_lote: list[list[dict]] = [
+                tabela
+                for tabela in tabelas_janelas[i * len(janelas) : (i + 1) * len(janelas)]
+                if tabela
+            ]
+            if not tabelas_lote:
+                logging.warning(
+                    f"Nenhuma cotação retornada de {data_inicio} a {data_fim} "
+                    f"para os índices {', '.join(lotes_codigos[i])}."
+                )
+                continue
+
+            linhas_tabela: list[dict] = [tabelas_lote[0][0]] + [
+                linha for tabela in tabelas_lote for linha in tabela[1:]
+            ]
+
+            cotacoes.extend(
+                await self.__get_indices_cotacoes_from_response(
+                    indices_repository=indices_repository,
+                    linhas_tabela=linhas_tabela,
+                    indices=indices,
+                    data_inicio=data_inicio,
+                    fonte_dado=fonte_dado,
+                    moeda=moeda,
+                    is_sintetico=is_sintetico,
+                )
+            )
+
+        return cotacoes
+
+    def __get_janelas(self, data_inicio: date, data_fim: date) -> list[tuple[date, date]]:
+        """Divide o período em janelas de até COMDINHEIRO_JANELA_DIAS dias corridos."""
+        janelas: list[tuple[date, date]] = []
+        janela_inicio: date = data_inicio
+        while janela_inicio <= data_fim:
+            janela_fim: date = min(
+                janela_inicio + timedelta(days=self.__janela_dias - 1), data_fim
+            )
+            janelas.append((janela_inicio, janela_fim))
+            janela_inicio = janela_fim + timedelta(days=1)
+
+        return janelas or [(data_inicio, data_fim)]
+
+    def __get_lotes_codigos(self, codigos_indices: list[str]) -> list[list[str]]:
+        """Divide os códigos em lotes de até COMDINHEIRO_LOTE_INDICES índices."""
+        return [
+            codigos_indices[i : i + self.__lote_indices]
+            for i in range(0, len(codigos_indices), self.__lote_indices)
+        ] or [codigos_indices]
+
+    async def __fetch_janela(
+        self,
+        client: IntegrationApiClient,
+        codigos_indices: list[str],
+        moeda: str,
+        tipo_cotacao: Literal["preco", "retorno"],
+        data_inicio: date,
+        data_fim: date,
+    ) -> list[dict]:
+        """
+        Busca uma janela de cotações de um lote de índices, com novas tentativas em
+        falhas de rede, timeouts e erros 429/5xx.
+
+        Returns:
+            list[dict]: Linhas da tabela (metadados seguidos das cotações por data)
+        """
+        headers = {"Content-Type": "application/x-www-form-urlencoded"}
         body: dict[str, str] = self.__get_post_body(
             codigos_indices=codigos_indices,
-            moeda=moeda.codigo,
+            moeda=moeda,
             tipo_cotacao=tipo_cotacao,
             data_inicio=data_inicio,
             data_fim=data_fim,
         )
 
-        async with self.__client as client:
-            response: Response = await client.post(
-                endpoint="/v1/ep1/import-data",
-                params=None,
-                headers=headers,
-                body=body,
-            )
-            response.raise_for_status()
+        for tentativa in range(1, self.__tentativas + 1):
+            try:
+                async with self.__semaforo:
+                    await self.__aguardar_intervalo_requisicoes()
+                    response: Response = await client.post(
+                        endpoint="/v1/ep1/import-data",
+                        params=None,
+                        headers=headers,
+                        body=body,
+                    )
+                    response.raise_for_status()
 
-        is_sintetico: bool = tipo_cotacao == "retorno"
-        return await self.__get_indices_cotacoes_from_response(
-            indices_repository=indices_repository,
-            response=response,
-            indices=indices,
-            data_inicio=data_inicio,
-            fonte_dado=fonte_dado,
-            moeda=moeda,
-            is_sintetico=is_sintetico,
-        )
+                return list(response.json()["tables"]["tab1"].values())
+
+            except (TransportError, HTTPStatusError) as e:
+                retentavel: bool = not isinstance(e, HTTPStatusError) or (
+                    e.response.status_code == 429 or e.response.status_code >= 500
+                )
+                if not retentavel or tentativa == self.__tentativas:
+                    raise
+
+                logging.warning(
+                    f"Falha ao buscar cotações de {data_inicio} a {data_fim} "
+                    f"(tentativa {tentativa}/{self.__tentativas}): {e!r}"
+                )
+                await asyncio.sleep(2 ** (tentativa - 1))
+
+        raise RuntimeError("Número de tentativas deve ser maior que zero.")
+
+    async def __aguardar_intervalo_requisicoes(self) -> None:
+        """Espaça o início das requisições conforme COMDINHEIRO_REQUISICOES_POR_SEGUNDO."""
+        if self.__intervalo_requisicoes <= 0:
+            return
+
+        async with self.__lock_intervalo:
+            agora: float = monotonic()
+            espera: float = self.__proxima_requisicao - agora
+            if espera > 0:
+                await asyncio.sleep(espera)
+            self.__proxima_requisicao = max(agora, self.__proxima_requisicao) + (
+                self.__intervalo_requisicoes
+            )
 
     def __get_post_body(
         self,
@@ -205,108 +360,106 @@ class ComDinheiroApiConnector(IntegrationsIndicesConnector):
     def __get_enconded_codigos_tratados(self, codigos_indices: list[str]) -> list[str]:
         return list(map(lambda cod: cod.replace("+", "%BE"), codigos_indices))
 
+    def __get_tabela_cotacoes(
+        self, linhas_tabela: list[dict], indices: IndiceCollection
+    ) -> tuple[list[date], list[Indice], list[list[str]]]:
+        """Lê a tabela em colunas: datas, índice de cada coluna e valores por coluna."""
+        metadados_e_dados_cotacoes: list[dict] = linhas_tabela
+        cotacoes_metadados: dict = metadados_e_dados_cotacoes[0]
+        cotacoes_dados: list[dict] = metadados_e_dados_cotacoes[1:]
+
+        colunas: list[str] = [key for key in cotacoes_metadados if key != "col0"]
+        indices_colunas: list[Indice] = []
+        for key in colunas:
+            identificador_indice: str = cotacoes_metadados[key]
+            indice: Indice | None = indices.get_indice_by_fonte_dado_identificador(
+                nome_completo_fonte_dado=FontesDadosEnum.COMDINHEIRO_API.value,
+                codigo_identificador=identificador_indice,
+            )
+            if indice is None:
+                raise ValueError(
+                    f'Índice de código identificador "{identificador_indice}" não encontrado. Nesse ponto do código, deveria ser garantido que o índice é encontrado.'
+                )
+            indices_colunas.append(indice)
+
+        datas: list[date] = [
+            datetime.strptime(linha["col0"], "%d/%m/%Y").date() for linha in cotacoes_dados
+        ]
+        valores_colunas: list[list[str]] = [
+            [
+                linha.get(key, "nd").replace(",", ".").replace(" ", "")
+                for linha in cotacoes_dados
+            ]
+            for key in colunas
+        ]
+
+        return datas, indices_colunas, valores_colunas
+
     async def __get_indices_cotacoes_from_response(
         self,
         indices_repository: IndicesRepository,
-        response: Response,
+        linhas_tabela: list[dict],
         indices: IndiceCollection,
         data_inicio: date,
         fonte_dado: FontesDadosEnum,
         moeda: Moeda,
         is_sintetico: bool,
     ) -> ColetaIndiceCotacaoSchemaCollection:
-        response_json = response.json()
-        tab1: dict = response_json["tables"]["tab1"]
+        datas, indices_colunas, valores_colunas = self.__get_tabela_cotacoes(
+            linhas_tabela=linhas_tabela, indices=indices
+        )
+        datas_np = np.asarray(datas, dtype="datetime64[D]")
 
-        metadados_e_dados_cotacoes: list[dict] = []
-        for linha in tab1.values():
-            metadados_e_dados_cotacoes.append(linha)
+        calendario: CalendarioDiasUteis = get_calendario_b3()
+        data_hoje: date = datetime.today().date()
+
+        # Linhas válidas de cada coluna: com valor e dentro do período de coleta do índice
+        linhas_validas_colunas: list[npt.NDArray[np.bool_]] = []
+        for indice, valores in zip(indices_colunas, valores_colunas):
+            data_ultima_cotacao: date = calendario.get_data_d_util_menos_x_dias(
+                x_dias=indice.atraso_coleta_dias,
+                data_input=data_hoje,
+            )
+            data_inicio_coleta = np.datetime64(indice.data_inicio_coleta, "D")
+            linhas_validas = (
+                (np.asarray(valores) != "nd")
+                & (datas_np <= np.datetime64(data_ultima_cotacao, "D"))
+                & (
+                    datas_np > data_inicio_coleta
+                    if is_sintetico
+                    else datas_np >= data_inicio_coleta
+                )
+            )
+            linhas_validas_colunas.append(linhas_validas)
+
+        if is_sintetico:
+            precos_colunas = await self.__get_precos_sinteticos(
+                indices_repository=indices_repository,
+                calendario=calendario,
+                datas_np=datas_np,
+                data_inicio=data_inicio,
+                indices_colunas=indices_colunas,
+                valores_colunas=valores_colunas,
+                linhas_validas_colunas=linhas_validas_colunas,
+            )
+        else:
+            precos_colunas = [
+                {
+                    linha: self.__get_cotacao(valores[linha])
+                    for linha in np.flatnonzero(linhas_validas).tolist()
+                }
+                for valores, linhas_validas in zip(valores_colunas, linhas_validas_colunas)
+            ]
 
-        cotacoes_metadados: dict = metadados_e_dados_cotacoes[0]
-        cotacoes_dados: list[dict] = metadados_e_dados_cotacoes[1:]
         cotacoes: ColetaIndiceCotacaoSchemaCollection = (
             ColetaIndiceCotacaoSchemaCollection([])
         )
-
-        for i in range(len(cotacoes_dados)):
-            linha_cotacoes = cotacoes_dados[i]
-            data_referente: date = datetime.strptime(
-                linha_cotacoes.pop("col0"), "%d/%m/%Y"
-            ).date()
-            for key in linha_cotacoes:
-                identificador_indice: str = cotacoes_metadados[key]
-                indice: Indice | None = indices.get_indice_by_fonte_dado_identificador(
-                    nome_completo_fonte_dado=FontesDadosEnum.COMDINHEIRO_API.value,
-                    codigo_identificador=identificador_indice,
-                )
-                if indice is None:
-                    raise ValueError(
-                        f'Índice de código identificador "{identificador_indice}" não encontrado. Nesse ponto do código, deveria ser garantido que o índice é encontrado.'
-                    )
-                valor_str: str = linha_cotacoes[key].replace(",", ".").replace(" ", "")
-
-                data_ultima_cotacao: date = (
-                    CalculosService.get_data_d_util_menos_x_dias(
-                        x_dias=indice.atraso_coleta_dias,
-                        data_input=datetime.today().date(),
-                        feriados=feriados,
-                    )
-                )
-                if (
-                    valor_str == "nd"
-                    or data_referente < indice.data_inicio_coleta
-                    or data_referente > data_ultima_cotacao
-                ):
+        for linha, data_referente in enumerate(datas):
+            for indice, precos in zip(indices_colunas, precos_colunas):
+                preco_cotacao: Decimal | None = precos.get(linha)
+                if preco_cotacao is None:
                     continue
 
-                if is_sintetico:
-                    indice_data_inicio_coleta_d1: date = (
-                        CalculosService.get_data_d_util_mais_x_dias(
-                            x_dias=1,
-                            data_input=indice.data_inicio_coleta,
-                        )
-                    )
-                    if data_referente <= indice.data_inicio_coleta:
-                        continue
-                    elif (
-                        data_referente == data_inicio
-                        or data_referente == indice_data_inicio_coleta_d1
-                    ):
-                        indice_cotacao_base: IndiceCotacao | None = (
-                            await indices_repository.get_cotacao(
-                                indice_id=indice.id,
-                                data_referente=CalculosService.get_data_d_util_menos_x_dias(
-                                    x_dias=1,
-                                    data_input=data_referente,
-                                    feriados=feriados,
-                                ),
-                            )
-                        )
-                        if indice_cotacao_base is None:
-                            raise ValueError(
-                                f'Índice de código identificador "{identificador_indice}" possui pelo menos uma cotação em dia útil válido faltante. Insira no Banco de Dados todas as cotações referente ao período.'
-                            )
-                        preco_cotacao: Decimal = self.__get_cotacao_sintetica(
-                            cotacao_base=indice_cotacao_base.cotacao,
-                            retorno_str=valor_str,
-                        )
-                    else:
-                        cotacao_base: ColetaIndiceCotacaoSchema | None = (
-                            cotacoes.get_indice_ultima_cotacao(indice.nome)
-                        )
-                        if cotacao_base is None:
-                            raise ValueError(
-                                f'Índice de código identificador "{identificador_indice}" possui pelo menos uma cotação em dia útil válido faltante. Esse índice deveria ter sido enconrtado no array de cotações.'
-                            )
-                        preco_cotacao: Decimal = self.__get_cotacao_sintetica(
-                            cotacao_base=cotacao_base.cotacao, retorno_str=valor_str
-                        )
-                else:
-                    cotacao_str: str = (
-                        linha_cotacoes[key].replace(",", ".").replace(" ", "")
-                    )
-                    preco_cotacao: Decimal = self.__get_cotacao(cotacao_str)
-
                 cotacao: ColetaIndiceCotacaoSchema = ColetaIndiceCotacaoSchema(
                     data_referente=data_referente,
                     nome_indice=indice.nome,
@@ -318,6 +471,110 @@ class ComDinheiroApiConnector(IntegrationsIndicesConnector):
 
         return cotacoes
 
+    async def __get_precos_sinteticos(
+        self,
+        indices_repository: IndicesRepository,
+        calendario: CalendarioDiasUteis,
+        datas_np: npt.NDArray[np.datetime64],
+        data_inicio: date,
+        indices_colunas: list[Indice],
+        valores_colunas: list[list[str]],
+        linhas_validas_colunas: list[npt.NDArray[np.bool_]],
+    ) -> list[dict[int, Decimal]]:
+        """
+        Converte os retornos diários dos índices sintéticos em preços.
+
+        Cada coluna é dividida em segmentos que começam no início do período
+        consultado ou no primeiro dia útil após o início da coleta do índice.
+        O preço base de cada segmento é a cotação do dia útil anterior, buscada no
+        banco em uma única consulta para todos os índices, e os preços do segmento
+        são o produto acumulado de (1 + retorno) sobre essa base.
+        """
+        data_inicio_np = np.datetime64(data_inicio, "D")
+
+        inicios_segmentos_colunas: list[npt.NDArray[np.bool_]] = []
+        chaves_cotacoes_base: set[tuple[int, date]] = set()
+        for indice, linhas_validas in zip(indices_colunas, linhas_validas_colunas):
+            indice_data_inicio_coleta_d1: date = calendario.get_data_d_util_mais_x_dias(
+                x_dias=1,
+                data_input=indice.data_inicio_coleta,
+            )
+            inicios_segmentos = linhas_validas & (
+                (datas_np == data_inicio_np)
+                | (datas_np == np.datetime64(indice_data_inicio_coleta_d1, "D"))
+            )
+            inicios_segmentos_colunas.append(inicios_segmentos)
+
+            datas_base = calendario.adicionar_dias_uteis(datas_np[inicios_segmentos], -1)
+            chaves_cotacoes_base.update(
+                (indice.id, data_base) for data_base in datas_base.astype(object).tolist()
+            )
+
+        cotacoes_base: dict[tuple[int, date], Decimal] = {}
+        if chaves_cotacoes_base:
+            cotacoes_base = {
+                (cotacao.indice_id, cotacao.data_referente): cotacao.cotacao
+                for cotacao in await indices_repository.lista_cotacoes_by_indices_datas(
+                    indices_datas=list(chaves_cotacoes_base)
+                )
+            }
+
+        precos_colunas: list[dict[int, Decimal]] = []
+        for indice, valores, linhas_validas, inicios_segmentos in zip(
+            indices_colunas, valores_colunas, linhas_validas_colunas, inicios_segmentos_colunas
+        ):
+            linhas: list[int] = np.flatnonzero(linhas_validas).tolist()
+            precos: dict[int, Decimal] = {}
+            precos_colunas.append(precos)
+            if not linhas:
+                continue
+
+            inicios: npt.NDArray[np.bool_] = inicios_segmentos[linhas]
+            if not inicios[0]:
+                raise ValueError(
+                    f'Índice de código identificador "{self.__get_codigo_identificador(indice)}" possui pelo menos uma cotação em dia útil válido faltante. Esse índice deveria ter sido enconrtado no array de cotações.'
+                )
+
+            for segmento in np.split(np.arange(len(linhas)), np.flatnonzero(inicios)[1:]):
+                linhas_segmento: list[int] = [linhas[posicao] for posicao in segmento.tolist()]
+                data_base: date = calendario.get_data_d_util_menos_x_dias(
+                    x_dias=1,
+                    data_input=datas_np[linhas_segmento[0]].item(),
+                )
+                cotacao_base: Decimal | None = cotacoes_base.get((indice.id, data_base))
+                if cotacao_base is None:
+                    raise ValueError(
+                        f'Índice de código identificador "{self.__get_codigo_identificador(indice)}" possui pelo menos uma cotação em dia útil válido faltante. Insira no Banco de Dados todas as cotações referente ao período.'
+                    )
+
+                retornos: list[str] = [valores[linha] for linha in linhas_segmento]
+                precos.update(
+                    zip(linhas_segmento, self.__get_cotacoes_sinteticas(cotacao_base, retornos))
+                )
+
+        return precos_colunas
+
+    def __get_cotacoes_sinteticas(
+        self, cotacao_base: Decimal, retornos_str: list[str]
+    ) -> list[Decimal]:
+        """Compõe os retornos diários sobre a cotação base, na ordem das datas."""
+        if self.__compor_sinteticos_decimal:
+            return list(
+                accumulate(retornos_str, self.__get_cotacao_sintetica, initial=cotacao_base)
+            )[1:]
+
+        # Rent = (ValorFinal - ValorInicial) / ValorInicial
+        # ValorFinal = ValorInicial * produto(Rent + 1) ao longo dos dias
+        fatores = np.asarray(retornos_str, dtype=np.float64) + 1
+        precos = float(cotacao_base) * np.cumprod(fatores)
+        return [Decimal(repr(preco)) for preco in precos.tolist()]
+
+    def __get_codigo_identificador(self, indice: Indice) -> str | None:
+        identificador: IndiceIdentificador | None = indice.get_identificador_by_fonte_dado(
+            FontesDadosEnum.COMDINHEIRO_API
+        )
+        return identificador.codigo if identificador else None
+
     def __get_cotacao_sintetica(
         self, cotacao_base: Decimal, retorno_str: str
     ) -> Decimal:
@@ -54,9 +54,9 @@ class LeitorDocumentosApiClient(IntegrationApiClient):
             raise IntegrationApiClientNotOpenException(api_name="LeitorDocumentosAPI")
 
         try:
-            # Preparar arquivo para upload
-            file_content = await arquivo.read()
-            files = {"file": (arquivo.filename, file_content, arquivo.content_type)}
+            # Envia o objeto de arquivo: o httpx lê e transmite em blocos, sem carregar
+            # o arquivo inteiro em memória
+            files = {"file": (arquivo.filename, arquivo.file, arquivo.content_type)}
 
             # Headers padrão
             if headers is None:
@@ -90,8 +90,44 @@ class LeitorDocumentosApiClient(IntegrationApiClient):
         headers: dict[str, str] | None = None,
         body: dict[str, str] | None = None,
     ) -> Response:
-        """Método POST padrão não implementado para este client."""
-        raise NotImplementedError("Use post_with_file para envio de arquivos")
+        """
+        Envia um corpo JSON via POST para o endpoint especificado.
+
+        Args:
+            endpoint: Endpoint da API
+            params: Parâmetros de query string
+            headers: Headers HTTP
+            body: Corpo da requisição, enviado como JSON
+
+        Returns:
+            Response: Resposta da requisição
+
+        Raises:
+            IntegrationApiClientNotOpenException: Se client não estiver aberto
+            Exception: Para outros erros de requisição
+        """
+        if self.__client is None or self.__client.is_closed:
+            raise IntegrationApiClientNotOpenException(api_name="LeitorDocumentosAPI")
+
+        try:
+            default_headers = {
+                "accept": "application/json",
+            }
+            default_headers.update(headers or {})
+
+            response: Response = await self.__client.post(
+                super()._get_endpoint_tratado(endpoint),
+                headers=default_headers,
+                params=params,
+                json=body,
+            )
+
+            response.raise_for_status()
+
+            return response
+
+        except Exception as e:
+            raise Exception(f"Erro ao enviar requisição: {str(e)}")
 
     async def get(
         self,
@@ -100,7 +136,7 @@ class LeitorDocumentosApiClient(IntegrationApiClient):
         headers: dict[str, str] | None = None,
     ) -> Response:
         """Método GET não implementado para este client."""
-        raise NotImplementedError("Este client é específico para upload de arquivos")
+        raise NotImplementedError("Este client é específico para extração de documentos")
 
     async def close(self) -> None:
         if self.__client and not self.__client.is_closed:
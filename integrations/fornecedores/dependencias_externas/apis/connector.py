@@ -1,9 +1,14 @@
+import mimetypes
+from os import getenv
+from pathlib import Path
+
 from fastapi import UploadFile
 from httpx import Response
 from modules.integrations.api.client import IntegrationApiClient
 from modules.integrations.api.client_factory import IntegrationApiClientFactory
 from modules.integrations.connectors import DocumentConnector
 from modules.integrations.enums import FerramentaExtracaoEnum, FontesDadosEnum, TipoExtracaoEnum
+from starlette.datastructures import Headers
 
 
 class LeitorDocumentosApiConnector(DocumentConnector):
@@ -49,6 +54,84 @@ class LeitorDocumentosApiConnector(DocumentConnector):
         # Processar resposta
         return self._process_response(response)
 
+    async def extract_document_content_from_path(
+        self,
+        caminho: Path,
+        ferramenta_extracao: FerramentaExtracaoEnum,
+        tipo_extracao: TipoExtracaoEnum,
+    ) -> str:
+        """
+        Extrai conteúdo de um arquivo local usando a API do Leitor de Documentos.
+
+        Se o arquivo estiver no diretório compartilhado com a API
+        (DEPENDENCIAS_EXTERNAS_SHARED_DIR), envia apenas o caminho relativo e a API
+        lê o arquivo diretamente. Caso contrário, o arquivo é enviado em streaming,
+        sem ser carregado inteiro em memória.
+
+        Args:
+            caminho: Caminho do arquivo local
+            ferramenta_extracao: Ferramenta a ser usada para extração
+            tipo_extracao: Tipo de extração desejado
+
+        Returns:
+            str: Conteúdo extraído do documento
+
+        Raises:
+            ValueError: Se combinação não for suportada
+            Exception: Para outros erros de processamento
+        """
+        caminho_compartilhado = self._get_caminho_compartilhado(caminho)
+        if caminho_compartilhado is not None:
+            body = {
+                "caminho": caminho_compartilhado,
+                "tipo_extracao": tipo_extracao.value,
+            }
+            if ferramenta_extracao:
+                body["ferramenta_extracao"] = ferramenta_extracao.value
+
+            async with self.__client as client:
+                response: Response = await client.post(
+                    endpoint="/leitor-documentos/extrair-por-caminho",
+                    body=body,
+                )
+
+            return self._process_response(response)
+
+        content_type = mimetypes.guess_type(caminho.name)[0] or "application/octet-stream"
+        with open(caminho, "rb") as f:
+            arquivo = UploadFile(
+                filename=caminho.name,
+                file=f,
+                headers=Headers({"content-type": content_type}),
+            )
+            return await self.extract_document_content(
+                arquivo=arquivo,
+                ferramenta_extracao=ferramenta_extracao,
+                tipo_extracao=tipo_extracao,
+            )
+
+    def _get_caminho_compartilhado(self, caminho: Path) -> str | None:
+        """
+        Retorna o caminho do arquivo relativo ao diretório compartilhado com a API.
+
+        Args:
+            caminho: Caminho do arquivo local
+
+        Returns:
+            str | None: Caminho relativo, ou None se o diretório compartilhado não
+                estiver configurado ou o arquivo estiver fora dele
+        """
+        diretorio_compartilhado = getenv("DEPENDENCIAS_EXTERNAS_SHARED_DIR")
+        if not diretorio_compartilhado:
+            return None
+
+        caminho_absoluto = caminho.resolve()
+        diretorio = Path(diretorio_compartilhado).resolve()
+        if not caminho_absoluto.is_relative_to(diretorio):
+            return None
+
+        return caminho_absoluto.relative_to(diretorio).as_posix()
+
     def _get_endpoint_and_params(
         self, ferramenta: FerramentaExtracaoEnum, tipo: TipoExtracaoEnum
     ) -> tuple[str, dict[str, str] | None]:
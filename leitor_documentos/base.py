@@ -1,9 +1,14 @@
+import threading
 from abc import abstractmethod
 from pathlib import Path
 from typing import cast
 
 from autoregistry import Registry
 
+# Instâncias únicas por classe de extractor no processo
+_instances: dict[type, "DocumentExtractor"] = {}
+_instances_lock = threading.Lock()
+
 
 class DocumentExtractor(Registry, suffix="Extractor"):
     """Classe base para todos os extractors de documentos"""
@@ -35,6 +40,28 @@ class DocumentExtractor(Registry, suffix="Extractor"):
         """Lista de extensões suportadas pelo extractor"""
         raise NotImplementedError()
 
+    @property
+    def version(self) -> str:
+        """Versão do extractor, usada para invalidar resultados em cache"""
+        return "1"
+
+    def warm_up(self) -> None:
+        """Carrega antecipadamente os recursos pesados do extractor (modelos, etc.)"""
+
+    @staticmethod
+    def get_instance(extractor_class: type) -> "DocumentExtractor":
+        """
+        Obtém a instância única da classe de extractor no processo,
+        criando-a no primeiro uso.
+        """
+        instance = _instances.get(extractor_class)
+        if instance is None:
+            with _instances_lock:
+                instance = _instances.get(extractor_class)
+                if instance is None:
+                    instance = _instances[extractor_class] = extractor_class()
+        return instance
+
     @classmethod
     def get_extractor(
         cls, extension: str, tool: str = "docling"
@@ -44,4 +71,12 @@ class DocumentExtractor(Registry, suffix="Extractor"):
         A ferramenta padrão é 'docling'.
         """
         key = f"{extension}{tool}"
-        return cast(DocumentExtractor, cls[key]())
+        return cast(DocumentExtractor, cls.get_instance(cls[key]))
+
+    @classmethod
+    def warm_up_defaults(cls, extensions: tuple[str, ...] = ("pdf", "docx")) -> None:
+        """
+        Instancia e aquece os extractors padrão das extensões informadas.
+        """
+        for extension in extensions:
+            cls.get_extractor(extension).warm_up()
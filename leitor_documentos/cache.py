@@ -0,0 +1,216 @@
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+# Adicionar o diretório raiz ao path para imports
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from logger import leitor_logger as logger
+
+# Tamanho dos blocos lidos ao calcular o hash do arquivo
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def compute_file_hash(file_path: Path) -> str:
+    """
+    Calcula o SHA-256 do conteúdo de um arquivo, lendo-o em blocos.
+
+    Args:
+        file_path (Path): Caminho do arquivo
+
+    Returns:
+        str: Digest hexadecimal do arquivo
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """
+    Cache persistente em disco de resultados de extração.
+
+    As entradas são endereçadas pelo conteúdo: a chave combina o SHA-256 do
+    arquivo com o nome e a versão do extractor e o formato extraído. Entradas
+    expiram por TTL e as menos usadas recentemente são removidas quando o
+    tamanho total ultrapassa o limite configurado.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path | None = None,
+        max_size: int | None = None,
+        ttl_hours: float | None = None,
+        enabled: bool | None = None,
+    ):
+        """
+        Inicializa o cache usando variáveis de ambiente como padrão.
+
+        Args:
+            cache_dir (Path | None): Diretório das entradas
+                (LEITOR_DOCS_CACHE_DIR, padrão: files/cache)
+            max_size (int | None): Tamanho máximo em bytes
+                (LEITOR_DOCS_CACHE_MAX_SIZE, padrão: 500MB)
+            ttl_hours (float | None): Validade das entradas em horas
+                (LEITOR_DOCS_CACHE_TTL_HOURS, padrão: 168)
+            enabled (bool | None): Se o cache está ativo
+                (LEITOR_DOCS_CACHE_ENABLED, padrão: true)
+        """
+        if cache_dir is None:
+            cache_dir = Path(os.getenv("LEITOR_DOCS_CACHE_DIR", "files/cache"))
+        if max_size is None:
+            max_size = int(os.getenv("LEITOR_DOCS_CACHE_MAX_SIZE", str(500 * 1024 * 1024)))
+        if ttl_hours is None:
+            ttl_hours = float(os.getenv("LEITOR_DOCS_CACHE_TTL_HOURS", "168"))
+        if enabled is None:
+            enabled = os.getenv("LEITOR_DOCS_CACHE_ENABLED", "true").lower() == "true"
+
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.ttl_seconds = ttl_hours * 3600
+        self.enabled = enabled
+
+    @staticmethod
+    def build_key(
+        file_hash: str, extractor_name: str, content_format: str, extractor_version: str
+    ) -> str:
+        """
+        Monta a chave da entrada a partir do conteúdo e da configuração da extração.
+
+        Args:
+            file_hash (str): SHA-256 do arquivo
+            extractor_name (str): Nome do extractor
+            content_format (str): Formato extraído ('markdown', 'raw' ou 'images')
+            extractor_version (str): Versão do extractor
+
+        Returns:
+            str: Chave hexadecimal da entrada
+        """
+        raw_key = "|".join([file_hash, extractor_name, content_format, extractor_version])
+        return hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> dict | None:
+        """
+        Busca uma entrada válida no cache.
+
+        Args:
+            key (str): Chave da entrada
+
+        Returns:
+            dict | None: Dados da entrada ou None se ausente/expirada
+        """
+        if not self.enabled:
+            return None
+
+        entry_path = self._entry_path(key)
+        try:
+            stat = entry_path.stat()
+            current_time = time.time()
+            if current_time - stat.st_mtime > self.ttl_seconds:
+                entry_path.unlink(missing_ok=True)
+                return None
+
+            entry = json.loads(entry_path.read_text(encoding="utf-8"))
+
+            # mtime marca a gravação (TTL) e atime o último acesso (LRU)
+            os.utime(entry_path, (current_time, stat.st_mtime))
+            return entry
+
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Entrada de cache inválida {}: {}", entry_path.name, str(e))
+            entry_path.unlink(missing_ok=True)
+            return None
+
+    def set(self, key: str, entry: dict) -> None:
+        """
+        Grava uma entrada no cache e aplica a política de remoção.
+
+        Args:
+            key (str): Chave da entrada
+            entry (dict): Dados serializáveis em JSON
+        """
+        if not self.enabled:
+            return
+
+        entry_path = self._entry_path(key)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+            # Escrita atômica para não expor entradas parciais
+            tmp_path = entry_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp_path, entry_path)
+
+            self.evict()
+
+        except OSError as e:
+            logger.warning("Erro ao gravar entrada de cache: {}", str(e))
+
+    def evict(self) -> int:
+        """
+        Remove entradas expiradas e, se necessário, as menos usadas recentemente
+        até que o tamanho total fique dentro do limite.
+
+        Returns:
+            int: Número de entradas removidas
+        """
+        if not self.cache_dir.exists():
+            return 0
+
+        removed_count = 0
+        current_time = time.time()
+        entries = []
+
+        for entry_path in self.cache_dir.glob("*.json"):
+            try:
+                stat = entry_path.stat()
+            except FileNotFoundError:
+                continue
+
+            if current_time - stat.st_mtime > self.ttl_seconds:
+                entry_path.unlink(missing_ok=True)
+                removed_count += 1
+            else:
+                entries.append((stat.st_atime, stat.st_size, entry_path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, entry_path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            entry_path.unlink(missing_ok=True)
+            total_size -= size
+            removed_count += 1
+
+        return removed_count
+
+    def clear(self) -> int:
+        """
+        Remove todas as entradas do cache.
+
+        Returns:
+            int: Número de entradas removidas
+        """
+        removed_count = 0
+        if not self.cache_dir.exists():
+            return removed_count
+
+        for entry_path in self.cache_dir.glob("*.json"):
+            entry_path.unlink(missing_ok=True)
+            removed_count += 1
+
+        logger.info("Cache de extração limpo. {} entrada(s) removida(s)", removed_count)
+        return removed_count
+
+
+# Instância compartilhada pelo serviço e pelo endpoint de limpeza
+extraction_cache = ExtractionCache()
@@ -28,6 +28,13 @@ class ExtractionTimeoutException(DocumentExtractionException):
         super().__init__(message, error_code)
 
 
+class ExtractionQueueFullException(DocumentExtractionException):
+    """Pool de extração sem capacidade para novas requisições"""
+
+    def __init__(self, message: str, error_code: str = "EXTRACTION_QUEUE_FULL") -> None:
+        super().__init__(message, error_code)
+
+
 class FileSizeException(DocumentExtractionException):
     """Arquivo muito grande para processamento"""
 
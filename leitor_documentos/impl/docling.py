@@ -1,16 +1,60 @@
 import sys
+from importlib import metadata
 from pathlib import Path
 
 # Adicionar o diretório raiz ao path para imports
 sys.path.append(str(Path(__file__).parent.parent.parent.parent))
 
-from docling.document_converter import DocumentConverter
+from docling.datamodel.base_models import InputFormat
+from docling.datamodel.pipeline_options import PdfPipelineOptions
+from docling.document_converter import DocumentConverter, PdfFormatOption
+from docling_core.types.doc import TextItem
 from logger import leitor_logger as logger
 
 from ..base import DocumentExtractor
 from ..exceptions import DocumentExtractionException, FileNotFoundException
 
 
+def _create_image_converter(input_format: InputFormat) -> DocumentConverter:
+    """
+    Cria converter com geração de imagens de página para extração de texto de imagens.
+
+    Args:
+        input_format (InputFormat): Formato de entrada configurado
+
+    Returns:
+        DocumentConverter: Converter configurado
+    """
+    pipeline_options = PdfPipelineOptions()
+    pipeline_options.images_scale = 2
+    pipeline_options.generate_page_images = True
+
+    return DocumentConverter(
+        format_options={input_format: PdfFormatOption(pipeline_options=pipeline_options)}
+    )
+
+
+def _extract_picture_text(conv_res) -> str:
+    """
+    Junta os textos contidos nas imagens de um documento convertido.
+
+    Args:
+        conv_res: Resultado da conversão do Docling
+
+    Returns:
+        str: Textos das imagens separados por quebra de linha
+    """
+    doc = conv_res.document
+
+    text = []
+    for picture in getattr(doc, "pictures", []):
+        for item, level in doc.iterate_items(root=picture, traverse_pictures=True):
+            if isinstance(item, TextItem):
+                text.append(item.text)
+
+    return "\n".join(text)
+
+
 class PDFDoclingExtractor(DocumentExtractor):
     """
     Extrator PDF usando Docling - melhor qualidade.
@@ -19,6 +63,7 @@ class PDFDoclingExtractor(DocumentExtractor):
 
     def __init__(self):
         self.converter = DocumentConverter()
+        self._image_converter: DocumentConverter | None = None
 
     @property
     def name(self) -> str:
@@ -28,6 +73,24 @@ class PDFDoclingExtractor(DocumentExtractor):
     def supported_extensions(self) -> list[str]:
         return ["pdf"]
 
+    @property
+    def version(self) -> str:
+        return metadata.version("docling")
+
+    def _get_image_converter(self) -> DocumentConverter:
+        """Converter de imagens, criado uma única vez por instância"""
+        if self._image_converter is None:
+            self._image_converter = _create_image_converter(InputFormat.PDF)
+        return self._image_converter
+
+    def warm_up(self) -> None:
+        """Inicializa os pipelines do Docling, carregando os modelos em memória"""
+        try:
+            self.converter.initialize_pipeline(InputFormat.PDF)
+            self._get_image_converter().initialize_pipeline(InputFormat.PDF)
+        except Exception as e:
+            logger.warning("Falha ao pré-carregar {}: {}", self.name, str(e))
+
     def extract_raw_data(self, file_path: Path) -> str:
         """
         Extrai texto bruto de um PDF usando Docling.
@@ -80,6 +143,45 @@ class PDFDoclingExtractor(DocumentExtractor):
             logger.error("Erro na extração markdown: {}", str(e))
             raise DocumentExtractionException(f"Erro ao extrair dados do PDF: {str(e)}")
 
+    def extract_pages_to_markdown(
+        self, file_path: Path, start_page: int, end_page: int
+    ) -> list[tuple[int, str]]:
+        """
+        Converte um intervalo de páginas do PDF para markdown, página a página.
+
+        Args:
+            file_path (Path): Caminho para o arquivo PDF
+            start_page (int): Primeira página do intervalo (a partir de 1)
+            end_page (int): Última página do intervalo (inclusiva)
+
+        Returns:
+            list[tuple[int, str]]: Número da página e markdown de cada página
+
+        Raises:
+            FileNotFoundException: Se o arquivo não for encontrado
+            DocumentExtractionException: Se houver erro na extração
+        """
+        if not file_path.exists():
+            raise FileNotFoundException(f"Arquivo não encontrado: {file_path}")
+
+        try:
+            conv_result = self.converter.convert(
+                str(file_path), page_range=(start_page, end_page)
+            )
+            document = conv_result.document
+            return [
+                (page_no, document.export_to_markdown(page_no=page_no))
+                for page_no in range(start_page, end_page + 1)
+            ]
+
+        except Exception as e:
+            logger.error(
+                "Erro na extração markdown das páginas {}-{}: {}", start_page, end_page, str(e)
+            )
+            raise DocumentExtractionException(
+                f"Erro ao extrair páginas {start_page}-{end_page} do PDF: {str(e)}"
+            )
+
     def extract_image_data(self, file_path: Path) -> str:
         """
         Extrai texto de imagens em um PDF usando Docling.
@@ -95,36 +197,11 @@ class PDFDoclingExtractor(DocumentExtractor):
             DocumentExtractionException: Se houver erro na extração
         """
         try:
-            from docling.datamodel.base_models import InputFormat
-            from docling.datamodel.pipeline_options import PdfPipelineOptions
-            from docling.document_converter import DocumentConverter, PdfFormatOption
-            from docling_core.types.doc import TextItem
-
             if not file_path.exists():
                 raise FileNotFoundException(f"Arquivo não encontrado: {file_path}")
 
-            pipeline_options = PdfPipelineOptions()
-            pipeline_options.images_scale = 2
-            pipeline_options.generate_page_images = True
-
-            doc_converter = DocumentConverter(
-                format_options={
-                    InputFormat.PDF: PdfFormatOption(pipeline_options=pipeline_options)
-                }
-            )
-            conv_res = doc_converter.convert(str(file_path))
-            doc = conv_res.document
-
-            text = []
-            for picture in getattr(doc, "pictures", []):
-                for item, level in doc.iterate_items(
-                    root=picture, traverse_pictures=True
-                ):
-                    if isinstance(item, TextItem):
-                        text.append(item.text)
-
-            extracted_text = "\n".join(text)
-            return extracted_text
+            conv_res = self._get_image_converter().convert(str(file_path))
+            return _extract_picture_text(conv_res)
 
         except Exception as e:
             logger.error("Erro na extração de imagens: {}", str(e))
@@ -141,6 +218,7 @@ class DOCXDoclingExtractor(DocumentExtractor):
 
     def __init__(self):
         self.converter = DocumentConverter()
+        self._image_converter: DocumentConverter | None = None
 
     @property
     def name(self) -> str:
@@ -150,6 +228,24 @@ class DOCXDoclingExtractor(DocumentExtractor):
     def supported_extensions(self) -> list[str]:
         return ["docx"]
 
+    @property
+    def version(self) -> str:
+        return metadata.version("docling")
+
+    def _get_image_converter(self) -> DocumentConverter:
+        """Converter de imagens, criado uma única vez por instância"""
+        if self._image_converter is None:
+            self._image_converter = _create_image_converter(InputFormat.DOCX)
+        return self._image_converter
+
+    def warm_up(self) -> None:
+        """Inicializa os pipelines do Docling, carregando os modelos em memória"""
+        try:
+            self.converter.initialize_pipeline(InputFormat.DOCX)
+            self._get_image_converter().initialize_pipeline(InputFormat.DOCX)
+        except Exception as e:
+            logger.warning("Falha ao pré-carregar {}: {}", self.name, str(e))
+
     def extract_raw_data(self, file_path: Path) -> str:
         """
         Extrai texto bruto de um DOCX usando Docling.
@@ -221,36 +317,11 @@ class DOCXDoclingExtractor(DocumentExtractor):
             DocumentExtractionException: Se houver erro na extração
         """
         try:
-            from docling.datamodel.base_models import InputFormat
-            from docling.datamodel.pipeline_options import PdfPipelineOptions
-            from docling.document_converter import DocumentConverter, PdfFormatOption
-            from docling_core.types.doc import TextItem
-
             if not file_path.exists():
                 raise FileNotFoundException(f"Arquivo não encontrado: {file_path}")
 
-            pipeline_options = PdfPipelineOptions()
-            pipeline_options.images_scale = 2
-            pipeline_options.generate_page_images = True
-
-            doc_converter = DocumentConverter(
-                format_options={
-                    InputFormat.DOCX: PdfFormatOption(pipeline_options=pipeline_options)
-                }
-            )
-            conv_res = doc_converter.convert(str(file_path))
-            doc = conv_res.document
-
-            text = []
-            for picture in getattr(doc, "pictures", []):
-                for item, level in doc.iterate_items(
-                    root=picture, traverse_pictures=True
-                ):
-                    if isinstance(item, TextItem):
-                        text.append(item.text)
-
-            extracted_text = "\n".join(text)
-            return extracted_text
+            conv_res = self._get_image_converter().convert(str(file_path))
+            return _extract_picture_text(conv_res)
 
         except Exception as e:
             logger.error("Erro na extração de imagens: {}", str(e))
@@ -0,0 +1,395 @@
+import asyncio
+import itertools
+import multiprocessing
+import os
+import signal
+import sys
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable
+
+# Adicionar o diretório raiz ao path para imports
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from logger import leitor_logger as logger
+
+from .base import DocumentExtractor
+from .exceptions import (
+    DocumentExtractionException,
+    ExtractionQueueFullException,
+    ExtractionTimeoutException,
+)
+from .schema import ExtractionServiceResponse
+from .service import LeitorDocumentosService
+from .utils import get_pdf_page_count, split_page_ranges
+
+# Serviço mantido por cada processo worker durante toda a sua vida
+_worker_service: LeitorDocumentosService | None = None
+
+# Fila em que cada worker informa (id da tarefa, PID) ao iniciar uma tarefa
+_worker_job_starts: Any = None
+
+
+class _JobDeadlineExceeded(BaseException):
+    """
+    Prazo de uma tarefa esgotado dentro do worker.
+
+    Deriva de BaseException para não ser capturada pelos `except Exception` das
+    rotinas de extração e chegar ao processo principal como timeout.
+    """
+
+
+def _init_worker(job_starts: Any) -> None:
+    """Inicializa o processo worker carregando os extractors padrão."""
+    global _worker_service, _worker_job_starts
+    _worker_job_starts = job_starts
+    _worker_service = LeitorDocumentosService()
+    DocumentExtractor.warm_up_defaults()
+
+
+def _raise_deadline_exceeded(signum, frame) -> None:
+    raise _JobDeadlineExceeded()
+
+
+def _run_job(job_id: int, deadline: float, func: Callable, *args):
+    """
+    Executa uma tarefa no worker, informando o PID e interrompendo-a no prazo.
+
+    O prazo é aplicado com SIGALRM, que interrompe o código Python da tarefa sem
+    finalizar o worker. Código nativo que não devolve o controle ao interpretador
+    não é interrompido; nesse caso o processo principal finaliza o worker.
+    """
+    _worker_job_starts.put((job_id, os.getpid()))
+
+    remaining = deadline - time.time()
+    if remaining <= 0:
+        raise _JobDeadlineExceeded()
+
+    signal.signal(signal.SIGALRM, _raise_deadline_exceeded)
+    signal.setitimer(signal.ITIMER_REAL, remaining)
+    try:
+        return func(*args)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def _run_extraction(
+    extraction_method: str, file_path: Path, tool: str | None, file_hash: str | None = None
+) -> ExtractionServiceResponse:
+    """Executa a extração no processo worker."""
+    return getattr(_worker_service, extraction_method)(
+        file_path=file_path, tool=tool, file_hash=file_hash
+    )
+
+
+def _run_page_range(file_path: Path, start_page: int, end_page: int) -> list[tuple[int, str]]:
+    """Converte um intervalo de páginas para markdown no processo worker."""
+    return _worker_service.extract_pages_to_markdown(file_path, start_page, end_page)
+
+
+class ExtractionPool:
+    """
+    Pool de processos dedicado às extrações de documentos.
+
+    Executa as extrações (CPU-bound) fora do event loop, em workers que mantêm
+    os extractors carregados entre requisições. A fila é limitada: quando todos
+    os workers estão ocupados e a fila está cheia, novas extrações são recusadas.
+
+    Extrações que excedem o timeout são interrompidas dentro do próprio worker,
+    que continua disponível. Se o worker não responder em `kill_grace` segundos
+    além do timeout, apenas o processo daquela extração é finalizado; como o
+    ProcessPoolExecutor descarta o pool inteiro quando um worker morre, as
+    demais extrações em andamento são reenviadas uma vez ao novo pool.
+    """
+
+    # Tolerância, após o timeout, antes de finalizar um worker que não respondeu
+    kill_grace: float = 15.0
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        max_queue: int | None = None,
+        timeout: float | None = None,
+    ):
+        """
+        Inicializa o pool usando variáveis de ambiente como padrão.
+
+        Args:
+            max_workers (int | None): Número de processos
+                (LEITOR_DOCS_POOL_SIZE, padrão: 2)
+            max_queue (int | None): Extrações aguardando worker livre
+                (LEITOR_DOCS_POOL_MAX_QUEUE, padrão: 8)
+            timeout (float | None): Tempo máximo de cada extração em segundos
+                (LEITOR_DOCS_POOL_TIMEOUT, padrão: 600)
+        """
+        if max_workers is None:
+            max_workers = int(os.getenv("LEITOR_DOCS_POOL_SIZE", "2"))
+        if max_queue is None:
+            max_queue = int(os.getenv("LEITOR_DOCS_POOL_MAX_QUEUE", "8"))
+        if timeout is None:
+            timeout = float(os.getenv("LEITOR_DOCS_POOL_TIMEOUT", "600"))
+
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._executor: ProcessPoolExecutor | None = None
+        self._job_starts: Any = None
+        self._job_ids = itertools.count()
+        self._job_pids: dict[int, int] = {}
+        # Executores descartados por este pool após finalizar um worker
+        self._aborted: weakref.WeakSet[ProcessPoolExecutor] = weakref.WeakSet()
+        self._pending = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Cria o executor sob demanda."""
+        if self._executor is None:
+            # spawn evita herdar estado de threads do processo do uvicorn
+            context = multiprocessing.get_context("spawn")
+            # SimpleQueue grava de forma síncrona, sem depender de uma thread no
+            # worker, que não rodaria enquanto a tarefa segura o GIL
+            self._job_starts = context.SimpleQueue()
+            self._job_pids.clear()
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(self._job_starts,),
+            )
+        return self._executor
+
+    def start(self) -> None:
+        """Cria o executor e inicia os workers antecipadamente."""
+        executor = self._get_executor()
+        for _ in range(self.max_workers):
+            executor.submit(os.getpid)
+
+    def _discard_executor(self) -> None:
+        """Descarta o executor atual sem aguardar as tarefas em andamento."""
+        if self._executor is None:
+            return
+
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+        self._job_starts = None
+
+    def _job_pid(self, job_id: int) -> int | None:
+        """Retorna o PID do worker que executa a tarefa, se ela já tiver começado."""
+        while self._job_starts is not None and not self._job_starts.empty():
+            started_id, pid = self._job_starts.get()
+            self._job_pids[started_id] = pid
+        return self._job_pids.pop(job_id, None)
+
+    def _kill_job(self, executor: ProcessPoolExecutor, job_id: int) -> None:
+        """Finaliza o worker de uma tarefa que não respondeu ao prazo."""
+        pid = self._job_pid(job_id)
+        if pid is None or self._executor is not executor:
+            # Tarefa ainda na fila (cancelada pelo wait_for) ou pool já descartado
+            return
+
+        logger.error("Worker {} não respondeu ao timeout. Finalizando o processo", pid)
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        self._aborted.add(executor)
+        self._discard_executor()
+
+    def shutdown(self) -> None:
+        """Encerra o pool aguardando as extrações em andamento."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def _check_capacity(self) -> None:
+        """
+        Recusa novas extrações quando workers e fila estão ocupados.
+
+        Raises:
+            ExtractionQueueFullException: Se o pool e a fila estiverem cheios
+        """
+        if self._pending >= self.max_workers + self.max_queue:
+            raise ExtractionQueueFullException(
+                "Serviço de extração sobrecarregado. Tente novamente em instantes."
+            )
+
+    async def _execute(
+        self, executor: ProcessPoolExecutor, func: Callable, file_path: Path, *args
+    ):
+        """Executa uma tarefa no executor informado aplicando o timeout."""
+        loop = asyncio.get_running_loop()
+        job_id = next(self._job_ids)
+        deadline = time.time() + self.timeout
+
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(executor, partial(_run_job, job_id, deadline, func, *args)),
+                timeout=self.timeout + self.kill_grace,
+            )
+
+        except (_JobDeadlineExceeded, asyncio.TimeoutError) as e:
+            logger.error(
+                "Extração excedeu o timeout de {}s: {}", self.timeout, file_path.name
+            )
+            if isinstance(e, asyncio.TimeoutError):
+                self._kill_job(executor, job_id)
+            raise ExtractionTimeoutException(
+                f"Extração de '{file_path.name}' excedeu o tempo limite de {self.timeout:.0f}s"
+            )
+
+        finally:
+            self._job_pid(job_id)
+
+    async def _submit(self, func: Callable, file_path: Path, *args):
+        """
+        Executa uma função em um processo worker aplicando o timeout por tarefa.
+
+        Tarefas interrompidas porque outro worker foi finalizado por timeout são
+        reenviadas uma vez ao novo pool.
+
+        Args:
+            func (Callable): Função de nível de módulo executada no worker
+            file_path (Path): Arquivo processado (usado nas mensagens de erro)
+            *args: Argumentos da função
+
+        Raises:
+            ExtractionTimeoutException: Se a tarefa exceder o timeout
+            DocumentExtractionException: Se o worker for finalizado durante a tarefa
+        """
+        self._pending += 1
+
+        try:
+            for attempt in range(2):
+                executor = self._get_executor()
+                try:
+                    return await self._execute(executor, func, file_path, *args)
+                except BrokenProcessPool:
+                    if self._executor is executor:
+                        self._discard_executor()
+                    if attempt == 0 and executor in self._aborted:
+                        logger.warning(
+                            "Pool reiniciado por timeout de outra extração. Reenviando: {}",
+                            file_path.name,
+                        )
+                        continue
+                    raise DocumentExtractionException(
+                        f"Worker de extração finalizado durante o processamento de '{file_path.name}'"
+                    )
+
+        finally:
+            self._pending -= 1
+
+    async def run(
+        self,
+        extraction_method: str,
+        file_path: Path,
+        tool: str | None = None,
+        file_hash: str | None = None,
+    ) -> ExtractionServiceResponse:
+        """
+        Executa uma extração em um processo worker.
+
+        Args:
+            extraction_method (str): Método do LeitorDocumentosService
+                ('extract_to_markdown', 'extract_raw_data' ou 'extract_image_data')
+            file_path (Path): Caminho do arquivo
+            tool (str | None): Ferramenta de extração (opcional)
+            file_hash (str | None): SHA-256 do arquivo, se já calculado no upload
+
+        Returns:
+            ExtractionServiceResponse: Resultado da extração
+
+        Raises:
+            ExtractionQueueFullException: Se o pool e a fila estiverem cheios
+            ExtractionTimeoutException: Se a extração exceder o timeout
+        """
+        self._check_capacity()
+        return await self._submit(
+            _run_extraction, file_path, extraction_method, file_path, tool, file_hash
+        )
+
+    async def plan_page_ranges(
+        self, file_path: Path, pages_per_chunk: int
+    ) -> list[tuple[int, int]]:
+        """
+        Divide um PDF em intervalos de páginas para conversão paralela.
+
+        Args:
+            file_path (Path): Caminho do arquivo PDF
+            pages_per_chunk (int): Número máximo de páginas por intervalo
+
+        Returns:
+            list[tuple[int, int]]: Intervalos (primeira, última) de páginas
+
+        Raises:
+            ExtractionQueueFullException: Se o pool e a fila estiverem cheios
+            DocumentExtractionException: Se o PDF não puder ser lido
+        """
+        self._check_capacity()
+
+        try:
+            total_pages = await asyncio.to_thread(get_pdf_page_count, file_path)
+        except Exception as e:
+            raise DocumentExtractionException(f"Erro ao ler páginas do PDF: {str(e)}")
+
+        if total_pages == 0:
+            raise DocumentExtractionException(f"PDF '{file_path.name}' não possui páginas")
+
+        return split_page_ranges(total_pages, pages_per_chunk)
+
+    async def iter_pages(
+        self, file_path: Path, page_ranges: list[tuple[int, int]]
+    ) -> AsyncIterator[tuple[int, str]]:
+        """
+        Converte os intervalos de páginas em paralelo, emitindo cada página assim
+        que o seu intervalo é concluído (não necessariamente em ordem).
+
+        Cada documento ocupa no máximo `max_workers` workers por vez, para que os
+        seus intervalos não sejam contabilizados como fila de outras requisições.
+
+        Args:
+            file_path (Path): Caminho do arquivo PDF
+            page_ranges (list[tuple[int, int]]): Intervalos de `plan_page_ranges`
+
+        Yields:
+            tuple[int, str]: Número da página e markdown da página
+        """
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def convert(start_page: int, end_page: int) -> list[tuple[int, str]]:
+            async with semaphore:
+                return await self._submit(
+                    _run_page_range, file_path, file_path, start_page, end_page
+                )
+
+        tasks = [asyncio.create_task(convert(start, end)) for start, end in page_ranges]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                for page in await next_done:
+                    yield page
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def stats(self) -> dict:
+        """
+        Retorna a ocupação atual do pool.
+
+        Returns:
+            dict: Workers, extrações em execução e em fila e utilização (0-1)
+        """
+        running = min(self._pending, self.max_workers)
+        return {
+            "workers": self.max_workers,
+            "em_execucao": running,
+            "em_fila": self._pending - running,
+            "capacidade_fila": self.max_queue,
+            "utilizacao": round(running / self.max_workers, 2) if self.max_workers else 0.0,
+        }
+
+
+# Instância compartilhada pelos endpoints de extração
+extraction_pool = ExtractionPool()
@@ -1,4 +1,6 @@
+import json
 import sys
+import time
 from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import AsyncGenerator
@@ -7,27 +9,41 @@ from typing import AsyncGenerator
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from fastapi import APIRouter, Depends, File, Query, UploadFile
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from logger import leitor_logger as logger
 
+from .cache import ExtractionCache, extraction_cache
+from .exceptions import DocumentExtractionException, FileValidationException
+from .pool import ExtractionPool, extraction_pool
 from .schema import (
     CleanupResponse,
     ConversionMetadata,
     DocumentExtractionResponse,
+    ExtracaoPorCaminhoRequest,
     FerramentaExtracaoEnum,
     SupportedFormatsResponse,
+    TipoExtracaoEnum,
 )
-from .service import FileService, LeitorDocumentosService
-from .utils import sanitize_filename
-from .validators import validate_document_file, validate_file_size
+from .service import FileService, LeitorDocumentosService, SavedUpload
+from .utils import format_duration, get_file_extension, sanitize_filename
+from .validators import resolve_shared_file, validate_document_file, validate_file_size
 
 router = APIRouter(prefix="/leitor-documentos", tags=["Leitor de Documentos"])
 
+# Método do LeitorDocumentosService usado por cada tipo de extração
+EXTRACTION_METHODS = {
+    TipoExtracaoEnum.markdown: "extract_to_markdown",
+    TipoExtracaoEnum.dados_brutos: "extract_raw_data",
+    TipoExtracaoEnum.imagens: "extract_image_data",
+}
+
 
 # Context Manager para limpeza automática de arquivos
 @asynccontextmanager
 async def temp_file_manager(
     file: UploadFile, file_service: FileService
-) -> AsyncGenerator[Path, None]:
+) -> AsyncGenerator[SavedUpload, None]:
     """
     Context manager que garante limpeza de arquivo temporário mesmo em caso de erro.
 
@@ -36,26 +52,26 @@ async def temp_file_manager(
         file_service: Serviço para gerenciar arquivos
 
     Yields:
-        Path: Caminho do arquivo temporário salvo
+        SavedUpload: Caminho, SHA-256 e tamanho do arquivo temporário salvo
 
     Ensures:
         Arquivo temporário é sempre removido, mesmo em caso de exceção
     """
-    temp_file_path = None
+    upload = None
     try:
         # Validar e salvar arquivo
         validate_document_file(file)
         validate_file_size(file)
 
-        temp_file_path = await file_service.save_upload_file(file)
-        logger.info("Arquivo salvo temporariamente: {}", temp_file_path)
+        upload = await file_service.save_upload_file(file)
+        logger.info("Arquivo salvo temporariamente: {}", upload.path)
 
-        yield temp_file_path
+        yield upload
 
     finally:
         # Garantir limpeza mesmo em caso de erro
-        if temp_file_path and temp_file_path.exists():
-            file_service.cleanup_temp_file(temp_file_path)
+        if upload and upload.path.exists():
+            file_service.cleanup_temp_file(upload.path)
 
 
 # Factory Functions
@@ -75,11 +91,46 @@ def get_file_service() -> FileService:
     return FileService()
 
 
+def get_extraction_pool() -> ExtractionPool:
+    """
+    Factory function que retorna o pool de processos de extração compartilhado.
+    Esta função é usada como dependência nos endpoints.
+    """
+    return extraction_pool
+
+
+def get_extraction_cache() -> ExtractionCache:
+    """
+    Factory function que retorna o cache de extração compartilhado.
+    Esta função é usada como dependência nos endpoints.
+    """
+    return extraction_cache
+
+
+def validate_page_split(
+    file: UploadFile, ferramenta_extracao: FerramentaExtracaoEnum | None
+) -> None:
+    """
+    Valida se o arquivo pode ser convertido por intervalos de páginas.
+
+    Raises:
+        FileValidationException: Se o arquivo não for PDF ou a ferramenta não for docling
+    """
+    if ferramenta_extracao not in (None, FerramentaExtracaoEnum.docling):
+        raise FileValidationException(
+            "Conversão por páginas disponível apenas com a ferramenta 'docling'."
+        )
+    if file.filename and get_file_extension(file.filename) != "pdf":
+        raise FileValidationException("Conversão por páginas disponível apenas para PDF.")
+
+
 @router.post("/extrair-markdown")
 async def extrair_para_markdown(
     file: UploadFile = File(...),
     ferramenta_extracao: FerramentaExtracaoEnum = Query(None),
+    paginas_por_bloco: int | None = Query(None, ge=1),
     service: LeitorDocumentosService = Depends(get_document_service),
+    pool: ExtractionPool = Depends(get_extraction_pool),
     file_service: FileService = Depends(get_file_service),
 ) -> DocumentExtractionResponse:
     """
@@ -91,22 +142,43 @@ async def extrair_para_markdown(
     - Extrai texto com formatação (títulos, listas, tabelas)
     - Preserva estrutura hierárquica do documento
     - Suporta múltiplos formatos de entrada (PDF, DOCX, etc.)
+    - Converte PDFs grandes em blocos de páginas processados em paralelo
 
     ## Parâmetros
     - `file`: Arquivo para processar
     - `ferramenta_extracao`: Ferramenta específica (opcional)
+    - `paginas_por_bloco`: Divide o PDF em blocos com este número de páginas,
+      convertidos em paralelo e unidos na ordem original (opcional, apenas docling)
 
     ## Retorna
     Conteúdo em markdown + metadados de processamento
     """
     logger.info("Iniciando extração para markdown: {}", sanitize_filename(file.filename))
 
-    async with temp_file_manager(file, file_service) as temp_file_path:
+    if paginas_por_bloco:
+        validate_page_split(file, ferramenta_extracao)
+
+    async with temp_file_manager(file, file_service) as upload:
         # Realizar extração
-        result = service.extract_to_markdown(
-            file_path=temp_file_path,
-            tool=ferramenta_extracao.value if ferramenta_extracao else None,
-        )
+        if paginas_por_bloco:
+            start_time = time.time()
+            page_ranges = await pool.plan_page_ranges(upload.path, paginas_por_bloco)
+            pages = sorted([page async for page in pool.iter_pages(upload.path, page_ranges)])
+
+            result = service.build_response(
+                file_path=upload.path,
+                content="\n\n".join(markdown for _, markdown in pages),
+                content_format="markdown",
+                extractor_name="docling_pdf",
+                extraction_time=time.time() - start_time,
+            )
+        else:
+            result = await pool.run(
+                "extract_to_markdown",
+                file_path=upload.path,
+                tool=ferramenta_extracao.value if ferramenta_extracao else None,
+                file_hash=upload.sha256,
+            )
 
         # Preparar resposta
         response = DocumentExtractionResponse(
@@ -123,11 +195,85 @@ async def extrair_para_markdown(
         return response
 
 
+@router.post("/extrair-markdown-stream")
+async def extrair_markdown_stream(
+    file: UploadFile = File(...),
+    paginas_por_bloco: int = Query(1, ge=1),
+    pool: ExtractionPool = Depends(get_extraction_pool),
+    file_service: FileService = Depends(get_file_service),
+) -> StreamingResponse:
+    """
+    # Extração para Markdown em Streaming
+
+    Converte um PDF para markdown em blocos de páginas processados em paralelo,
+    emitindo cada página assim que o seu bloco é concluído.
+
+    ## Funcionalidades
+    - Resposta em NDJSON (uma linha JSON por página)
+    - Páginas emitidas por ordem de conclusão; use `pagina` para reordenar
+    - Linha final com `concluido` e total de páginas, ou `erro` em caso de falha
+
+    ## Parâmetros
+    - `file`: Arquivo PDF para processar
+    - `paginas_por_bloco`: Número de páginas por bloco de conversão (padrão: 1)
+
+    ## Retorna
+    ```
+    {"pagina": 2, "conteudo": "## Título..."}
+    {"pagina": 1, "conteudo": "..."}
+    {"concluido": true, "total_paginas": 2, "tempo_extracao": "12.3s"}
+    ```
+    """
+    logger.info("Iniciando extração markdown em streaming: {}", sanitize_filename(file.filename))
+
+    validate_document_file(file, supported_extensions=["pdf"])
+    validate_file_size(file)
+
+    temp_file_path = (await file_service.save_upload_file(file)).path
+    try:
+        page_ranges = await pool.plan_page_ranges(temp_file_path, paginas_por_bloco)
+    except Exception:
+        file_service.cleanup_temp_file(temp_file_path)
+        raise
+
+    async def stream_pages():
+        start_time = time.time()
+        try:
+            async for page_no, markdown in pool.iter_pages(temp_file_path, page_ranges):
+                page = {"pagina": page_no, "conteudo": markdown}
+                yield json.dumps(page, ensure_ascii=False) + "\n"
+
+            yield json.dumps(
+                {
+                    "concluido": True,
+                    "total_paginas": page_ranges[-1][1],
+                    "tempo_extracao": format_duration(time.time() - start_time),
+                }
+            ) + "\n"
+
+        except DocumentExtractionException as e:
+            logger.error("Erro na extração markdown em streaming: {}", e.message)
+            yield json.dumps(
+                {"erro": e.message, "error_code": e.error_code}, ensure_ascii=False
+            ) + "\n"
+
+        finally:
+            file_service.cleanup_temp_file(temp_file_path)
+
+    # O gerador não chega a executar se o cliente desconectar antes do início da
+    # resposta; a background task remove o arquivo também nesse caso
+    return StreamingResponse(
+        stream_pages(),
+        media_type="application/x-ndjson",
+        background=BackgroundTask(file_service.cleanup_temp_file, temp_file_path),
+    )
+
+
 @router.post("/extrair-dados-brutos")
 async def extrair_dados_brutos(
     file: UploadFile = File(...),
     ferramenta_extracao: FerramentaExtracaoEnum = Query(None),
-    service: LeitorDocumentosService = Depends(get_document_service),
+    pool: ExtractionPool = Depends(get_extraction_pool),
     file_service: FileService = Depends(get_file_service),
 ) -> DocumentExtractionResponse:
     """
@@ -149,11 +295,13 @@ async def extrair_dados_brutos(
     """
     logger.info("Iniciando extração de dados brutos: {}", sanitize_filename(file.filename))
 
-    async with temp_file_manager(file, file_service) as temp_file_path:
+    async with temp_file_manager(file, file_service) as upload:
         # Realizar extração
-        result = service.extract_raw_data(
-            file_path=temp_file_path,
+        result = await pool.run(
+            "extract_raw_data",
+            file_path=upload.path,
             tool=ferramenta_extracao.value if ferramenta_extracao else None,
+            file_hash=upload.sha256,
         )
 
         # Preparar resposta
@@ -175,7 +323,7 @@ async def extrair_dados_brutos(
 async def extrair_imagens(
     file: UploadFile = File(...),
     ferramenta_extracao: FerramentaExtracaoEnum = Query(None),
-    service: LeitorDocumentosService = Depends(get_document_service),
+    pool: ExtractionPool = Depends(get_extraction_pool),
     file_service: FileService = Depends(get_file_service),
 ) -> DocumentExtractionResponse:
     """
@@ -198,11 +346,13 @@ async def extrair_imagens(
     """
     logger.info("Iniciando extração de dados de imagens: {}", sanitize_filename(file.filename))
 
-    async with temp_file_manager(file, file_service) as temp_file_path:
+    async with temp_file_manager(file, file_service) as upload:
         # Realizar extração de imagens
-        result = service.extract_image_data(
-            file_path=temp_file_path,
+        result = await pool.run(
+            "extract_image_data",
+            file_path=upload.path,
             tool=ferramenta_extracao.value if ferramenta_extracao else None,
+            file_hash=upload.sha256,
         )
 
         # Preparar resposta
@@ -220,6 +370,56 @@ async def extrair_imagens(
         return response
 
 
+@router.post("/extrair-por-caminho")
+async def extrair_por_caminho(
+    request: ExtracaoPorCaminhoRequest,
+    pool: ExtractionPool = Depends(get_extraction_pool),
+) -> DocumentExtractionResponse:
+    """
+    # Extração por Caminho
+
+    Extrai o conteúdo de um arquivo do diretório compartilhado com o serviço,
+    sem upload: o arquivo é lido diretamente pelo worker de extração.
+
+    ## Funcionalidades
+    - Evita copiar o arquivo pela rede e para um arquivo temporário
+    - O SHA-256 da chave do cache de extração é sempre calculado a partir do
+      arquivo, nunca informado pelo cliente
+    - Disponível apenas com `LEITOR_DOCS_SHARED_DIR` configurado; caminhos
+      fora desse diretório são recusados
+
+    ## Parâmetros
+    - `caminho`: Caminho do arquivo relativo ao diretório compartilhado
+    - `tipo_extracao`: `markdown`, `dados-brutos` ou `imagens` (padrão: markdown)
+    - `ferramenta_extracao`: Ferramenta específica (opcional)
+
+    ## Retorna
+    Conteúdo extraído + metadados de processamento
+    """
+    logger.info(
+        "Iniciando extração por caminho ({}): {}", request.tipo_extracao.value, request.caminho
+    )
+
+    file_path = resolve_shared_file(request.caminho)
+
+    result = await pool.run(
+        EXTRACTION_METHODS[request.tipo_extracao],
+        file_path=file_path,
+        tool=request.ferramenta_extracao.value if request.ferramenta_extracao else None,
+    )
+
+    response = DocumentExtractionResponse(
+        success=True,
+        data=result.extraction_result,
+        metadata=ConversionMetadata(
+            **{**result.metadata.model_dump(), "filename": sanitize_filename(file_path.name)}
+        ),
+    )
+
+    logger.info("Extração por caminho concluída com sucesso: {}", request.caminho)
+    return response
+
+
 @router.get("/formatos-suportados")
 async def listar_formatos_suportados(
     extensao: str = Query("pdf"),
@@ -279,3 +479,35 @@ async def limpar_arquivos_temporarios(
         message=f"{removed_count} arquivo(s) removido(s).",
         removed_count=removed_count,
     )
+
+
+@router.delete("/cache")
+async def limpar_cache_extracao(
+    apenas_expirados: bool = Query(False),
+    cache: ExtractionCache = Depends(get_extraction_cache),
+) -> CleanupResponse:
+    """
+    # Limpeza do Cache de Extração
+
+    Remove resultados de extração armazenados no cache em disco.
+
+    ## Funcionalidades
+    - Remove todas as entradas do cache (padrão)
+    - Opcionalmente remove apenas entradas expiradas, aplicando também o limite de tamanho
+
+    ## Parâmetros
+    - `apenas_expirados`: Se deve remover apenas entradas expiradas (padrão: false)
+
+    ## Retorna
+    Quantidade de entradas removidas
+    """
+    logger.info("Iniciando limpeza do cache de extração (apenas_expirados: {})", apenas_expirados)
+
+    removed_count = cache.evict() if apenas_expirados else cache.clear()
+    logger.info("Limpeza do cache concluída. {} entrada(s) removida(s)", removed_count)
+
+    return CleanupResponse(
+        success=True,
+        message=f"{removed_count} entrada(s) removida(s) do cache.",
+        removed_count=removed_count,
+    )
@@ -1,5 +1,7 @@
 from pathlib import Path
 
+import pypdf
+
 # Constantes para formatação
 KB_SIZE = 1024
 MB_SIZE = 1024 * 1024
@@ -68,3 +70,35 @@ def get_file_extension(filename: str) -> str:
         str: Extensão do arquivo sem o ponto (ex: "pdf", "docx")
     """
     return Path(filename).suffix.lower().lstrip(".")
+
+
+def get_pdf_page_count(file_path: Path) -> int:
+    """
+    Retorna o número de páginas de um arquivo PDF.
+
+    Args:
+        file_path (Path): Caminho do arquivo PDF
+
+    Returns:
+        int: Número de páginas
+    """
+    with open(file_path, "rb") as f:
+        return len(pypdf.PdfReader(f).pages)
+
+
+def split_page_ranges(total_pages: int, pages_per_chunk: int) -> list[tuple[int, int]]:
+    """
+    Divide as páginas de um documento em intervalos consecutivos.
+
+    Args:
+        total_pages (int): Número total de páginas
+        pages_per_chunk (int): Número máximo de páginas por intervalo
+
+    Returns:
+        list[tuple[int, int]]: Intervalos (primeira, última) com páginas a partir de 1,
+            ambas inclusivas (ex: [(1, 10), (11, 20), (21, 23)])
+    """
+    return [
+        (start, min(start + pages_per_chunk - 1, total_pages))
+        for start in range(1, total_pages + 1, pages_per_chunk)
+    ]
@@ -2,7 +2,7 @@
 Módulo PydanticAI para integração com agentes de IA estruturados.
 """
 
-from .entity import ClientIa, ClientModel, ModelSchema, Prompt
+from .entity import ClientIa, ClientModel, ConsultaTelemetria, ModelSchema, Prompt
 from .schema import ConsultaRequestSchema, ConsultaResponseSchema, ModeloDisponivelSchema
 from .service import ModelFactory
 
@@ -12,6 +12,7 @@ __all__ = [
     "ModeloDisponivelSchema",
     "ClientIa",
     "ClientModel",
+    "ConsultaTelemetria",
     "ModelSchema",
     "Prompt",
     "ModelFactory",
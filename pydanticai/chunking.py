@@ -0,0 +1,346 @@
+"""
+Divisão de documentos em blocos e consolidação de extrações parciais.
+
+Este módulo dá suporte ao modo em blocos (map-reduce) do serviço PydanticAI,
+usado quando o documento não cabe, ou não compensa, em um único contexto:
+
+1. O markdown é dividido em blocos por seções (títulos) e tabelas, respeitando
+   um orçamento aproximado de tokens por bloco.
+2. Cada bloco é extraído com uma versão parcial do schema, em que todos os
+   campos são opcionais, já que um bloco contém apenas parte do relatório.
+3. As extrações parciais são mescladas campo a campo e o resultado é validado
+   no schema original.
+
+Funções:
+    estimar_tokens: Estimativa de tokens de um texto
+    dividir_markdown: Divide markdown em blocos dentro do orçamento de tokens
+    criar_schema_parcial: Versão do schema com todos os campos opcionais
+    mesclar_parciais: Consolida as extrações parciais de um documento
+"""
+
+import json
+import math
+import re
+from collections import Counter
+from functools import lru_cache
+from types import UnionType
+from typing import Any, Optional, Union, get_args, get_origin
+
+from pydantic import BaseModel, ConfigDict, Field, create_model
+
+# Média de caracteres por token em textos em português com números e tabelas
+CARACTERES_POR_TOKEN = 3.5
+
+TITULO_REGEX = re.compile(r"^#{1,6}\s")
+
+# Cortes de linhas longas, do mais ao menos natural: fim de frase e espaços
+SEPARADORES_TEXTO = (re.compile(r"(?<=[.!?;])\s+"), re.compile(r"\s+"))
+
+SEPARADOR_BLOCOS = "\n\n"
+
+
+def estimar_tokens(texto: str) -> int:
+    """
+    Estima o número de tokens de um texto.
+
+    A estimativa por caracteres é conservadora o bastante para dimensionar
+    blocos em modelos de tokenizadores diferentes sem depender de nenhum deles.
+
+    Args:
+        texto: Texto a ser medido
+
+    Returns:
+        int: Número estimado de tokens
+    """
+    return int(len(texto) / CARACTERES_POR_TOKEN) + 1
+
+
+def _caracteres_maximos(max_tokens: int) -> int:
+    """Maior tamanho de texto cuja estimativa não passa de `max_tokens` tokens."""
+    return max(math.ceil(max_tokens * CARACTERES_POR_TOKEN) - 1, 1)
+
+
+def _separar_secoes(markdown: str) -> list[list[str]]:
+    """Separa o markdown em seções, cada uma iniciada por um título."""
+    secoes: list[list[str]] = [[]]
+    for linha in markdown.splitlines():
+        if TITULO_REGEX.match(linha) and secoes[-1]:
+            secoes.append([])
+        secoes[-1].append(linha)
+    return [secao for secao in secoes if secao]
+
+
+def _separar_blocos(linhas: list[str]) -> list[list[str]]:
+    """Separa uma seção em parágrafos e tabelas (linhas contíguas iniciadas por '|')."""
+    blocos: list[list[str]] = []
+    tabela_anterior = False
+
+    for linha in linhas:
+        tabela = linha.lstrip().startswith("|")
+        if not blocos or tabela != tabela_anterior or (not tabela and not linha.strip()):
+            blocos.append([])
+        blocos[-1].append(linha)
+        tabela_anterior = tabela
+
+    return [bloco for bloco in blocos if any(linha.strip() for linha in bloco)]
+
+
+def _dividir_texto(texto: str, max_caracteres: int, nivel: int = 0) -> list[str]:
+    """
+    Divide uma linha maior que o orçamento por frases, depois por palavras e,
+    em último caso, por caracteres.
+
+    As partes de um mesmo nível são reagrupadas, separadas por espaço, enquanto
+    couberem em `max_caracteres`.
+    """
+    if len(texto) <= max_caracteres:
+        return [texto]
+    if nivel >= len(SEPARADORES_TEXTO):
+        return [texto[i : i + max_caracteres] for i in range(0, len(texto), max_caracteres)]
+
+    partes: list[str] = []
+    atual = ""
+    for pedaco in SEPARADORES_TEXTO[nivel].split(texto):
+        for parte in _dividir_texto(pedaco, max_caracteres, nivel + 1):
+            if atual and len(atual) + 1 + len(parte) <= max_caracteres:
+                atual = f"{atual} {parte}"
+                continue
+            if atual:
+                partes.append(atual)
+            atual = parte
+
+    if atual:
+        partes.append(atual)
+    return partes
+
+
+def _dividir_bloco(linhas: list[str], max_caracteres: int) -> list[list[str]]:
+    """
+    Divide um bloco maior que o orçamento por linhas.
+
+    Tabelas repetem o cabeçalho (título e separador) em cada parte, para que
+    o modelo continue sabendo o significado de cada coluna. Linhas que sozinhas
+    passam do orçamento são cortadas com `_dividir_texto`.
+    """
+    tabela = len(linhas) > 2 and linhas[0].lstrip().startswith("|")
+    cabecalho = linhas[:2] if tabela else []
+    corpo = linhas[2:] if tabela else linhas
+
+    tamanho_cabecalho = len("\n".join(cabecalho)) + 1 if cabecalho else 0
+    if tamanho_cabecalho >= max_caracteres:
+        # Cabeçalho sem espaço para nenhuma linha: tratado como parte do corpo
+        cabecalho, corpo, tamanho_cabecalho = [], linhas, 0
+    max_linha = max_caracteres - tamanho_cabecalho
+
+    partes: list[list[str]] = []
+    atual: list[str] = list(cabecalho)
+    tamanho_atual = tamanho_cabecalho
+
+    for linha_original in corpo:
+        for linha in _dividir_texto(linha_original, max_linha):
+            tamanho_linha = len(linha) + (1 if len(atual) > len(cabecalho) else 0)
+            if tamanho_atual + tamanho_linha > max_caracteres and len(atual) > len(cabecalho):
+                partes.append(atual)
+                atual = list(cabecalho)
+                tamanho_atual = tamanho_cabecalho
+                tamanho_linha = len(linha)
+            atual.append(linha)
+            tamanho_atual += tamanho_linha
+
+    if len(atual) > len(cabecalho):
+        partes.append(atual)
+
+    return partes
+
+
+def dividir_markdown(markdown: str, max_tokens: int) -> list[str]:
+    """
+    Divide um documento markdown em blocos de até `max_tokens` tokens (estimados).
+
+    Os cortes são feitos preferencialmente entre seções (títulos); seções grandes
+    são cortadas entre parágrafos e tabelas, tabelas e parágrafos maiores que o
+    orçamento são cortados por linha, e linhas maiores que o orçamento por
+    frases, palavras e caracteres. Cada bloco leva o título da seção em que
+    começa, para manter o contexto.
+
+    Args:
+        markdown: Documento em markdown
+        max_tokens: Orçamento de tokens por bloco
+
+    Returns:
+        list[str]: Blocos do documento, na ordem original, nenhum acima do orçamento
+    """
+    if estimar_tokens(markdown) <= max_tokens:
+        return [markdown]
+
+    # Os blocos são medidos em caracteres, já que a estimativa de tokens de um
+    # texto concatenado não é a soma das estimativas das partes
+    max_caracteres = _caracteres_maximos(max_tokens)
+    blocos: list[str] = []
+    atual: list[str] = []
+    tamanho_atual = 0
+
+    def cabe(texto: str) -> bool:
+        separador = len(SEPARADOR_BLOCOS) if atual else 0
+        return tamanho_atual + separador + len(texto) <= max_caracteres
+
+    def adicionar(texto: str):
+        nonlocal tamanho_atual
+        tamanho_atual += (len(SEPARADOR_BLOCOS) if atual else 0) + len(texto)
+        atual.append(texto)
+
+    def fechar_bloco():
+        nonlocal atual, tamanho_atual
+        if atual:
+            blocos.append(SEPARADOR_BLOCOS.join(atual))
+        atual = []
+        tamanho_atual = 0
+
+    for secao in _separar_secoes(markdown):
+        titulo = secao[0] if TITULO_REGEX.match(secao[0]) else None
+        texto_secao = "\n".join(secao)
+
+        if cabe(texto_secao):
+            adicionar(texto_secao)
+            continue
+
+        fechar_bloco()
+        if cabe(texto_secao):
+            adicionar(texto_secao)
+            continue
+
+        # Seção maior que o orçamento: dividir em parágrafos e tabelas, deixando
+        # espaço para repetir o título no início de cada bloco
+        tamanho_titulo = len(titulo) + len(SEPARADOR_BLOCOS) if titulo else 0
+        if tamanho_titulo >= max_caracteres:
+            titulo, tamanho_titulo = None, 0
+
+        for bloco in _separar_blocos(secao[1:] if TITULO_REGEX.match(secao[0]) else secao):
+            for parte in _dividir_bloco(bloco, max_caracteres - tamanho_titulo):
+                texto_parte = "\n".join(parte)
+
+                if not cabe(texto_parte):
+                    fechar_bloco()
+                if not atual and titulo:
+                    adicionar(titulo)
+
+                adicionar(texto_parte)
+
+    fechar_bloco()
+    return blocos
+
+
+def _tornar_parcial(anotacao: Any) -> Any:
+    """Substitui, recursivamente, modelos Pydantic da anotação pelas versões parciais."""
+    if isinstance(anotacao, type) and issubclass(anotacao, BaseModel):
+        return criar_schema_parcial(anotacao)
+
+    origem = get_origin(anotacao)
+    argumentos = get_args(anotacao)
+    if origem is None or not argumentos:
+        return anotacao
+
+    novos_argumentos = tuple(_tornar_parcial(argumento) for argumento in argumentos)
+    if origem in (Union, UnionType):
+        return Union[novos_argumentos]
+    if origem is list:
+        return list[novos_argumentos[0]]
+    if origem is dict:
+        return dict[novos_argumentos[0], novos_argumentos[1]]
+
+    return anotacao
+
+
+@lru_cache(maxsize=None)
+def criar_schema_parcial(schema_class: type[BaseModel]) -> type[BaseModel]:
+    """
+    Cria a versão parcial de um schema: todos os campos opcionais e sem validadores.
+
+    Usada na extração de cada bloco, que contém apenas parte do relatório. As
+    validações do schema original são aplicadas ao resultado consolidado.
+
+    Args:
+        schema_class: Classe do schema original (ex: RelatorioFIDCICred)
+
+    Returns:
+        type[BaseModel]: Classe do schema parcial
+    """
+    campos = {}
+    for nome, campo in schema_class.model_fields.items():
+        campos[nome] = (
+            Optional[_tornar_parcial(campo.annotation)],
+            Field(default=None, alias=campo.alias, description=campo.description),
+        )
+
+    return create_model(
+        f"{schema_class.__name__}Parcial",
+        __config__=ConfigDict(populate_by_name=True),
+        __doc__=(
+            f"{(schema_class.__doc__ or '').strip()}\n\n"
+            "Extração parcial: preencha apenas os campos presentes neste trecho do documento."
+        ),
+        **campos,
+    )
+
+
+def _chave(valor: Any) -> str:
+    """Representação canônica de um valor para comparação."""
+    return json.dumps(valor, sort_keys=True, ensure_ascii=False, default=str)
+
+
+def _mesclar_valores(valores: list[Any]) -> Any:
+    """
+    Mescla os valores de um mesmo campo extraídos de blocos diferentes.
+
+    Regras:
+    - valores nulos são ignorados;
+    - objetos são mesclados campo a campo;
+    - listas são concatenadas na ordem dos blocos, sem itens repetidos;
+    - escalares em conflito: prevalece o valor mais frequente e, em empate,
+      o do primeiro bloco em que aparece.
+    """
+    valores = [valor for valor in valores if valor is not None]
+    if not valores:
+        return None
+
+    if all(isinstance(valor, dict) for valor in valores):
+        chaves = list(dict.fromkeys(chave for valor in valores for chave in valor))
+        return {
+            chave: _mesclar_valores([valor.get(chave) for valor in valores]) for chave in chaves
+        }
+
+    if all(isinstance(valor, list) for valor in valores):
+        itens = {}
+        for valor in valores:
+            for item in valor:
+                itens.setdefault(_chave(item), item)
+        return list(itens.values())
+
+    contagem = Counter(_chave(valor) for valor in valores)
+    mais_frequente = max(contagem.values())
+    return next(valor for valor in valores if contagem[_chave(valor)] == mais_frequente)
+
+
+def mesclar_parciais(schema_class: type[BaseModel], parciais: list[BaseModel]) -> BaseModel:
+    """
+    Consolida as extrações parciais dos blocos no schema original.
+
+    Args:
+        schema_class: Classe do schema original
+        parciais: Extrações parciais, na ordem dos blocos
+
+    Returns:
+        BaseModel: Instância validada do schema original
+
+    Raises:
+        ValueError: Se o resultado consolidado não satisfizer o schema original
+            (ex: campo obrigatório ausente em todos os blocos)
+    """
+    dados = _mesclar_valores(
+        [parcial.model_dump(mode="json", by_alias=True, exclude_none=True) for parcial in parciais]
+    )
+
+    try:
+        return schema_class.model_validate(dados or {})
+    except ValueError as e:
+        raise ValueError(f"Extração em blocos incompleta para {schema_class.__name__}: {e}")
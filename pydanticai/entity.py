@@ -119,3 +119,41 @@ class Prompt(Model, SchemaIcatu):
         Index("idx_prompt_fks", "model_schema_id", "client_model_id"),
         {"schema": "icatu", "extend_existing": True},
     )
+
+
+# --- Model Definition for 'consulta_telemetria_tb' ---
+class ConsultaTelemetria(Model, SchemaIcatu):
+    """
+    Mapeia a tabela 'consulta_telemetria_tb'.
+
+    Armazena o uso de tokens, a latência e o custo estimado de cada consulta de IA.
+    """
+
+    __tablename__ = "consulta_telemetria_tb"
+
+    consulta_telemetria_id: Mapped[int] = mapped_column(primary_key=True)
+
+    # Nulo quando o modelo utilizado não está cadastrado em client_model_tb
+    client_model_id: Mapped[int | None] = mapped_column(
+        ForeignKey("icatu.client_model_tb.client_model_id")
+    )
+
+    modelo_nm: Mapped[str] = mapped_column(String(200))
+    schema_nm: Mapped[str] = mapped_column(String(200))
+    # Chamada de uma extração em blocos (map-reduce), com o schema parcial
+    em_blocos: Mapped[bool] = mapped_column(Boolean, server_default="FALSE")
+    tokens_entrada: Mapped[int | None] = mapped_column(Integer)
+    tokens_saida: Mapped[int | None] = mapped_column(Integer)
+    tokens_total: Mapped[int | None] = mapped_column(Integer)
+    requisicoes: Mapped[int] = mapped_column(Integer, server_default="1")
+    latencia_ms: Mapped[int] = mapped_column(Integer)
+    custo_estimado: Mapped[float | None] = mapped_column(Float)
+    data_criacao: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=False), default=datetime.now
+    )
+
+    __table_args__ = (
+        # Consultas de percentis são sempre por modelo e período
+        Index("idx_consulta_telemetria_modelo_data", "client_model_id", "data_criacao"),
+        {"schema": "icatu", "extend_existing": True},
+    )
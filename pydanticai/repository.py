@@ -11,16 +11,27 @@ Funcionalidades:
 - Listagem de schemas de modelo
 - Busca de schemas por nome
 - Cadastro de prompts com cache de performance
+- Registro e agregação da telemetria das consultas (tokens, latência e custo)
 """
 
-from functools import lru_cache
+from datetime import datetime
 from typing import Sequence
 
+from modules.cache import AsyncTTLCache
 from modules.repository import BaseRepository
-from sqlalchemy import select, update
+from sqlalchemy import func, insert, select, update
 from sqlalchemy.orm import selectinload
 
-from .entity import ClientModel, ModelSchema, Prompt
+from .entity import ClientModel, ConsultaTelemetria, ModelSchema, Prompt
+
+# Mapeamentos nome -> id usados no cadastro de prompts. Compartilhados entre as
+# instâncias do repositório (uma por requisição) e recarregados a cada 10 minutos.
+CLIENT_MODELS_CACHE_KEY = "client_models"
+MESAS_CACHE_KEY = "mesas"
+MODEL_SCHEMAS_CACHE_KEY = "model_schemas"
+MODELOS_CACHE_KEY = "modelos"
+
+referencias_cache: AsyncTTLCache[dict] = AsyncTTLCache(ttl=600, maxsize=8, name="pydanticai")
 
 
 class PydanticAIRepository:
@@ -96,7 +107,6 @@ class PydanticAIRepository:
         result = await self.__base_repository_model_schema.get_db_session().execute(query)
         return result.unique().scalar_one_or_none()
 
-    @lru_cache(maxsize=128)
     async def _get_client_models_cache(self) -> dict[tuple[str, str], int]:
         """
         Cache de client models por (client_name, model_name) -> client_model_id.
@@ -104,6 +114,12 @@ class PydanticAIRepository:
         Returns:
             dict[tuple[str, str], int]: Mapeamento (client_name, model_name) -> client_model_id
         """
+        return await referencias_cache.get_or_load(
+            CLIENT_MODELS_CACHE_KEY, self._carregar_client_models
+        )
+
+    async def _carregar_client_models(self) -> dict[tuple[str, str], int]:
+        """Consulta o mapeamento (client_name, model_name) -> client_model_id."""
         from .entity import ClientIa
 
         query = select(ClientModel, ClientIa.client_nm).join(
@@ -118,7 +134,6 @@ class PydanticAIRepository:
 
         return cache_data
 
-    @lru_cache(maxsize=64)
     async def _get_mesas_cache(self) -> dict[str, int]:
         """
         Cache de mesas por nome -> mesa_id.
@@ -126,6 +141,10 @@ class PydanticAIRepository:
         Returns:
             dict[str, int]: Mapeamento nome -> mesa_id
         """
+        return await referencias_cache.get_or_load(MESAS_CACHE_KEY, self._carregar_mesas)
+
+    async def _carregar_mesas(self) -> dict[str, int]:
+        """Consulta o mapeamento nome -> mesa_id."""
         from modules.mesas.model import Mesa
 
         query = select(Mesa.id, Mesa.nome).order_by(Mesa.nome)
@@ -137,7 +156,6 @@ class PydanticAIRepository:
 
         return cache_data
 
-    @lru_cache(maxsize=64)
     async def _get_model_schemas_cache(self) -> dict[str, int]:
         """
         Cache de model schemas por nome -> model_schema_id.
@@ -145,6 +163,12 @@ class PydanticAIRepository:
         Returns:
             dict[str, int]: Mapeamento nome -> model_schema_id
         """
+        return await referencias_cache.get_or_load(
+            MODEL_SCHEMAS_CACHE_KEY, self._carregar_model_schemas
+        )
+
+    async def _carregar_model_schemas(self) -> dict[str, int]:
+        """Consulta o mapeamento nome -> model_schema_id."""
         query = select(ModelSchema.model_schema_id, ModelSchema.model_nm)
         result = await self.__base_repository_model_schema.get_db_session().execute(query)
 
@@ -154,6 +178,22 @@ class PydanticAIRepository:
 
         return cache_data
 
+    async def _get_modelos_cache(self) -> dict[str, tuple[int, str | None]]:
+        """
+        Cache de modelos por model_name -> (client_model_id, custo).
+
+        Returns:
+            dict[str, tuple[int, str | None]]: Mapeamento model_name -> (id, custo)
+        """
+        return await referencias_cache.get_or_load(MODELOS_CACHE_KEY, self._carregar_modelos)
+
+    async def _carregar_modelos(self) -> dict[str, tuple[int, str | None]]:
+        """Consulta o mapeamento model_name -> (client_model_id, custo)."""
+        query = select(ClientModel.model_nm, ClientModel.client_model_id, ClientModel.custo)
+        result = await self.__base_repository_client_model.get_db_session().execute(query)
+
+        return {model_nm: (client_model_id, custo) for model_nm, client_model_id, custo in result}
+
     async def buscar_client_model_por_nomes(self, client_nm: str, model_nm: str) -> int:
         """
         Busca client_model_id por nomes do cliente e modelo.
@@ -186,6 +226,9 @@ class PydanticAIRepository:
             if not client_model:
                 raise ValueError(f"Modelo '{model_nm}' do cliente '{client_nm}' não encontrado")
 
+            # Modelo cadastrado após a última carga: recarregar na próxima consulta
+            self.invalidar_cache(CLIENT_MODELS_CACHE_KEY)
+            self.invalidar_cache(MODELOS_CACHE_KEY)
             return client_model.client_model_id
 
         return cache[key]
@@ -216,6 +259,7 @@ class PydanticAIRepository:
             if not mesa_id:
                 raise ValueError(f"Mesa '{mesa_nome}' não encontrada")
 
+            self.invalidar_cache(MESAS_CACHE_KEY)
             return mesa_id
 
         return cache[mesa_nome]
@@ -238,6 +282,8 @@ class PydanticAIRepository:
             result = await self.__base_repository_model_schema.get_db_session().execute(query)
             schema_id = result.scalar_one_or_none()
 
+            if schema_id is not None:
+                self.invalidar_cache(MODEL_SCHEMAS_CACHE_KEY)
             return schema_id
 
         return cache[schema_name]
@@ -358,8 +404,85 @@ class PydanticAIRepository:
         # Retornar o prompt atualizado
         return await self.buscar_prompt_por_id(prompt_id)
 
+    async def buscar_modelo_utilizado(self, model_nm: str) -> tuple[int, str | None] | None:
+        """
+        Busca o client model correspondente ao nome reportado pelo provider.
+
+        Providers costumam devolver o nome com sufixo de versão
+        (ex: "gpt-4.1-mini-2025-04-14"), então, sem correspondência exata, usa o
+        modelo cadastrado de maior nome que seja prefixo do nome reportado.
+
+        Args:
+            model_nm: Nome do modelo reportado na resposta
+
+        Returns:
+            tuple[int, str | None] | None: (client_model_id, custo) ou None
+        """
+        modelos = await self._get_modelos_cache()
+
+        if model_nm in modelos:
+            return modelos[model_nm]
+
+        prefixos = [nome for nome in modelos if model_nm.startswith(nome)]
+        if not prefixos:
+            return None
+
+        return modelos[max(prefixos, key=len)]
+
+    async def registrar_telemetria(self, dados: dict) -> None:
+        """
+        Registra a telemetria de uma consulta.
+
+        Args:
+            dados: Dicionário com as colunas de ConsultaTelemetria
+        """
+        query = insert(ConsultaTelemetria).values(**dados)
+        await self.__base_repository_client_model.get_db_session().execute(query)
+
+    async def listar_telemetria_por_modelo(self, desde: datetime) -> list[dict]:
+        """
+        Agrega a telemetria das consultas por modelo a partir de uma data.
+
+        Args:
+            desde: Data inicial do período
+
+        Returns:
+            list[dict]: Consultas, percentis de latência, médias de tokens e custo por modelo
+        """
+        latencia = ConsultaTelemetria.latencia_ms
+        query = (
+            select(
+                ConsultaTelemetria.client_model_id,
+                ConsultaTelemetria.modelo_nm,
+                func.count().label("consultas"),
+                func.percentile_cont(0.5).within_group(latencia).label("latencia_p50_ms"),
+                func.percentile_cont(0.95).within_group(latencia).label("latencia_p95_ms"),
+                func.percentile_cont(0.99).within_group(latencia).label("latencia_p99_ms"),
+                func.avg(ConsultaTelemetria.tokens_entrada).label("tokens_entrada_medio"),
+                func.avg(ConsultaTelemetria.tokens_saida).label("tokens_saida_medio"),
+                func.sum(ConsultaTelemetria.custo_estimado).label("custo_total"),
+            )
+            .where(ConsultaTelemetria.data_criacao >= desde)
+            .group_by(ConsultaTelemetria.client_model_id, ConsultaTelemetria.modelo_nm)
+            .order_by(ConsultaTelemetria.modelo_nm)
+        )
+
+        result = await self.__base_repository_client_model.get_db_session().execute(query)
+        return [dict(row._mapping) for row in result]
+
+    @staticmethod
+    def invalidar_cache(chave: str | None = None) -> None:
+        """
+        Invalida um mapeamento de referência, ou todos quando `chave` não é informada.
+
+        Deve ser chamado após cadastrar ou renomear client models, mesas ou schemas.
+
+        Args:
+            chave: CLIENT_MODELS_CACHE_KEY, MESAS_CACHE_KEY, MODEL_SCHEMAS_CACHE_KEY
+                ou MODELOS_CACHE_KEY
+        """
+        referencias_cache.invalidate(chave)
+
     def clear_cache(self) -> None:
         """Limpa todo o cache interno."""
-        self._get_client_models_cache.cache_clear()
-        self._get_mesas_cache.cache_clear()
-        self._get_model_schemas_cache.cache_clear()
+        self.invalidar_cache()
@@ -10,6 +10,8 @@ Endpoints:
     GET /pydantic-ai/schemas-disponiveis: Lista schemas disponíveis
     GET /pydantic-ai/modelos-disponiveis: Lista modelos de IA cadastrados
     POST /pydantic-ai/prompts: Cadastra novo prompt no sistema
+    DELETE /pydantic-ai/cache: Remove respostas do cache de consultas
+    GET /pydantic-ai/telemetria/modelos: Latência, tokens e custo das consultas por modelo
 
 Funcionalidades:
     - Execução de consultas de IA com diferentes modelos e schemas
@@ -24,7 +26,7 @@ Funcionalidades:
 from typing import Annotated
 
 from config.swagger import token_field
-from fastapi import APIRouter, Depends, Form, HTTPException, Request, UploadFile, status
+from fastapi import APIRouter, Depends, Form, HTTPException, Query, Request, UploadFile, status
 from modules.integrations.enums import FerramentaExtracaoEnum, TipoExtracaoEnum
 from modules.repository import BaseRepositoryImpl
 from modules.util.request import db
@@ -41,6 +43,7 @@ from .schema import (
     PromptResponseSchema,
     PromptStatusResponseSchema,
     PromptStatusUpdateSchema,
+    TelemetriaModeloSchema,
 )
 from .service import PydanticAIService, PydanticAIServiceImpl
 
@@ -96,6 +99,9 @@ async def executar_consulta_ia(
     - **temperature** (float, opcional): Criatividade da resposta, 0.0-1.0
     - **schema_name** (string, opcional): Nome do schema de resposta
     - **doc** (string, opcional): Documento adicional para contexto
+    - **ignorar_cache** (boolean, opcional): Executa o modelo mesmo havendo resposta em cache
+    - **tokens_por_bloco** (integer, opcional): Divide documentos maiores que o orçamento em
+      blocos extraídos concorrentemente, mesclando os resultados
 
     ## Resposta
 
@@ -103,9 +109,11 @@ async def executar_consulta_ia(
 
     - **resultado**: Resposta estruturada conforme o schema especificado
     - **tempo_execucao**: Tempo de execução em segundos
-    - **tokens_utilizados**: Número estimado de tokens utilizados
+    - **tokens_utilizados**: Número de tokens utilizados
     - **modelo_utilizado**: Nome do modelo de IA utilizado
     - **schema_utilizado**: Nome do schema de resposta utilizado
+    - **uso**: Tokens de entrada/saída, requisições, retentativas e custo estimado
+    - **cache_hit**: Indica se a resposta veio do cache de respostas
 
     ## Exemplos de Uso
 
@@ -134,7 +142,8 @@ async def executar_consulta_ia(
 
     ## Notas
 
-    - Tokens são estimados baseados no tamanho do prompt e resposta
+    - Tokens são os reportados pelo provider; são estimados apenas quando o provider
+      não informa o uso
     """
     try:
         resultado = await service.executar_consulta(
@@ -146,6 +155,8 @@ async def executar_consulta_ia(
             temperature=body.temperature,
             schema_name=body.schema_name,
             doc=body.doc,
+            ignorar_cache=body.ignorar_cache,
+            tokens_por_bloco=body.tokens_por_bloco,
         )
 
         return resultado
@@ -165,6 +176,8 @@ async def executar_consulta_com_arquivo(
     max_tokens: int = Form(default=2400, ge=1, le=8000),
     temperature: float = Form(default=0.1, ge=0.0, le=2.0),
     schema_name: str = Form(default="default"),
+    ignorar_cache: bool = Form(default=False),
+    tokens_por_bloco: int | None = Form(default=None, ge=500),
     service: PydanticAIService = Depends(get_service),
 ) -> ConsultaResponseSchema:
     """
@@ -191,6 +204,8 @@ async def executar_consulta_com_arquivo(
     - **max_tokens** (integer, opcional): Máximo de tokens na resposta
     - **temperature** (float, opcional): Criatividade da resposta
     - **schema_name** (string, opcional): Nome do schema de resposta
+    - **ignorar_cache** (boolean, opcional): Executa o modelo mesmo havendo resposta em cache
+    - **tokens_por_bloco** (integer, opcional): Orçamento de tokens por bloco do documento
     """
     try:
         resultado = await service.executar_consulta_com_arquivo(
@@ -204,6 +219,8 @@ async def executar_consulta_com_arquivo(
             max_tokens=max_tokens,
             temperature=temperature,
             schema_name=schema_name,
+            ignorar_cache=ignorar_cache,
+            tokens_por_bloco=tokens_por_bloco,
         )
 
         return resultado
@@ -325,3 +342,45 @@ async def atualizar_status_prompt(
 
         # Outros erros de validação
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error_message)
+
+
+@router.delete("/cache")
+async def limpar_cache_respostas(
+    schema_name: str | None = Query(
+        default=None, description="Remove apenas as respostas deste schema (todas se omitido)"
+    ),
+    service: PydanticAIService = Depends(get_service),
+) -> dict[str, int]:
+    """
+    Remove respostas do cache de consultas.
+
+    Use após alterar um schema de resposta ou os prompts de um schema para que
+    as próximas consultas executem o modelo novamente.
+    """
+    if schema_name is not None:
+        try:
+            ModelSchemaEnum.get_schema_class(schema_name)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return {"removidos": service.limpar_cache_respostas(schema_name)}
+
+
+@router.get("/telemetria/modelos")
+async def listar_telemetria_modelos(
+    dias: int = Query(default=7, ge=1, le=90, description="Período em dias"),
+    service: PydanticAIService = Depends(get_service_with_database),
+) -> list[TelemetriaModeloSchema]:
+    """
+    Lista estatísticas das consultas de IA por modelo no período.
+
+    Retorna número de consultas, percentis de latência (p50/p95/p99), média de
+    tokens de entrada e saída e custo estimado total de cada modelo.
+    """
+    try:
+        return await service.listar_telemetria_modelos(dias=dias)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro ao buscar telemetria",
+        )
@@ -7,7 +7,9 @@ de requisições e respostas da API do módulo PydanticAI.
 Schemas incluídos:
 - ConsultaRequestSchema: Para requisições de consulta de IA (com suporte a fallback)
 - ConsultaComArquivoRequestSchema: Para requisições de consulta com arquivo
+- UsoTokensSchema: Para o uso de tokens reportado pelo provider
 - ConsultaResponseSchema: Para respostas de consulta de IA
+- TelemetriaModeloSchema: Para estatísticas de latência, tokens e custo por modelo
 - ModeloDisponivelSchema: Para representação de modelos disponíveis
 - PromptCadastroSchema: Para cadastro de prompts
 - PromptResponseSchema: Para resposta de prompts cadastrados
@@ -78,6 +80,18 @@ class ConsultaRequestSchema(Schema):
         default="default", description="Nome do schema Pydantic para estruturar a resposta"
     )
     doc: str | None = Field(default="", description="Documento a ser analisado (opcional)")
+    ignorar_cache: bool = Field(
+        default=False,
+        description="Executa o modelo mesmo havendo resposta em cache para a mesma consulta",
+    )
+    tokens_por_bloco: int | None = Field(
+        default=None,
+        ge=500,
+        description=(
+            "Orçamento de tokens por bloco do documento. Documentos maiores são extraídos "
+            "em blocos concorrentes e mesclados (opcional)"
+        ),
+    )
 
     @field_validator("user_prompt")
     @classmethod
@@ -187,6 +201,19 @@ class ConsultaComArquivoRequestSchema(Schema):
         default="default", description="Nome do schema Pydantic para estruturar a resposta"
     )
 
+    ignorar_cache: bool = Field(
+        default=False,
+        description="Executa o modelo mesmo havendo resposta em cache para a mesma consulta",
+    )
+    tokens_por_bloco: int | None = Field(
+        default=None,
+        ge=500,
+        description=(
+            "Orçamento de tokens por bloco do documento. Documentos maiores são extraídos "
+            "em blocos concorrentes e mesclados (opcional)"
+        ),
+    )
+
     @field_validator("user_prompt")
     @classmethod
     def validate_user_prompt(cls, v: str) -> str:
@@ -230,6 +257,23 @@ class ConsultaComArquivoRequestSchema(Schema):
         return ConsultaRequestSchema.validate_model_config(v)
 
 
+class UsoTokensSchema(Schema):
+    """Schema para o uso de tokens de uma consulta, conforme reportado pelo provider."""
+
+    tokens_entrada: int | None = Field(
+        default=None, description="Tokens enviados ao modelo (prompts, documento e retries)"
+    )
+    tokens_saida: int | None = Field(default=None, description="Tokens gerados pelo modelo")
+    tokens_total: int | None = Field(default=None, description="Total de tokens da consulta")
+    requisicoes: int = Field(default=1, description="Requisições feitas ao provider")
+    retentativas: int = Field(
+        default=0, description="Requisições além da primeira (retries de output)"
+    )
+    custo_estimado: float | None = Field(
+        default=None, description="Custo estimado em dólares, conforme o cadastro do modelo"
+    )
+
+
 class ConsultaResponseSchema(Schema):
     """Schema para respostas de consulta do PydanticAI."""
 
@@ -240,6 +284,28 @@ class ConsultaResponseSchema(Schema):
     )
     modelo_utilizado: str = Field(..., description="Modelo de IA que foi utilizado")
     schema_utilizado: str = Field(..., description="Schema de resposta utilizado")
+    uso: UsoTokensSchema | None = Field(
+        default=None, description="Uso detalhado de tokens reportado pelo provider"
+    )
+    cache_hit: bool = Field(
+        default=False, description="Indica se a resposta veio do cache de respostas"
+    )
+
+
+class TelemetriaModeloSchema(Schema):
+    """Schema para estatísticas de uso de um modelo em um período."""
+
+    client_model_id: int | None = Field(
+        ..., description="ID do client model (nulo se não cadastrado)"
+    )
+    modelo_nm: str = Field(..., description="Nome do modelo")
+    consultas: int = Field(..., description="Número de consultas no período")
+    latencia_p50_ms: float = Field(..., description="Mediana da latência em milissegundos")
+    latencia_p95_ms: float = Field(..., description="Percentil 95 da latência em milissegundos")
+    latencia_p99_ms: float = Field(..., description="Percentil 99 da latência em milissegundos")
+    tokens_entrada_medio: float | None = Field(..., description="Média de tokens de entrada")
+    tokens_saida_medio: float | None = Field(..., description="Média de tokens de saída")
+    custo_total: float | None = Field(..., description="Custo estimado total em dólares")
 
 
 class ModeloDisponivelSchema(Schema):
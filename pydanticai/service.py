@@ -7,28 +7,42 @@ de resposta e modelos de IA, incluindo fallback entre modelos.
 
 Classes:
     ModelFactory: Factory para criação de instâncias de modelos de IA
+    AgentPool: Cache LRU de agents reutilizados entre consultas
     PydanticAIService: Interface abstrata para o serviço PydanticAI
     PydanticAIServiceImpl: Implementação concreta do serviço PydanticAI
 
 Funcionalidades:
     - Execução de consultas de IA com diferentes modelos
     - Suporte a fallback entre múltiplos modelos
+    - Reuso de agents e modelos (e das conexões HTTP dos providers) entre consultas
     - Suporte a schemas de resposta customizados
     - Integração opcional com repositório para listagem de modelos
-    - Estimativa de uso de tokens
+    - Uso real de tokens reportado pelos providers e telemetria por consulta
     - Tratamento de erros e retry automático
     - Processamento de documentos via API externa
     - Cadastro de prompts com resolução automática de IDs
 """
 
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
 from abc import ABC, abstractmethod
-from datetime import datetime
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from pathlib import Path
+from threading import Lock
 from time import time
 
+import config.database as db
 from dotenv import load_dotenv
 from fastapi import UploadFile
+from modules.cache import AsyncTTLCache
 from modules.integrations.connectors_factories import DocumentConnectorFactory
 from modules.integrations.enums import FerramentaExtracaoEnum, FontesDadosEnum, TipoExtracaoEnum
+from modules.repository import BaseRepositoryImpl
 from modules.util.string import format_duration
 from pydantic_ai import Agent, RunContext
 from pydantic_ai.models.anthropic import AnthropicModel
@@ -37,6 +51,8 @@ from pydantic_ai.models.google import GoogleModel
 from pydantic_ai.models.groq import GroqModel
 from pydantic_ai.models.openai import OpenAIModel
 
+from .chunking import criar_schema_parcial, dividir_markdown, estimar_tokens, mesclar_parciais
+from .entity import ClientModel, ModelSchema, Prompt
 from .enum_modules import ModelSchemaEnum
 from .repository import PydanticAIRepository
 from .schema import (
@@ -45,11 +61,28 @@ from .schema import (
     PromptCadastroSchema,
     PromptResponseSchema,
     PromptStatusResponseSchema,
+    TelemetriaModeloSchema,
+    UsoTokensSchema,
 )
 
 # Carregar variáveis de ambiente do arquivo .env
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Preços por 1M de tokens no texto de custo do cadastro (ex: "Input: $0.40 / 1M tokens")
+PRECO_ENTRADA_REGEX = re.compile(r"Input:\s*\$\s*([\d.]+)")
+PRECO_SAIDA_REGEX = re.compile(r"Output:\s*\$\s*([\d.]+)")
+
+# Cache de respostas validadas, chaveado por (schema_name, hash dos parâmetros da consulta).
+# Desabilitado por padrão: só vale para consultas determinísticas o bastante para reuso.
+response_cache_enabled = os.getenv("PYDANTICAI_RESPONSE_CACHE_ENABLED", "false").lower() == "true"
+response_cache: AsyncTTLCache[dict] = AsyncTTLCache(
+    ttl=float(os.getenv("PYDANTICAI_RESPONSE_CACHE_TTL", "86400")),
+    maxsize=int(os.getenv("PYDANTICAI_RESPONSE_CACHE_MAX_SIZE", "512")),
+    name="pydanticai_respostas",
+)
+
 
 class ModelFactory:
     """
@@ -71,6 +104,10 @@ class ModelFactory:
         "gemini": GoogleModel,  # alias
     }
 
+    # Instâncias compartilhadas por especificação de modelo (ver obter_modelo)
+    _instancias: dict[str | tuple[str, ...], object] = {}
+    _instancias_lock = Lock()
+
     @classmethod
     def criar_modelo(cls, nome_completo: str):
         """
@@ -130,6 +167,37 @@ class ModelFactory:
 
         return FallbackModel(*instancias)
 
+    @classmethod
+    def obter_modelo(cls, model: str | list[str]):
+        """
+        Retorna uma instância compartilhada do modelo (ou fallback) especificado.
+
+        Cada instância mantém o cliente do provider, que reaproveita as conexões
+        HTTP (keep-alive) entre consultas. Os modelos são criados uma única vez
+        por processo para cada especificação.
+
+        Args:
+            model: String "provider:model-name" ou lista para fallback
+
+        Returns:
+            Instância do modelo ou FallbackModel
+
+        Raises:
+            ValueError: Se o formato ou provider não for suportado
+        """
+        chave = tuple(model) if isinstance(model, list) else model
+
+        with cls._instancias_lock:
+            modelo = cls._instancias.get(chave)
+            if modelo is None:
+                if isinstance(model, list):
+                    modelo = cls.criar_fallback(model)
+                else:
+                    modelo = cls.criar_modelo(model)
+                cls._instancias[chave] = modelo
+
+        return modelo
+
     @classmethod
     def get_providers_disponiveis(cls) -> list[str]:
         """
@@ -141,6 +209,155 @@ class ModelFactory:
         return list(cls.MODEL_REGISTRY.keys())
 
 
+class AgentPool:
+    """
+    Cache LRU de agents do PydanticAI.
+
+    Criar um Agent compila o JSON schema do tipo de saída e, com um modelo
+    novo, abre um novo cliente HTTP do provider. Como agents são stateless entre
+    execuções, a mesma instância é reutilizada por todas as consultas com a mesma
+    configuração (modelo, schema, prompt do sistema e parâmetros de geração).
+    """
+
+    def __init__(self, max_size: int | None = None):
+        """
+        Inicializa o pool.
+
+        Args:
+            max_size: Número máximo de agents mantidos
+                (PYDANTICAI_AGENT_POOL_SIZE, padrão: 64)
+        """
+        if max_size is None:
+            max_size = int(os.getenv("PYDANTICAI_AGENT_POOL_SIZE", "64"))
+
+        self.max_size = max_size
+        self._agents: OrderedDict[tuple, Agent] = OrderedDict()
+        self._lock = Lock()
+
+    @staticmethod
+    def build_key(
+        model: str | list[str],
+        schema_name: str,
+        system_prompt: str,
+        retries: int,
+        max_tokens: int,
+        temperature: float,
+        com_documento: bool,
+    ) -> tuple:
+        """
+        Monta a chave do agent a partir da sua configuração.
+
+        Returns:
+            tuple: Chave do agent no pool
+        """
+        modelo = tuple(model) if isinstance(model, list) else model
+        prompt_hash = hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()
+        return (modelo, schema_name, prompt_hash, retries, max_tokens, temperature, com_documento)
+
+    def get(
+        self,
+        model: str | list[str],
+        schema_name: str,
+        schema_class: type,
+        system_prompt: str,
+        retries: int,
+        max_tokens: int,
+        temperature: float,
+        com_documento: bool,
+    ) -> Agent:
+        """
+        Retorna o agent da configuração informada, criando-o se necessário.
+
+        Args:
+            model: String ou lista de strings com modelos
+            schema_name: Nome do schema de resposta
+            schema_class: Classe do schema de resposta
+            system_prompt: Prompt do sistema
+            retries: Número de tentativas para output
+            max_tokens: Máximo de tokens
+            temperature: Temperatura (criatividade)
+            com_documento: Se o agent recebe um documento como dependência
+
+        Returns:
+            Agent: Agent configurado
+
+        Raises:
+            ValueError: Se o(s) modelo(s) não puderem ser configurados
+        """
+        chave = self.build_key(
+            model, schema_name, system_prompt, retries, max_tokens, temperature, com_documento
+        )
+
+        with self._lock:
+            agent = self._agents.get(chave)
+            if agent is not None:
+                self._agents.move_to_end(chave)
+                return agent
+
+        try:
+            modelo = ModelFactory.obter_modelo(model)
+        except Exception as e:
+            raise ValueError(f"Erro ao configurar modelo(s): {e}")
+
+        agent = self._criar_agent(
+            modelo, schema_class, system_prompt, retries, max_tokens, temperature, com_documento
+        )
+
+        with self._lock:
+            # Outra consulta pode ter criado o mesmo agent enquanto este era montado
+            agent = self._agents.setdefault(chave, agent)
+            self._agents.move_to_end(chave)
+            while len(self._agents) > self.max_size:
+                self._agents.popitem(last=False)
+
+        return agent
+
+    @staticmethod
+    def _criar_agent(
+        modelo,
+        schema_class: type,
+        system_prompt: str,
+        retries: int,
+        max_tokens: int,
+        temperature: float,
+        com_documento: bool,
+    ) -> Agent:
+        """Cria um agent com ou sem o documento como dependência."""
+        if not com_documento:
+            return Agent(
+                model=modelo,
+                output_type=schema_class,
+                system_prompt=system_prompt,
+                output_retries=retries,
+                model_settings={"temperature": temperature, "max_tokens": max_tokens},
+            )
+
+        # Agent com dependências para documento
+        agent = Agent(
+            model=modelo,
+            deps_type=str,
+            output_type=schema_class,
+            system_prompt=system_prompt,
+            output_retries=retries,
+            model_settings={"temperature": temperature, "max_tokens": max_tokens},
+        )
+
+        @agent.system_prompt
+        async def adicionar_documento_deps(ctx: RunContext[str]) -> str:
+            return f"Documento a ser analisado: <doc>{ctx.deps}</doc>"
+
+        return agent
+
+    def clear(self) -> None:
+        """Remove todos os agents do pool."""
+        with self._lock:
+            self._agents.clear()
+
+
+# Pool compartilhado por todas as instâncias do serviço
+agent_pool = AgentPool()
+
+
 class PydanticAIService(ABC):
     """Interface para o serviço PydanticAI."""
 
@@ -155,6 +372,8 @@ class PydanticAIService(ABC):
         temperature: float = 0.1,
         schema_name: str = "default",
         doc: str | None = None,
+        ignorar_cache: bool = False,
+        tokens_por_bloco: int | None = None,
     ) -> ConsultaResponseSchema:
         """Executa uma consulta usando PydanticAI com suporte a fallback."""
         raise NotImplementedError
@@ -163,7 +382,7 @@ class PydanticAIService(ABC):
     async def executar_consulta_com_arquivo(
         self,
         user_prompt: str,
-        arquivo: UploadFile,
+        arquivo: UploadFile | Path,
         ferramenta_extracao: FerramentaExtracaoEnum | None,
         tipo_extracao: TipoExtracaoEnum,
         model: str | list[str] = "groq:llama-3.3-70b-versatile",
@@ -172,6 +391,8 @@ class PydanticAIService(ABC):
         max_tokens: int = 2400,
         temperature: float = 0.1,
         schema_name: str = "default",
+        ignorar_cache: bool = False,
+        tokens_por_bloco: int | None = None,
     ) -> ConsultaResponseSchema:
         """Executa uma consulta com arquivo usando PydanticAI."""
         raise NotImplementedError
@@ -191,6 +412,16 @@ class PydanticAIService(ABC):
         """Atualiza o status (ativo/inativo) de um prompt existente."""
         raise NotImplementedError
 
+    @abstractmethod
+    def limpar_cache_respostas(self, schema_name: str | None = None) -> int:
+        """Remove respostas do cache, opcionalmente apenas de um schema."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def listar_telemetria_modelos(self, dias: int = 7) -> list[TelemetriaModeloSchema]:
+        """Lista latência, tokens e custo das consultas por modelo."""
+        raise NotImplementedError
+
 
 class PydanticAIServiceImpl(PydanticAIService):
     """
@@ -225,6 +456,134 @@ class PydanticAIServiceImpl(PydanticAIService):
         total = prompt_tokens + response_tokens
         return int(total)
 
+    def _extrair_uso(self, resultado) -> UsoTokensSchema | None:
+        """
+        Extrai o uso de tokens reportado pelo provider no resultado da execução.
+
+        Inclui todas as requisições da execução (retries de output e fallbacks),
+        além do documento enviado como dependência.
+
+        Args:
+            resultado: Resultado do agent.run()
+
+        Returns:
+            UsoTokensSchema | None: Uso da execução ou None se indisponível
+        """
+        try:
+            usage = resultado.usage()
+        except Exception:
+            return None
+
+        # Versões recentes do pydantic-ai usam input/output_tokens
+        tokens_entrada = getattr(usage, "input_tokens", None)
+        if tokens_entrada is None:
+            tokens_entrada = getattr(usage, "request_tokens", None)
+        tokens_saida = getattr(usage, "output_tokens", None)
+        if tokens_saida is None:
+            tokens_saida = getattr(usage, "response_tokens", None)
+
+        tokens_total = getattr(usage, "total_tokens", None)
+        if tokens_total is None and tokens_entrada is not None and tokens_saida is not None:
+            tokens_total = tokens_entrada + tokens_saida
+
+        requisicoes = getattr(usage, "requests", None) or 1
+
+        return UsoTokensSchema(
+            tokens_entrada=tokens_entrada,
+            tokens_saida=tokens_saida,
+            tokens_total=tokens_total,
+            requisicoes=requisicoes,
+            retentativas=max(requisicoes - 1, 0),
+        )
+
+    @staticmethod
+    def _calcular_custo(custo: str | None, uso: UsoTokensSchema) -> float | None:
+        """
+        Estima o custo da consulta a partir do texto de custo do modelo cadastrado.
+
+        Args:
+            custo: Texto de custo de client_model_tb (preços por 1M de tokens)
+            uso: Uso de tokens da consulta
+
+        Returns:
+            float | None: Custo em dólares ou None se preços/tokens indisponíveis
+        """
+        if not custo or uso.tokens_entrada is None or uso.tokens_saida is None:
+            return None
+
+        preco_entrada = PRECO_ENTRADA_REGEX.search(custo)
+        preco_saida = PRECO_SAIDA_REGEX.search(custo)
+        if not preco_entrada or not preco_saida:
+            return None
+
+        return (
+            uso.tokens_entrada * float(preco_entrada.group(1))
+            + uso.tokens_saida * float(preco_saida.group(1))
+        ) / 1_000_000
+
+    async def _registrar_telemetria(
+        self,
+        modelo_utilizado: str,
+        schema_name: str,
+        uso: UsoTokensSchema,
+        latencia: float,
+        em_blocos: bool = False,
+    ) -> None:
+        """
+        Persiste a telemetria da consulta e preenche o custo estimado em `uso`.
+
+        Usa uma sessão própria para não interferir na transação de quem chamou.
+        Falhas são apenas registradas em log: a telemetria nunca interrompe a consulta.
+
+        Args:
+            modelo_utilizado: Nome do modelo reportado pelo provider
+            schema_name: Nome do schema de resposta
+            uso: Uso de tokens da consulta
+            latencia: Tempo de execução em segundos
+            em_blocos: Se a chamada é de um bloco de uma extração em blocos
+        """
+        if os.getenv("PYDANTICAI_TELEMETRIA_ENABLED", "true").lower() != "true":
+            return
+
+        try:
+            async with db.get_session(db.engine) as session:
+                repository = PydanticAIRepository(
+                    base_repository_prompt=BaseRepositoryImpl[Prompt](
+                        db_session=session, model_class=Prompt
+                    ),
+                    base_repository_client_model=BaseRepositoryImpl[ClientModel](
+                        db_session=session, model_class=ClientModel
+                    ),
+                    base_repository_model_schema=BaseRepositoryImpl[ModelSchema](
+                        db_session=session, model_class=ModelSchema
+                    ),
+                )
+
+                client_model_id = None
+                modelo = await repository.buscar_modelo_utilizado(modelo_utilizado)
+                if modelo:
+                    client_model_id, custo = modelo
+                    uso.custo_estimado = self._calcular_custo(custo, uso)
+
+                await repository.registrar_telemetria(
+                    {
+                        "client_model_id": client_model_id,
+                        "modelo_nm": modelo_utilizado,
+                        "schema_nm": schema_name,
+                        "em_blocos": em_blocos,
+                        "tokens_entrada": uso.tokens_entrada,
+                        "tokens_saida": uso.tokens_saida,
+                        "tokens_total": uso.tokens_total,
+                        "requisicoes": uso.requisicoes,
+                        "latencia_ms": int(latencia * 1000),
+                        "custo_estimado": uso.custo_estimado,
+                    }
+                )
+                await session.commit()
+
+        except Exception as e:
+            logger.warning("Erro ao registrar telemetria da consulta: %s", e)
+
     def _extrair_modelo_utilizado(self, resultado) -> str:
         """
         Extrai o nome do modelo que foi efetivamente utilizado.
@@ -257,6 +616,8 @@ class PydanticAIServiceImpl(PydanticAIService):
         temperature: float = 0.1,
         schema_name: str = "default",
         doc: str | None = None,
+        ignorar_cache: bool = False,
+        tokens_por_bloco: int | None = None,
     ) -> ConsultaResponseSchema:
         """
         Executa uma consulta usando PydanticAI com suporte a fallback de modelos.
@@ -265,6 +626,14 @@ class PydanticAIServiceImpl(PydanticAIService):
         - String: "prefixo:nome_modelo" (ex: "openai:gpt-4o")
         - Lista de strings para fallback: ["groq:llama-3.3-70b", "openai:gpt-4o"]
 
+        Com o cache de respostas habilitado (PYDANTICAI_RESPONSE_CACHE_ENABLED), consultas
+        idênticas reaproveitam a resposta validada de uma execução anterior, e consultas
+        idênticas simultâneas aguardam uma única execução.
+
+        Com `tokens_por_bloco`, documentos maiores que o orçamento são divididos em
+        blocos extraídos concorrentemente e as extrações parciais são mescladas
+        (ver `chunking`), permitindo usar modelos de contexto menor.
+
         Args:
             user_prompt: Prompt do usuário
             model: String ou lista de strings com modelos
@@ -274,6 +643,9 @@ class PydanticAIServiceImpl(PydanticAIService):
             temperature: Temperatura (criatividade)
             schema_name: Nome do schema de resposta
             doc: Documento adicional para contexto
+            ignorar_cache: Executa o modelo mesmo havendo resposta em cache
+                (a nova resposta substitui a anterior)
+            tokens_por_bloco: Orçamento de tokens por bloco do documento (None desativa)
 
         Returns:
             ConsultaResponseSchema: Resultado da consulta
@@ -287,65 +659,278 @@ class PydanticAIServiceImpl(PydanticAIService):
         except ValueError as e:
             raise ValueError(f"Schema inválido: {e}")
 
-        # Iniciar cronômetro
-        start_time = time()
+        async def executar() -> ConsultaResponseSchema:
+            if doc and tokens_por_bloco and estimar_tokens(doc) > tokens_por_bloco:
+                return await self._executar_em_blocos(
+                    user_prompt=user_prompt,
+                    model=model,
+                    system_prompt=system_prompt,
+                    retries=retries,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    schema_name=schema_name,
+                    schema_class=schema_class,
+                    doc=doc,
+                    tokens_por_bloco=tokens_por_bloco,
+                )
 
-        # Criar modelo ou fallback usando a Factory
-        try:
-            if isinstance(model, list):
-                modelo_principal = ModelFactory.criar_fallback(model)
-            else:
-                modelo_principal = ModelFactory.criar_modelo(model)
+            return await self._executar_agent(
+                user_prompt=user_prompt,
+                model=model,
+                system_prompt=system_prompt,
+                retries=retries,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                schema_name=schema_name,
+                schema_class=schema_class,
+                doc=doc,
+            )
 
-        except Exception as e:
-            raise ValueError(f"Erro ao configurar modelo(s): {e}")
+        if not response_cache_enabled:
+            return await executar()
+
+        chave = self._chave_cache_resposta(
+            user_prompt,
+            model,
+            system_prompt,
+            retries,
+            max_tokens,
+            temperature,
+            schema_name,
+            doc,
+            tokens_por_bloco,
+        )
 
-        # Criar agent com ou sem documento
-        if doc:
-            # Agent com dependências para documento
-            agent = Agent(
-                model=modelo_principal,
-                deps_type=str,
-                output_type=schema_class,
-                system_prompt=system_prompt,
-                output_retries=retries,
-                model_settings={"temperature": temperature, "max_tokens": max_tokens},
+        if ignorar_cache:
+            resposta = await executar()
+            response_cache.set(chave, resposta.model_dump(mode="json"))
+            return resposta
+
+        resposta = None
+
+        async def carregar() -> dict:
+            nonlocal resposta
+            resposta = await executar()
+            return resposta.model_dump(mode="json")
+
+        dados = await response_cache.get_or_load(chave, carregar)
+
+        # Executada por esta chamada
+        if resposta is not None:
+            return resposta
+
+        # Reidratar a resposta em cache na classe do schema
+        return ConsultaResponseSchema(
+            **{
+                **dados,
+                "resultado": schema_class.model_validate(dados["resultado"]),
+                "cache_hit": True,
+            }
+        )
+
+    @staticmethod
+    def _chave_cache_resposta(
+        user_prompt: str,
+        model: str | list[str],
+        system_prompt: str,
+        retries: int,
+        max_tokens: int,
+        temperature: float,
+        schema_name: str,
+        doc: str | None,
+        tokens_por_bloco: int | None,
+    ) -> tuple[str, str]:
+        """
+        Monta a chave canônica do cache de respostas.
+
+        Returns:
+            tuple[str, str]: (schema_name, SHA-256 dos parâmetros da consulta)
+        """
+        doc_hash = hashlib.sha256(doc.encode("utf-8")).hexdigest() if doc else None
+        parametros = json.dumps(
+            {
+                "user_prompt": user_prompt,
+                "model": model,
+                "system_prompt": system_prompt,
+                "retries": retries,
+                "max_tokens": max_tokens,
+                "temperature": temperature,
+                "doc": doc_hash,
+                "tokens_por_bloco": tokens_por_bloco,
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        schema = schema_name.lower()
+        return schema, hashlib.sha256(f"{schema}|{parametros}".encode("utf-8")).hexdigest()
+
+    def limpar_cache_respostas(self, schema_name: str | None = None) -> int:
+        """
+        Remove respostas do cache.
+
+        Args:
+            schema_name: Remove apenas as respostas deste schema (todas se None)
+
+        Returns:
+            int: Número de respostas removidas
+        """
+        if schema_name is None:
+            return response_cache.invalidate_matching(lambda chave: True)
+
+        schema = schema_name.lower()
+        return response_cache.invalidate_matching(lambda chave: chave[0] == schema)
+
+    async def _executar_em_blocos(
+        self,
+        user_prompt: str,
+        model: str | list[str],
+        system_prompt: str,
+        retries: int,
+        max_tokens: int,
+        temperature: float,
+        schema_name: str,
+        schema_class: type,
+        doc: str,
+        tokens_por_bloco: int,
+    ) -> ConsultaResponseSchema:
+        """
+        Executa a consulta em blocos do documento (map) e mescla os resultados (reduce).
+
+        Cada bloco é extraído com a versão parcial do schema, com no máximo
+        PYDANTICAI_BLOCOS_CONCORRENCIA (padrão: 4) blocos simultâneos.
+
+        Raises:
+            ValueError: Se o resultado mesclado não satisfizer o schema
+        """
+        start_time = time()
+        blocos = dividir_markdown(doc, tokens_por_bloco)
+        schema_parcial = criar_schema_parcial(schema_class)
+        semaforo = asyncio.Semaphore(int(os.getenv("PYDANTICAI_BLOCOS_CONCORRENCIA", "4")))
+
+        async def extrair(indice: int, bloco: str) -> ConsultaResponseSchema:
+            async with semaforo:
+                return await self._executar_agent(
+                    user_prompt=(
+                        f"{user_prompt}\n\nO documento foi dividido em {len(blocos)} partes; "
+                        f"esta é a parte {indice + 1}. Preencha apenas os campos presentes nela."
+                    ),
+                    model=model,
+                    system_prompt=system_prompt,
+                    retries=retries,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    schema_name=schema_name,
+                    schema_class=schema_parcial,
+                    doc=bloco,
+                    em_blocos=True,
+                )
+
+        parciais = await asyncio.gather(
+            *(extrair(indice, bloco) for indice, bloco in enumerate(blocos))
+        )
+
+        resultado = mesclar_parciais(schema_class, [parcial.resultado for parcial in parciais])
+
+        usos = [parcial.uso for parcial in parciais if parcial.uso is not None]
+        uso = None
+        if usos:
+            uso = UsoTokensSchema(
+                tokens_entrada=self._somar(u.tokens_entrada for u in usos),
+                tokens_saida=self._somar(u.tokens_saida for u in usos),
+                tokens_total=self._somar(u.tokens_total for u in usos),
+                requisicoes=sum(u.requisicoes for u in usos),
+                retentativas=sum(u.retentativas for u in usos),
+                custo_estimado=self._somar(u.custo_estimado for u in usos),
             )
 
-            @agent.system_prompt
-            async def adicionar_documento_deps(ctx: RunContext[str]) -> str:
-                return f"Documento a ser analisado: <doc>{ctx.deps}</doc>"
+        modelos = list(dict.fromkeys(parcial.modelo_utilizado for parcial in parciais))
+
+        return ConsultaResponseSchema(
+            resultado=resultado,
+            tempo_execucao=format_duration(time() - start_time),
+            tokens_utilizados=self._somar(parcial.tokens_utilizados for parcial in parciais),
+            modelo_utilizado=", ".join(modelos),
+            schema_utilizado=schema_name,
+            uso=uso,
+        )
+
+    @staticmethod
+    def _somar(valores) -> float | None:
+        """Soma os valores informados, retornando None se algum estiver ausente."""
+        valores = list(valores)
+        if any(valor is None for valor in valores):
+            return None
+        return sum(valores)
 
+    async def _executar_agent(
+        self,
+        user_prompt: str,
+        model: str | list[str],
+        system_prompt: str,
+        retries: int,
+        max_tokens: int,
+        temperature: float,
+        schema_name: str,
+        schema_class: type,
+        doc: str | None,
+        em_blocos: bool = False,
+    ) -> ConsultaResponseSchema:
+        """
+        Executa a consulta no modelo e registra a telemetria.
+
+        Com `em_blocos`, `schema_class` é o schema parcial de `schema_name`: o agent
+        é reutilizado com uma chave própria, e a telemetria fica sob o schema real.
+        """
+        # Iniciar cronômetro
+        start_time = time()
+
+        # Reutilizar agent (e modelo) da mesma configuração
+        agent = agent_pool.get(
+            model=model,
+            schema_name=f"{schema_name}:parcial" if em_blocos else schema_name,
+            schema_class=schema_class,
+            system_prompt=system_prompt,
+            retries=retries,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            com_documento=bool(doc),
+        )
+
+        if doc:
             resultado = await agent.run(user_prompt, deps=doc)
         else:
-            # Agent sem dependências
-            agent = Agent(
-                model=modelo_principal,
-                output_type=schema_class,
-                system_prompt=system_prompt,
-                output_retries=retries,
-                model_settings={"temperature": temperature, "max_tokens": max_tokens},
-            )
             resultado = await agent.run(user_prompt)
 
         # Calcular métricas
         tempo_execucao = time() - start_time
         modelo_utilizado = self._extrair_modelo_utilizado(resultado)
-        response_text = str(resultado.output)
-        tokens_estimados = self._estimate_tokens(user_prompt, response_text)
+        uso = self._extrair_uso(resultado)
+
+        if uso is not None and uso.tokens_total is not None:
+            tokens_utilizados = uso.tokens_total
+        else:
+            # Provider não reportou uso: estimar incluindo o documento
+            prompt_completo = f"{system_prompt} {doc or ''} {user_prompt}"
+            tokens_utilizados = self._estimate_tokens(prompt_completo, str(resultado.output))
+
+        if uso is not None:
+            await self._registrar_telemetria(
+                modelo_utilizado, schema_name, uso, tempo_execucao, em_blocos=em_blocos
+            )
 
         return ConsultaResponseSchema(
             resultado=resultado.output,
             tempo_execucao=format_duration(tempo_execucao),
-            tokens_utilizados=tokens_estimados,
+            tokens_utilizados=tokens_utilizados,
             modelo_utilizado=modelo_utilizado,
             schema_utilizado=schema_name,
+            uso=uso,
         )
 
     async def executar_consulta_com_arquivo(
         self,
         user_prompt: str,
-        arquivo: UploadFile,
+        arquivo: UploadFile | Path,
         ferramenta_extracao: FerramentaExtracaoEnum | None,
         tipo_extracao: TipoExtracaoEnum,
         model: str | list[str] = "groq:llama-3.3-70b-versatile",
@@ -354,6 +939,8 @@ class PydanticAIServiceImpl(PydanticAIService):
         max_tokens: int = 2400,
         temperature: float = 0.1,
         schema_name: str = "default",
+        ignorar_cache: bool = False,
+        tokens_por_bloco: int | None = None,
     ) -> ConsultaResponseSchema:
         """
         Executa uma consulta com arquivo usando PydanticAI.
@@ -363,7 +950,8 @@ class PydanticAIServiceImpl(PydanticAIService):
 
         Args:
             user_prompt: Prompt do usuário
-            arquivo: Arquivo a ser processado
+            arquivo: Arquivo enviado ou caminho de arquivo local, que é enviado por
+                referência (diretório compartilhado) ou em streaming
             ferramenta_extracao: Ferramenta para extração (None usa DOCLING)
             tipo_extracao: Tipo de extração
             model: String ou lista de strings com modelos (suporta fallback)
@@ -372,6 +960,8 @@ class PydanticAIServiceImpl(PydanticAIService):
             max_tokens: Máximo de tokens
             temperature: Criatividade da resposta
             schema_name: Nome do schema de resposta
+            ignorar_cache: Executa o modelo mesmo havendo resposta em cache
+            tokens_por_bloco: Orçamento de tokens por bloco do documento (None desativa)
 
         Returns:
             ConsultaResponseSchema: Resultado da consulta
@@ -384,11 +974,18 @@ class PydanticAIServiceImpl(PydanticAIService):
         factory = DocumentConnectorFactory()
         connector = factory.create(FontesDadosEnum.DEPENDENCIAS_EXTERNAS)
 
-        conteudo_extraido = await connector.extract_document_content(
-            arquivo=arquivo,
-            ferramenta_extracao=ferramenta_extracao,
-            tipo_extracao=tipo_extracao,
-        )
+        if isinstance(arquivo, Path):
+            conteudo_extraido = await connector.extract_document_content_from_path(
+                caminho=arquivo,
+                ferramenta_extracao=ferramenta_extracao,
+                tipo_extracao=tipo_extracao,
+            )
+        else:
+            conteudo_extraido = await connector.extract_document_content(
+                arquivo=arquivo,
+                ferramenta_extracao=ferramenta_extracao,
+                tipo_extracao=tipo_extracao,
+            )
 
         # Executar consulta com o conteúdo extraído
         return await self.executar_consulta(
@@ -400,6 +997,8 @@ class PydanticAIServiceImpl(PydanticAIService):
             temperature=temperature,
             schema_name=schema_name,
             doc=conteudo_extraido,
+            ignorar_cache=ignorar_cache,
+            tokens_por_bloco=tokens_por_bloco,
         )
 
     async def listar_modelos_disponiveis(self) -> list[ModeloDisponivelSchema]:
@@ -573,3 +1172,24 @@ class PydanticAIServiceImpl(PydanticAIService):
             updated_at=datetime.now(),
             previous_status=status_atual
         )
+
+    async def listar_telemetria_modelos(self, dias: int = 7) -> list[TelemetriaModeloSchema]:
+        """
+        Lista latência (p50/p95/p99), tokens médios e custo das consultas por modelo.
+
+        Args:
+            dias: Número de dias considerados a partir de hoje
+
+        Returns:
+            list[TelemetriaModeloSchema]: Estatísticas por modelo
+
+        Raises:
+            ValueError: Se o repositório não estiver disponível
+        """
+        if self.__repository is None:
+            raise ValueError("Repositório não disponível para esta operação")
+
+        desde = datetime.now() - timedelta(days=dias)
+        estatisticas = await self.__repository.listar_telemetria_por_modelo(desde)
+
+        return [TelemetriaModeloSchema(**linha) for linha in estatisticas]
@@ -0,0 +1,203 @@
+import pytest
+from pydantic import BaseModel, Field, field_validator
+
+from modules.pydanticai.chunking import (
+    criar_schema_parcial,
+    dividir_markdown,
+    estimar_tokens,
+    mesclar_parciais,
+)
+
+
+class Carteira(BaseModel):
+    prazo_medio: float | None = None
+    inadimplencia: float | None = None
+
+
+class Relatorio(BaseModel):
+    """Relatório mensal do FIDC"""
+
+    nome_fundo: str = Field(alias="nomeFundo", description="Nome do fundo")
+    patrimonio_liquido: float
+    carteira: Carteira
+    eventos: list[str] = []
+
+    @field_validator("patrimonio_liquido")
+    @classmethod
+    def positivo(cls, valor: float) -> float:
+        if valor <= 0:
+            raise ValueError("patrimônio deve ser positivo")
+        return valor
+
+
+def _tabela(linhas: int) -> str:
+    cabecalho = ["| Indicador | Valor |", "| --- | --- |"]
+    corpo = [f"| Indicador {i} | {i * 1000.5} |" for i in range(linhas)]
+    return "\n".join(cabecalho + corpo)
+
+
+class TestDividirMarkdown:
+    """Testes da divisão do markdown em blocos"""
+
+    def test_documento_pequeno_nao_e_dividido(self):
+        """Testa que documentos dentro do orçamento voltam inteiros"""
+        markdown = "# Título\n\nTexto curto."
+        assert dividir_markdown(markdown, 1000) == [markdown]
+
+    def test_corta_entre_secoes(self):
+        """Testa que seções inteiras não são cortadas quando cabem no orçamento"""
+        secoes = [f"# Seção {i}\n\n" + "texto " * 50 for i in range(6)]
+        blocos = dividir_markdown("\n".join(secoes), 200)
+
+        assert len(blocos) > 1
+        for bloco in blocos:
+            assert estimar_tokens(bloco) <= 200
+            assert bloco.startswith("# Seção")
+
+    def test_tabela_repete_cabecalho(self):
+        """Testa que partes de uma tabela grande repetem o cabeçalho"""
+        markdown = "## Indicadores\n\n" + _tabela(300)
+        blocos = dividir_markdown(markdown, 300)
+
+        assert len(blocos) > 1
+        for bloco in blocos:
+            assert estimar_tokens(bloco) <= 300
+            assert bloco.startswith("## Indicadores\n\n| Indicador | Valor |\n| --- | --- |")
+
+        linhas = [linha for bloco in blocos for linha in bloco.splitlines()]
+        for i in range(300):
+            assert f"| Indicador {i} | {i * 1000.5} |" in linhas
+
+    def test_paragrafo_de_uma_linha_maior_que_orcamento(self):
+        """Testa que um parágrafo em uma única linha é cortado por frases"""
+        frases = [f"Frase número {i} do parágrafo muito longo." for i in range(2000)]
+        markdown = "# Título\n\n" + " ".join(frases)
+        blocos = dividir_markdown(markdown, 1000)
+
+        assert len(blocos) > 1
+        for bloco in blocos:
+            assert estimar_tokens(bloco) <= 1000
+            assert bloco.startswith("# Título")
+            # Cortes apenas entre frases
+            assert bloco.endswith(".")
+
+        texto = " ".join(bloco.removeprefix("# Título").strip() for bloco in blocos)
+        assert texto == " ".join(frases)
+
+    def test_linha_sem_frases_cortada_por_palavras(self):
+        """Testa o corte por palavras de uma linha sem pontuação"""
+        palavras = [f"palavra{i}" for i in range(20000)]
+        blocos = dividir_markdown(" ".join(palavras), 1000)
+
+        assert all(estimar_tokens(bloco) <= 1000 for bloco in blocos)
+        assert " ".join(blocos).split() == palavras
+
+    def test_linha_sem_espacos_cortada_por_caracteres(self):
+        """Testa o corte por caracteres de uma linha sem espaços"""
+        markdown = "x" * 50000
+        blocos = dividir_markdown(markdown, 500)
+
+        assert all(estimar_tokens(bloco) <= 500 for bloco in blocos)
+        assert "".join(blocos) == markdown
+
+    def test_linha_de_tabela_maior_que_orcamento(self):
+        """Testa que linhas de tabela enormes também respeitam o orçamento"""
+        markdown = _tabela(5) + "\n| celula | " + "valor " * 3000 + "|"
+        blocos = dividir_markdown(markdown, 400)
+
+        assert all(estimar_tokens(bloco) <= 400 for bloco in blocos)
+
+
+class TestCriarSchemaParcial:
+    """Testes do schema parcial usado na extração de cada bloco"""
+
+    def test_campos_opcionais(self):
+        """Testa que todos os campos, inclusive aninhados, ficam opcionais"""
+        Parcial = criar_schema_parcial(Relatorio)
+        parcial = Parcial(carteira={})
+
+        assert parcial.nome_fundo is None
+        assert parcial.patrimonio_liquido is None
+        assert parcial.carteira.prazo_medio is None
+
+    def test_sem_validadores(self):
+        """Testa que os validadores do schema original não se aplicam aos blocos"""
+        Parcial = criar_schema_parcial(Relatorio)
+        assert Parcial(patrimonio_liquido=-1).patrimonio_liquido == -1
+
+    def test_preserva_alias_e_descricao(self):
+        """Testa que alias e descrição dos campos são mantidos"""
+        Parcial = criar_schema_parcial(Relatorio)
+
+        assert Parcial(nomeFundo="FIDC X").nome_fundo == "FIDC X"
+        assert Parcial(nome_fundo="FIDC X").nome_fundo == "FIDC X"
+        assert Parcial.model_fields["nome_fundo"].description == "Nome do fundo"
+
+    def test_memorizado(self):
+        """Testa que o schema parcial é criado uma única vez por classe"""
+        assert criar_schema_parcial(Relatorio) is criar_schema_parcial(Relatorio)
+
+
+class TestMesclarParciais:
+    """Testes da consolidação das extrações parciais"""
+
+    def test_mescla_campos_de_blocos_diferentes(self):
+        """Testa que campos de blocos diferentes são combinados"""
+        Parcial = criar_schema_parcial(Relatorio)
+        parciais = [
+            Parcial(nomeFundo="FIDC X", carteira={"prazo_medio": 120.0}),
+            Parcial(patrimonio_liquido=1000.0, carteira={"inadimplencia": 2.5}),
+        ]
+
+        resultado = mesclar_parciais(Relatorio, parciais)
+
+        assert resultado.nome_fundo == "FIDC X"
+        assert resultado.patrimonio_liquido == 1000.0
+        assert resultado.carteira == Carteira(prazo_medio=120.0, inadimplencia=2.5)
+
+    def test_listas_concatenadas_sem_repeticao(self):
+        """Testa que listas são concatenadas na ordem dos blocos, sem itens repetidos"""
+        Parcial = criar_schema_parcial(Relatorio)
+        parciais = [
+            Parcial(nomeFundo="FIDC X", patrimonio_liquido=1.0, carteira={}, eventos=["a", "b"]),
+            Parcial(eventos=["b", "c"]),
+        ]
+
+        assert mesclar_parciais(Relatorio, parciais).eventos == ["a", "b", "c"]
+
+    def test_conflito_prevalece_mais_frequente(self):
+        """Testa que, em conflito, prevalece o valor mais frequente"""
+        Parcial = criar_schema_parcial(Relatorio)
+        parciais = [
+            Parcial(nomeFundo="FIDC X", patrimonio_liquido=100.0, carteira={}),
+            Parcial(patrimonio_liquido=200.0),
+            Parcial(patrimonio_liquido=200.0),
+        ]
+
+        assert mesclar_parciais(Relatorio, parciais).patrimonio_liquido == 200.0
+
+    def test_conflito_empatado_prevalece_primeiro_bloco(self):
+        """Testa que, em empate, prevalece o valor do primeiro bloco"""
+        Parcial = criar_schema_parcial(Relatorio)
+        parciais = [
+            Parcial(nomeFundo="FIDC X", patrimonio_liquido=100.0, carteira={}),
+            Parcial(nomeFundo="FIDC Y"),
+        ]
+
+        assert mesclar_parciais(Relatorio, parciais).nome_fundo == "FIDC X"
+
+    def test_campo_obrigatorio_ausente(self):
+        """Testa erro quando um campo obrigatório não aparece em nenhum bloco"""
+        Parcial = criar_schema_parcial(Relatorio)
+        parciais = [Parcial(nomeFundo="FIDC X", carteira={})]
+
+        with pytest.raises(ValueError, match="Extração em blocos incompleta"):
+            mesclar_parciais(Relatorio, parciais)
+
+    def test_validadores_aplicados_ao_resultado(self):
+        """Testa que os validadores do schema original valem para o consolidado"""
+        Parcial = criar_schema_parcial(Relatorio)
+        parciais = [Parcial(nomeFundo="FIDC X", patrimonio_liquido=-1.0, carteira={})]
+
+        with pytest.raises(ValueError):
+            mesclar_parciais(Relatorio, parciais)
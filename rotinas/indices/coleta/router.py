@@ -8,6 +8,9 @@ from .schema import ColetaIndiceSchema
 from modules.integrations.connectors_factories import (
     IntegrationsIndicesConnectorFactory,
 )
+from modules.integrations.fornecedores.comdinheiro.apis.client import (
+    ComDinheiroApiClient,
+)
 from modules.indices.repository import IndicesRepositoryImpl
 from modules.indices.model import Indice
 from modules.moedas.repository import MoedasRepositoryImpl
@@ -20,6 +23,8 @@ router = APIRouter(
     prefix="/rotinas/indices",
     tags=["Rotinas", "Indices", "Coleta"],
     dependencies=[token_field],
+    # Fecha as conexões mantidas abertas pelo client compartilhado da ComDinheiro
+    on_shutdown=[ComDinheiroApiClient.close_shared],
 )
 
 
@@ -72,3 +77,10 @@ async def coletar_ultimas_cotacoes_indices(
     service: RotinaIndiceColetaService = Depends(get_service),
 ):
     return await service.coleta_ultimas_cotacoes_todos_indices()
+
+
+@router.post("/cotacoes/coleta/incremental")
+async def coletar_cotacoes_incrementais_indices(
+    service: RotinaIndiceColetaService = Depends(get_service),
+):
+    return await service.coleta_cotacoes_incrementais_todos_indices()
@@ -15,6 +15,7 @@ from modules.integrations.connectors_factories import (
 )
 from modules.integrations.connectors import IntegrationsIndicesConnector
 from modules.indices.repository import IndicesRepository
+from modules.calculos.calendario import CalendarioDiasUteis, get_calendario_b3
 from modules.indices.model import Indice, IndiceCollection
 from modules.rotinas.indices.coleta.schema import ColetaIndiceCotacaoSchema
 from modules.moedas.model import Moeda
@@ -43,6 +44,10 @@ class RotinaIndiceColetaService(ABC):
     async def coleta_ultimas_cotacoes_todos_indices(self) -> ResponseSchema:
         raise NotImplementedError
 
+    @abstractmethod
+    async def coleta_cotacoes_incrementais_todos_indices(self) -> ResponseSchema:
+        raise NotImplementedError
+
 
 class RotinaIndiceColetaServiceImpl(RotinaIndiceColetaService):
     __indices_repository: IndicesRepository
@@ -240,6 +245,132 @@ class RotinaIndiceColetaServiceImpl(RotinaIndiceColetaService):
             avisos=avisos,
         )
 
+    async def coleta_cotacoes_incrementais_todos_indices(self) -> ResponseSchema:
+        indices_cotacoes: list[ColetaIndiceCotacaoSchema] = []
+        avisos: list[AvisoSchema] = []
+
+        indices: IndiceCollection = IndiceCollection(
+            list(await self.__indices_repository.lista())
+        )
+        datas_ultimas_cotacoes: dict[tuple[int, str], date] = (
+            await self.__indices_repository.lista_datas_ultimas_cotacoes()
+        )
+
+        indices_por_janela: dict[
+            tuple[FontesDadosEnum, str, date, date], IndiceCollection
+        ] = self.__get_indices_por_janela_incremental(
+            indices=indices, datas_ultimas_cotacoes=datas_ultimas_cotacoes
+        )
+
+        connectors: dict[FontesDadosEnum, IntegrationsIndicesConnector] = {}
+        moedas: dict[str, Moeda | None] = {}
+        for (
+            fonte_dado,
+            codigo_moeda,
+            data_inicio,
+            data_fim,
+        ), indices_janela in indices_por_janela.items():
+            if codigo_moeda not in moedas:
+                moedas[codigo_moeda] = await self.__moedas_repository.get_by_codigo(
+                    codigo_moeda
+                )
+            moeda: Moeda | None = moedas[codigo_moeda]
+            if moeda is None:
+                avisos.append(
+                    AvisoSchema(
+                        mensagem=f"Moeda {codigo_moeda} não encontrada no Banco de Dados.",
+                        indices_afetados=indices_janela.get_nomes(),
+                    )
+                )
+                continue
+
+            if fonte_dado not in connectors:
+                connectors[fonte_dado] = self.__integrations_connector_factory.create(
+                    fonte_dado
+                )
+
+            _indices_cotacoes: list[ColetaIndiceCotacaoSchema] = await connectors[
+                fonte_dado
+            ].fetch_indices_cotacoes_pontos(
+                indices_repository=self.__indices_repository,
+                indices=indices_janela,
+                data_inicio=data_inicio,
+                data_fim=data_fim,
+                moeda=moeda,
+                fonte_dado=fonte_dado,
+            )
+            indices_cotacoes.extend(_indices_cotacoes)
+
+        indices_sem_cotacao: IndiceCollection = self.__get_indices_sem_cotacao(
+            indices=IndiceCollection(
+                [
+                    indice
+                    for indices_janela in indices_por_janela.values()
+                    for indice in indices_janela
+                ]
+            ),
+            cotacoes=indices_cotacoes,
+        )
+        if indices_sem_cotacao:
+            avisos.append(
+                AvisoSchema(
+                    mensagem="Não foram encontradas cotações do(s) Índice(s).",
+                    indices_afetados=indices_sem_cotacao.get_nomes(),
+                )
+            )
+
+        return ResponseSchema(
+            cotacoes=sorted(
+                indices_cotacoes,
+                key=lambda cotacao: cotacao.data_referente,
+            ),
+            avisos=avisos,
+        )
+
+    def __get_indices_por_janela_incremental(
+        self,
+        indices: IndiceCollection,
+        datas_ultimas_cotacoes: dict[tuple[int, str], date],
+    ) -> dict[tuple[FontesDadosEnum, str, date, date], IndiceCollection]:
+        """
+        Agrupa os índices desatualizados pela janela de dias úteis que falta coletar.
+
+        A janela de cada índice começa no dia útil seguinte à sua última cotação
+        (ou no início da coleta, se ainda não houver cotações) e termina na data
+        da última cotação disponível. Índices com a mesma fonte, moeda e janela
+        compartilham a mesma requisição; índices atualizados são ignorados.
+        """
+        calendario: CalendarioDiasUteis = get_calendario_b3()
+        indices_por_janela: dict[
+            tuple[FontesDadosEnum, str, date, date], IndiceCollection
+        ] = defaultdict(IndiceCollection)
+
+        for (
+            fonte_dado,
+            indices_por_moeda,
+        ) in self.__get_indices_por_fonte_e_moeda(indices).items():
+            for codigo_moeda, indices_moeda in indices_por_moeda.items():
+                for indice in indices_moeda:
+                    data_fim: date = indice.get_data_ultima_cotacao()
+                    data_ultima_cotacao: date | None = datas_ultimas_cotacoes.get(
+                        (indice.id, codigo_moeda)
+                    )
+                    data_inicio: date = (
+                        calendario.get_data_d_util_mais_x_dias(
+                            x_dias=1, data_input=data_ultima_cotacao
+                        )
+                        if data_ultima_cotacao is not None
+                        else indice.data_inicio_coleta
+                    )
+                    if data_inicio > data_fim:
+                        continue
+
+                    indices_por_janela[
+                        (fonte_dado, codigo_moeda, data_inicio, data_fim)
+                    ].append(indice)
+
+        return indices_por_janela
+
     async def __get_cotacoes_indices_e_avisos(
         self, indices: IndiceCollection, data_inicio: date, data_fim: date
     ) -> tuple[list[ColetaIndiceCotacaoSchema], list[AvisoSchema]]:
@@ -0,0 +1,84 @@
+"""
+Carga de registros em tabelas temporárias de staging.
+
+Usado pelos repositórios que aplicam cargas grandes com poucas instruções SQL:
+os registros são copiados para uma tabela temporária da sessão e aplicados na
+tabela definitiva com `INSERT ... SELECT`, `UPDATE ... FROM` etc. A tabela:
+
+- é criada na primeira carga da transação e descartada no commit
+  (`ON COMMIT DROP`), sem gerar WAL;
+- é esvaziada a cada carga, podendo ser reutilizada na mesma transação;
+- recebe os registros por COPY binário com asyncpg ou, com outros drivers, por
+  inserts de múltiplas linhas limitados pelo número de parâmetros.
+
+Exemplo:
+    staging = await carregar_staging(
+        session,
+        "cotacoes_staging",
+        {"indice_id": "INTEGER NOT NULL", "cotacao": "NUMERIC NOT NULL"},
+        registros,
+    )
+    await session.execute(insert(Cotacao).from_select(["indice_id", "cotacao"], select(staging)))
+"""
+
+from sqlalchemy import column, insert, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.expression import TableClause
+
+# Parâmetros por instrução no fallback sem COPY (o PostgreSQL aceita até 65535)
+MAX_PARAMETROS_INSERT = 30000
+
+
+async def carregar_staging(
+    session: AsyncSession,
+    tabela: str,
+    colunas: dict[str, str],
+    registros: list[tuple],
+    colunas_geradas: dict[str, str] | None = None,
+) -> TableClause:
+    """
+    Cria (se preciso), esvazia e carrega uma tabela temporária de staging.
+
+    Args:
+        session: Sessão da transação em que a tabela será usada
+        tabela: Nome da tabela temporária
+        colunas: Nome e tipo SQL das colunas, na ordem dos valores dos registros
+        registros: Valores de cada linha, na ordem de `colunas`
+        colunas_geradas: Colunas preenchidas pelo banco (ex.: `BIGSERIAL`), fora
+            dos registros
+
+    Returns:
+        TableClause: Tabela de staging, com as colunas geradas e as carregadas
+    """
+    definicoes = {**(colunas_geradas or {}), **colunas}
+    await session.execute(
+        text(
+            f"CREATE TEMP TABLE IF NOT EXISTS {tabela} ("
+            + ", ".join(f"{nome} {tipo}" for nome, tipo in definicoes.items())
+            + ") ON COMMIT DROP"
+        )
+    )
+    await session.execute(text(f"TRUNCATE {tabela}"))
+
+    staging = table(tabela, *(column(nome) for nome in definicoes))
+    nomes = list(colunas)
+
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    driver_connection = raw_connection.driver_connection
+
+    # asyncpg: COPY binário direto na tabela de staging
+    if hasattr(driver_connection, "copy_records_to_table"):
+        await driver_connection.copy_records_to_table(tabela, records=registros, columns=nomes)
+        return staging
+
+    # Outros drivers: insert de múltiplas linhas por lote
+    tamanho_lote = max(1, MAX_PARAMETROS_INSERT // len(nomes))
+    for inicio in range(0, len(registros), tamanho_lote):
+        await session.execute(
+            insert(staging).values(
+                [dict(zip(nomes, registro)) for registro in registros[inicio : inicio + tamanho_lote]]
+            )
+        )
+
+    return staging